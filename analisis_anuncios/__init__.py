@@ -0,0 +1,16 @@
+"""Motores de cálculo para el análisis de monetización con anuncios de Logic.
+
+``build_workbook`` se importa bajo demanda: ``import analisis_anuncios`` no
+carga NumPy ni xlsxwriter ni escribe ningún archivo.
+"""
+from analisis_anuncios.escenarios import Escenario
+
+__all__ = ['Escenario', 'build_workbook']
+
+
+def __getattr__(nombre):
+    if nombre == 'build_workbook':
+        from analisis_anuncios.libro import build_workbook
+
+        return build_workbook
+    raise AttributeError(f'module {__name__!r} has no attribute {nombre!r}')
@@ -0,0 +1,5 @@
+import sys
+
+from analisis_anuncios.cli import main
+
+sys.exit(main())
@@ -0,0 +1,261 @@
+"""Actividad real del marketplace a partir de volcados de Supabase (PostgreSQL).
+
+Lee en una sola pasada volcados de las tablas ``marketplace_cases`` y
+``proposals`` (ver ``supabase/migrations/``) en los dos formatos habituales:
+
+- ``pg_dump`` en texto plano (o ``COPY ... TO STDOUT`` guardado con su
+  cabecera): bloques ``COPY public.tabla (columnas) FROM stdin;`` con campos
+  separados por tabuladores, ``\\N`` como NULL y terminados en ``\\.``; el
+  resto del volcado (otras tablas, DDL) se salta.
+- CSV con encabezado (``\\copy tabla TO 'tabla.csv' CSV HEADER``); la tabla
+  se reconoce por sus columnas (``proposals`` tiene ``case_id``).
+
+Ambos admiten ``.gz``. Como en ``analisis_anuncios.eventos``, las filas se
+procesan por bloques: los contadores diarios se suman con NumPy y los usuarios
+activos se guardan como pares (día, usuario) únicos, de modo que la memoria
+depende de los días y de los pares distintos, no del tamaño del volcado.
+
+Un cliente está activo el día que publica un caso o acepta o rechaza una
+propuesta; un abogado, el día que envía una propuesta o la retira. Un caso
+expirado cuenta el día de su última actualización (``expire_old_cases`` pasa
+el estado a ``'expired'`` y actualiza ``updated_at``).
+"""
+import csv
+import itertools
+import operator
+import re
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.eventos import _abrir, _dias, _huella_fuentes
+
+TAMANO_BLOQUE = 200_000
+CASOS = 'marketplace_cases'
+PROPUESTAS = 'proposals'
+# Columnas leídas de cada tabla, en el orden de las tuplas de cada bloque
+COLUMNAS = {
+    CASOS: ('client_id', 'status', 'created_at', 'updated_at'),
+    PROPUESTAS: ('lawyer_id', 'client_id', 'status', 'created_at', 'updated_at'),
+}
+RESPUESTAS_CLIENTE = ('accepted', 'rejected')
+RETIRADAS = ('withdrawn',)
+
+_COPY = re.compile(r'^COPY\s+(?:"?\w+"?\.)?"?(\w+)"?\s*\((.*)\)\s+FROM\s+stdin', re.IGNORECASE)
+_ESCAPE = re.compile(r'\\(x[0-9a-fA-F]{1,2}|[0-7]{1,3}|.)')
+_ESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
+
+class Actividad(NamedTuple):
+    """Series diarias, una posición por día desde el primero al último con datos."""
+    dias: np.ndarray  # días desde 1970-01-01
+    clientes: np.ndarray  # clientes activos
+    abogados: np.ndarray  # abogados activos
+    activos: np.ndarray  # usuarios activos (un usuario con ambos papeles cuenta una vez)
+    casos: np.ndarray  # casos publicados
+    propuestas: np.ndarray  # propuestas enviadas
+    expirados: np.ndarray  # casos expirados
+    filas: int  # filas leídas de ambas tablas
+
+    def mensual(self):
+        """Promedio diario de usuarios y totales de casos y propuestas por mes natural.
+
+        Devuelve un ``Actividad`` con una posición por mes; ``dias`` pasa a ser el
+        primer día de cada mes y las series de usuarios son medias de los días con datos.
+        """
+        meses = self.dias.astype('datetime64[D]').astype('datetime64[M]')
+        unicos, inverso = np.unique(meses, return_inverse=True)
+        dias = np.bincount(inverso, minlength=len(unicos))
+
+        def total(serie):
+            return np.bincount(inverso, weights=serie, minlength=len(unicos))
+
+        return Actividad(
+            dias=unicos.astype('datetime64[D]').astype(np.int32),
+            clientes=total(self.clientes) / dias,
+            abogados=total(self.abogados) / dias,
+            activos=total(self.activos) / dias,
+            casos=total(self.casos).astype(np.int64),
+            propuestas=total(self.propuestas).astype(np.int64),
+            expirados=total(self.expirados).astype(np.int64),
+            filas=self.filas,
+        )
+
+    def meses(self):
+        """Etiquetas ``AAAA-MM`` de los meses con datos (las posiciones de ``mensual``)."""
+        return np.unique(self.dias.astype('datetime64[D]').astype('datetime64[M]')).astype(str).tolist()
+
+
+def _desescapar(valor):
+    # Formato texto de COPY: \N es NULL; el resto de secuencias solo aparece si hay barras
+    if valor == '\\N':
+        return None
+    if '\\' not in valor:
+        return valor
+
+    def sustituir(m):
+        codigo = m.group(1)
+        if codigo[0] == 'x' and len(codigo) > 1:
+            return chr(int(codigo[1:], 16))
+        if codigo[0].isdigit():
+            return chr(int(codigo, 8))
+        return _ESCAPES.get(codigo, codigo)
+
+    return _ESCAPE.sub(sustituir, valor)
+
+
+def _columnas(tabla, columnas, ruta):
+    # Extrae de una fila separada en campos las columnas de ``COLUMNAS[tabla]``, en orden
+    faltan = [c for c in COLUMNAS[tabla] if c not in columnas]
+    if faltan:
+        raise ValueError(f'{ruta}: a {tabla} le faltan las columnas {faltan}')
+    return operator.itemgetter(*(columnas.index(c) for c in COLUMNAS[tabla]))
+
+
+def _bloques_copy(ruta, tamano_bloque):
+    # (tabla, filas) de los bloques COPY de las tablas conocidas; las demás se saltan
+    with _abrir(ruta) as f:
+        for linea in f:
+            m = _COPY.match(linea)
+            if not m:
+                continue
+            tabla = m.group(1)
+            extraer = None
+            if tabla in COLUMNAS:
+                extraer = _columnas(tabla, [c.strip().strip('"') for c in m.group(2).split(',')], ruta)
+            bloque = []
+            for fila in f:
+                if fila.startswith('\\.'):
+                    break
+                if extraer is None:
+                    continue
+                valores = extraer(fila.rstrip('\r\n').split('\t'))
+                # Sin barras en las columnas leídas no hay NULL ni escapes que deshacer
+                if '\\' in '\t'.join(valores):
+                    valores = tuple(map(_desescapar, valores))
+                bloque.append(valores)
+                if len(bloque) == tamano_bloque:
+                    yield tabla, bloque
+                    bloque = []
+            if bloque:
+                yield tabla, bloque
+
+
+def _bloques_csv(ruta, tamano_bloque):
+    with _abrir(ruta) as f:
+        lector = csv.reader(f)
+        columnas = [c.strip() for c in next(lector, [])]
+        if not columnas:
+            return
+        tabla = PROPUESTAS if 'case_id' in columnas else CASOS
+        extraer = _columnas(tabla, columnas, ruta)
+        while True:
+            # En CSV de PostgreSQL el NULL es el campo vacío sin comillas
+            bloque = [tuple(v or None for v in extraer(campos))
+                      for campos in itertools.islice(lector, tamano_bloque) if campos]
+            if not bloque:
+                break
+            yield tabla, bloque
+
+
+def _bloques(ruta, tamano_bloque):
+    base = ruta[:-3] if ruta.endswith('.gz') else ruta
+    return (_bloques_csv if base.endswith('.csv') else _bloques_copy)(ruta, tamano_bloque)
+
+
+def _union(*arrays):
+    # Unión ordenada sin repetidos; la ordenación estable fusiona en tiempo casi lineal las
+    # partes ya ordenadas y es bastante más rápida que ``np.union1d`` con enteros de 64 bits
+    valores = np.sort(np.concatenate(arrays), kind='stable')
+    return valores[np.concatenate(([True], valores[1:] != valores[:-1]))] if len(valores) else valores
+
+
+class _Acumulador:
+    def __init__(self):
+        self.usuarios = {}
+        self.contadores = {'casos': Counter(), 'propuestas': Counter(), 'expirados': Counter()}
+        self.pares = {'clientes': np.empty(0, np.int64), 'abogados': np.empty(0, np.int64)}
+        self.filas = 0
+
+    def contar(self, nombre, dias):
+        unicos, cuentas = np.unique(dias, return_counts=True)
+        self.contadores[nombre].update(dict(zip(unicos.tolist(), cuentas.tolist())))
+
+    def activos(self, papel, dias, usuarios):
+        # Pares (día, usuario) como un entero: día en los 32 bits altos
+        presentes = [u is not None for u in usuarios]
+        if not any(presentes):
+            return
+        dias = np.asarray(dias)[presentes].astype(np.int64)
+        # Diccionario en lugar de ``np.unique``: los UUID son casi todos distintos en cada bloque
+        codigos = np.array([self.usuarios.setdefault(u, len(self.usuarios)) for u in usuarios if u is not None],
+                           dtype=np.int64)
+        self.pares[papel] = _union(self.pares[papel], (dias << 32) | codigos)
+
+    def agregar(self, tabla, bloque):
+        self.filas += len(bloque)
+        columnas = dict(zip(COLUMNAS[tabla], zip(*bloque)))
+        creado = _dias(columnas['created_at'])
+        estado = np.array(columnas['status'], dtype=object)
+        if tabla == CASOS:
+            self.contar('casos', creado)
+            self.activos('clientes', creado, columnas['client_id'])
+            expirado = estado == 'expired'
+            if expirado.any():
+                self.contar('expirados', _dias([v for v, e in zip(columnas['updated_at'], expirado) if e]))
+            return
+
+        self.contar('propuestas', creado)
+        self.activos('abogados', creado, columnas['lawyer_id'])
+        for papel, estados, usuario in (('clientes', RESPUESTAS_CLIENTE, 'client_id'),
+                                        ('abogados', RETIRADAS, 'lawyer_id')):
+            elegidas = np.isin(estado, estados)
+            if elegidas.any():
+                self.activos(papel, _dias([v for v, e in zip(columnas['updated_at'], elegidas) if e]),
+                             [v for v, e in zip(columnas[usuario], elegidas) if e])
+
+    def resultado(self):
+        dias_pares = {papel: pares >> 32 for papel, pares in self.pares.items()}
+        todos = [*dias_pares.values(), *(np.fromiter(c, np.int64, len(c)) for c in self.contadores.values())]
+        todos = np.concatenate(todos)
+        if not len(todos):
+            raise ValueError('los volcados no tienen filas de marketplace_cases ni de proposals')
+        inicio, fin = int(todos.min()), int(todos.max())
+        largo = fin - inicio + 1
+
+        def por_dia(dias):
+            return np.bincount(dias - inicio, minlength=largo)
+
+        def serie(contador):
+            valores = np.zeros(largo, np.int64)
+            if contador:
+                valores[np.fromiter(contador, np.int64, len(contador)) - inicio] = list(contador.values())
+            return valores
+
+        # Un mismo usuario activo como cliente y como abogado el mismo día cuenta una vez
+        union = _union(self.pares['clientes'], self.pares['abogados'])
+        return Actividad(
+            dias=np.arange(inicio, fin + 1, dtype=np.int32),
+            clientes=por_dia(dias_pares['clientes']),
+            abogados=por_dia(dias_pares['abogados']),
+            activos=por_dia(union >> 32),
+            casos=serie(self.contadores['casos']),
+            propuestas=serie(self.contadores['propuestas']),
+            expirados=serie(self.contadores['expirados']),
+            filas=self.filas,
+        )
+
+
+def leer_volcados(rutas, tamano_bloque=TAMANO_BLOQUE):
+    """Series diarias de actividad de todos los volcados ``rutas`` (una pasada por archivo)."""
+    acumulador = _Acumulador()
+    for ruta in rutas:
+        for tabla, bloque in _bloques(ruta, tamano_bloque):
+            acumulador.agregar(tabla, bloque)
+    return acumulador.resultado()
+
+
+def huella_volcados(rutas):
+    """Ruta, tamaño y fecha de cada volcado: cambia si se reemplaza alguno, sin leerlos."""
+    return _huella_fuentes(rutas)
@@ -0,0 +1,222 @@
+"""Caché de construcción por huella de contenido.
+
+Tres niveles:
+
+* Libro: la clave combina el escenario, el código fuente (que incluye las
+  tablas de referencia y los estilos) y la fecha. Si coincide con la última
+  construcción y el archivo no se ha tocado, el escenario se omite por completo.
+* Arrays derivados: ``memo`` guarda en disco el resultado de las funciones
+  costosas (proyecciones, simulaciones) con una clave de sus argumentos y del
+  código del paquete (la función llama a otras y lee constantes de módulo), de
+  modo que un escenario modificado solo recalcula lo que cambió.
+* Hojas: se registra la huella de cada hoja (datos + estilos) para informar
+  qué hojas cambiaron respecto a la construcción anterior.
+
+Los arrays se desalojan por antigüedad de uso cuando superan ``max_bytes``.
+"""
+import functools
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import types
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+
+MAX_BYTES = 512 * 1024 * 1024
+# Código, estilos y datos de referencia del paquete: cualquier cambio invalida la caché
+FUENTES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py')))
+
+
+def huella(*objetos):
+    """SHA-256 hexadecimal del contenido canónico de ``objetos``."""
+    h = hashlib.sha256()
+    for obj in objetos:
+        _alimentar(h, obj)
+    return h.hexdigest()
+
+
+def _alimentar(h, obj):
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        h.update(repr((type(obj).__name__, obj)).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(f'ndarray{obj.dtype}{obj.shape}'.encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.generic):
+        _alimentar(h, obj.item())
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        h.update(type(obj).__qualname__.encode())
+        for campo in fields(obj):
+            _alimentar(h, campo.name)
+            _alimentar(h, getattr(obj, campo.name))
+    elif isinstance(obj, dict):
+        h.update(b'dict')
+        for clave in sorted(obj, key=repr):
+            _alimentar(h, clave)
+            _alimentar(h, obj[clave])
+    elif isinstance(obj, (list, tuple, range)):
+        h.update(f'{type(obj).__name__}{len(obj)}'.encode())
+        for item in obj:
+            _alimentar(h, item)
+    elif isinstance(obj, (set, frozenset)):
+        _alimentar(h, sorted(obj, key=repr))
+    elif isinstance(obj, functools.partial):
+        _alimentar(h, (obj.func, obj.args, obj.keywords))
+    elif isinstance(obj, types.FunctionType):
+        h.update(f'{obj.__module__}.{obj.__qualname__}'.encode())
+        _alimentar(h, obj.__code__)
+        _alimentar(h, [c.cell_contents for c in obj.__closure__ or ()])
+        _alimentar(h, obj.__defaults__)
+        _alimentar(h, obj.__kwdefaults__)
+    elif isinstance(obj, types.CodeType):
+        h.update(obj.co_code)
+        _alimentar(h, obj.co_consts)
+    elif isinstance(obj, (types.BuiltinFunctionType, type)):
+        h.update(f'{obj.__module__}.{obj.__qualname__}'.encode())
+    else:
+        # Los generadores e iteradores no pueden recorrerse sin consumirse
+        raise TypeError(f'No se puede calcular la huella de {type(obj).__name__}')
+
+
+def huella_fuentes(*rutas):
+    """Huella de los archivos fuente; cambia con cualquier edición de código o datos."""
+    h = hashlib.sha256()
+    for ruta in sorted(rutas):
+        with open(ruta, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _huella_paquete():
+    # Una lectura por proceso: el código no cambia mientras se ejecuta
+    return huella_fuentes(*FUENTES)
+
+
+def _escribir_atomico(ruta, datos):
+    # Varios procesos del lote pueden escribir a la vez en la misma caché
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(datos)
+    os.replace(temporal, ruta)
+
+
+class SinCache:
+    """Misma interfaz que ``CacheConstruccion`` pero sin guardar nada."""
+
+    def vigente(self, nombre, clave, ruta):
+        return False
+
+    def registrar(self, nombre, clave, ruta, huellas_hojas):
+        return sorted(huellas_hojas)
+
+    def memo(self, funcion, sin_clave=(), **kwargs):
+        return funcion(**kwargs)
+
+
+def memo_sorteos(cache, funcion, semilla, procesos=None, **kwargs):
+    """``cache.memo`` de una función aleatoria que recibe ``semilla`` y ``procesos``.
+
+    Sin semilla cada ejecución es distinta: no tiene sentido reutilizarla y se
+    calcula sin caché. ``procesos`` no altera el resultado y queda fuera de la clave.
+    """
+    if semilla is None:
+        return funcion(semilla=semilla, procesos=procesos, **kwargs)
+    return cache.memo(funcion, sin_clave=('procesos',), semilla=semilla, procesos=procesos, **kwargs)
+
+
+class CacheConstruccion:
+    def __init__(self, directorio, max_bytes=MAX_BYTES, forzar=False):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.forzar = forzar
+        # Resultado de la última construcción de cada libro en este proceso
+        self.omitidos = set()
+        self.cambios = {}
+        self._libros = os.path.join(directorio, 'libros')
+        self._arrays = os.path.join(directorio, 'arrays')
+        os.makedirs(self._libros, exist_ok=True)
+        os.makedirs(self._arrays, exist_ok=True)
+
+    def _entrada(self, nombre):
+        return os.path.join(self._libros, f'{huella(nombre)[:32]}.json')
+
+    def _leer_entrada(self, nombre):
+        try:
+            with open(self._entrada(nombre), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def vigente(self, nombre, clave, ruta):
+        """True si el libro ``ruta`` ya corresponde a ``clave`` y no fue modificado."""
+        if self.forzar:
+            return False
+        entrada = self._leer_entrada(nombre)
+        if not entrada or entrada['clave'] != clave:
+            return False
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            return False
+        if [estado.st_size, estado.st_mtime_ns] != entrada['archivo']:
+            return False
+        self.omitidos.add(nombre)
+        return True
+
+    def registrar(self, nombre, clave, ruta, huellas_hojas):
+        """Guarda la construcción y devuelve los nombres de las hojas que cambiaron."""
+        anteriores = (self._leer_entrada(nombre) or {}).get('hojas', {})
+        estado = os.stat(ruta)
+        entrada = {
+            'nombre': nombre,
+            'clave': clave,
+            'archivo': [estado.st_size, estado.st_mtime_ns],
+            'hojas': huellas_hojas,
+        }
+        _escribir_atomico(self._entrada(nombre), json.dumps(entrada, ensure_ascii=False).encode())
+        self.omitidos.discard(nombre)
+        self.cambios[nombre] = [hoja for hoja, h in huellas_hojas.items() if anteriores.get(hoja) != h]
+        return self.cambios[nombre]
+
+    def memo(self, funcion, sin_clave=(), **kwargs):
+        """``funcion(**kwargs)`` recuperado de disco si ya se calculó con los mismos argumentos.
+
+        ``sin_clave`` nombra argumentos que no alteran el resultado (p.ej. ``procesos``).
+        """
+        clave = {k: v for k, v in kwargs.items() if k not in sin_clave}
+        ruta = os.path.join(self._arrays, f'{huella(funcion, _huella_paquete(), clave)}.pkl')
+        if not self.forzar:
+            try:
+                with open(ruta, 'rb') as f:
+                    resultado = pickle.load(f)
+                os.utime(ruta)
+                return resultado
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+                # Archivo dañado o guardado con clases que ya no existen o cambiaron: se recalcula
+                pass
+        resultado = funcion(**kwargs)
+        _escribir_atomico(ruta, pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL))
+        self._desalojar()
+        return resultado
+
+    def _desalojar(self):
+        archivos = []
+        for nombre in os.listdir(self._arrays):
+            try:
+                estado = os.stat(os.path.join(self._arrays, nombre))
+            except OSError:
+                continue
+            archivos.append((estado.st_mtime, estado.st_size, nombre))
+        total = sum(tamano for _, tamano, _ in archivos)
+        for _, tamano, nombre in sorted(archivos):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self._arrays, nombre))
+            except OSError:
+                continue
+            total -= tamano
@@ -0,0 +1,199 @@
+"""Línea de comandos: ``python -m analisis_anuncios`` o ``python crear_analisis_anuncios.py``.
+
+Solo importa NumPy y xlsxwriter (vía ``analisis_anuncios.libro``) cuando hay
+que generar, así que ``--help`` y ``--dry-run`` responden al instante.
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+from datetime import date, timedelta
+from functools import partial
+
+from analisis_anuncios.datos import escenario_base, tipos_anuncios
+from analisis_anuncios.escenarios import SALIDAS, Escenario
+from analisis_anuncios.lote import MANIFIESTO, nombres_repetidos
+
+CACHE_MAX_MB = 512
+EVENTOS = '.eventos_anuncios'
+KPIS_REALES = '.kpis_reales.json'
+
+
+def _parser():
+    parser = argparse.ArgumentParser(description='Genera el análisis de monetización con anuncios de Logic.')
+    parser.add_argument('--lote', metavar='ESCENARIOS.json',
+                        help='lista JSON de escenarios; genera un libro por escenario en paralelo')
+    parser.add_argument('--salida', default='.', help='directorio de salida (por defecto el actual)')
+    parser.add_argument('--procesos', type=int, help='procesos del lote (por defecto todos los núcleos)')
+    parser.add_argument('--cache', default='.cache_analisis', help='directorio de la caché de construcción')
+    parser.add_argument('--cache-max-mb', type=float, default=CACHE_MAX_MB,
+                        help='tamaño máximo de los arrays en caché antes de desalojar los menos usados')
+    parser.add_argument('--sin-cache', action='store_true', help='no leer ni escribir la caché')
+    parser.add_argument('--force', action='store_true', help='regenerar todo aunque nada haya cambiado')
+    parser.add_argument('--ingerir', nargs='+', metavar='LOG',
+                        help='logs de eventos (JSONL/CSV, .gz admitido) a agregar en --eventos antes de generar')
+    parser.add_argument('--eventos', metavar='DIR',
+                        help=f'agregados de eventos cuyos valores medidos reemplazan a los de referencia '
+                             f'(por defecto {EVENTOS} si se usa --ingerir)')
+    parser.add_argument('--actividad', nargs='+', metavar='VOLCADO',
+                        help='volcados de Supabase (COPY de pg_dump o CSV, .gz admitido) de marketplace_cases '
+                             'y proposals cuyos usuarios activos reemplazan a los usuarios diarios')
+    parser.add_argument('--informes', metavar='URL',
+                        help='API de informes de la que descargar los KPIs reales antes de generar '
+                             '(token en la variable de entorno INFORMES_TOKEN)')
+    parser.add_argument('--apps', nargs='+', metavar='APP', help='apps a consultar en --informes')
+    parser.add_argument('--lanzamiento', metavar='AAAA-MM-DD',
+                        help='fecha de lanzamiento: primer día del Mes 1 de los KPIs reales')
+    parser.add_argument('--kpis-reales', metavar='KPIS.json',
+                        help=f'KPIs reales junto a las metas de la tabla de KPIs '
+                             f'(por defecto {KPIS_REALES} si se usa --informes)')
+    parser.add_argument('--salidas', nargs='+', choices=SALIDAS,
+                        help="formatos a generar (por defecto los del escenario, 'xlsx'): csv, jsonl y columnar "
+                             'escriben cada tabla en el directorio del escenario en la misma construcción')
+    parser.add_argument('--dry-run', action='store_true', help='validar los escenarios sin generar ningún libro')
+    return parser
+
+
+def _cargar_escenarios(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return [Escenario.desde_dict(datos) for datos in json.load(f)]
+
+
+def validar(escenarios):
+    """Mensajes de error de todos los ``escenarios`` (lista vacía si son válidos)."""
+    errores = []
+    repetidos = nombres_repetidos(escenarios)
+    if repetidos:
+        errores.append(f'Nombres de escenario repetidos: {repetidos}')
+    for escenario in escenarios:
+        try:
+            escenario.validar(tipos_anuncios=[tipo[0] for tipo in tipos_anuncios])
+        except ValueError as error:
+            errores.append(str(error))
+    return errores
+
+
+def _errores_informes(args):
+    if not args.informes:
+        return []
+    errores = []
+    if not args.apps:
+        errores.append('--informes necesita --apps')
+    if not args.lanzamiento:
+        errores.append('--informes necesita --lanzamiento')
+    else:
+        try:
+            date.fromisoformat(args.lanzamiento)
+        except ValueError:
+            errores.append(f'--lanzamiento {args.lanzamiento!r} no es una fecha AAAA-MM-DD')
+    return errores
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+
+    try:
+        escenarios = _cargar_escenarios(args.lote) if args.lote else [escenario_base]
+    except (OSError, ValueError, TypeError) as error:
+        print(f'❌ {error}', file=sys.stderr)
+        return 1
+    eventos = args.eventos or (EVENTOS if args.ingerir else None)
+    if args.ingerir and not args.dry_run:
+        from analisis_anuncios.eventos import ingerir
+
+        try:
+            agregados = ingerir(args.ingerir, eventos, forzar=args.force)
+        except (OSError, ValueError) as error:
+            print(f'❌ {error}', file=sys.stderr)
+            return 1
+        print(f'📥 {len(agregados.dia):,} grupos (ubicación × tipo × día) en {eventos}')
+    if eventos:
+        escenarios = [replace(escenario, eventos=eventos) for escenario in escenarios]
+    kpis_reales = args.kpis_reales or (KPIS_REALES if args.informes else None)
+    errores_informes = _errores_informes(args)
+    if args.informes and not args.dry_run:
+        if errores_informes:
+            print(f'❌ {errores_informes[0]}', file=sys.stderr)
+            return 1
+        from analisis_anuncios.informes import ErrorInformes, descargar_kpis, guardar_kpis, resumir_kpis
+
+        # Hasta el último día del Mes 6 o hasta ayer si aún no ha terminado
+        hasta = min(date.fromisoformat(args.lanzamiento) + timedelta(days=179), date.today() - timedelta(days=1))
+        try:
+            filas = descargar_kpis(args.informes, args.apps, args.lanzamiento, hasta.isoformat(),
+                                   token=os.environ.get('INFORMES_TOKEN'),
+                                   cache=None if args.sin_cache else os.path.join(args.cache, 'informes'))
+            guardar_kpis(kpis_reales, resumir_kpis(filas, args.lanzamiento), url=args.informes, apps=args.apps,
+                         lanzamiento=args.lanzamiento, hasta=hasta.isoformat())
+        except (ErrorInformes, OSError, ValueError) as error:
+            print(f'❌ {error}', file=sys.stderr)
+            return 1
+        print(f'📡 {len(filas):,} días de KPIs de {len(args.apps)} app(s) en {kpis_reales}')
+    if kpis_reales:
+        escenarios = [replace(escenario, kpis_reales=kpis_reales) for escenario in escenarios]
+    if args.actividad:
+        escenarios = [replace(escenario, actividad=tuple(args.actividad)) for escenario in escenarios]
+    if args.salidas:
+        escenarios = [replace(escenario, salidas=tuple(args.salidas)) for escenario in escenarios]
+    escenario = escenarios[0]
+    if args.dry_run:
+        # Lo que se generaría antes de construir (agregados, KPIs) aún puede no existir
+        pendientes = {**({'eventos': None} if args.ingerir else {}),
+                      **({'kpis_reales': None} if args.informes else {})}
+        errores = validar([replace(e, **pendientes) for e in escenarios])
+        errores += [f'no existe el log {ruta!r}' for ruta in args.ingerir or () if not os.path.isfile(ruta)]
+        errores += errores_informes
+        for error in errores:
+            print(f'❌ {error}', file=sys.stderr)
+        if not errores:
+            print(f'✅ {len(escenarios)} escenario(s) válido(s); no se generó nada')
+        return 1 if errores else 0
+
+    from analisis_anuncios.cache import CacheConstruccion
+    from analisis_anuncios.libro import build_workbook
+    from analisis_anuncios.lote import generar_lote
+
+    cache = None
+    if not args.sin_cache:
+        cache = CacheConstruccion(args.cache, max_bytes=int(args.cache_max_mb * 2**20), forzar=args.force)
+
+    if args.lote:
+        manifiesto = generar_lote(partial(build_workbook, cache=cache), escenarios, args.salida, procesos=args.procesos)
+        generados = len(manifiesto['libros']) - manifiesto['errores']
+        print(f"📦 {generados}/{len(escenarios)} libros en {manifiesto['segundos']:.1f} s; "
+              f"manifiesto: {os.path.join(args.salida, MANIFIESTO)}")
+        return 1 if manifiesto['errores'] else 0
+
+    ruta = build_workbook(escenario, args.salida, cache)
+    if cache and escenario.nombre in cache.omitidos:
+        print(f"♻️  Sin cambios desde la última construcción: '{ruta}' (--force para regenerar)")
+        return 0
+    if escenario.exportaciones:
+        print(f"📤 Tablas exportadas ({', '.join(escenario.exportaciones)}): "
+              f"'{os.path.join(args.salida, escenario.nombre, 'indice.json')}'")
+    if 'xlsx' not in escenario.salidas:
+        return 0
+    print(f"✅ Archivo Excel creado exitosamente: '{ruta}'")
+    print("📊 Incluye 9 hojas con análisis completo:")
+    print("   1. Resumen Ejecutivo")
+    print("   2. Ubicaciones de Anuncios")
+    print("   3. Tipos de Anuncios")
+    print("   4. Proyecciones de Ingresos (con gráfico)")
+    print("   5. Estrategia de Implementación")
+    print("   6. Configuración AdMob")
+    print("   7. Mejores Prácticas")
+    print("   8. Análisis de Competencia")
+    print("   9. Métricas y Benchmarks (con gráfico)")
+    opcionales = [nombre for nombre, activa in (('Rejilla de Escenarios (streaming)', escenario.rejilla),
+                                                 ('Frecuencia de Anuncios', escenario.frecuencia is not None),
+                                                 ('Optimización de Anuncios', escenario.optimizacion is not None),
+                                                 ('Mediación de Anuncios', escenario.mediacion is not None),
+                                                 ('Sensibilidad (con gráfico tornado)', escenario.sensibilidad is not None),
+                                                 ('Experimento A/B (con gráfico)', escenario.experimento is not None))
+                  if activa]
+    for numero, nombre in enumerate(opcionales, start=10):
+        print(f"  {numero}. {nombre}")
+    if cache:
+        print(f"♻️  Hojas con cambios: {', '.join(cache.cambios[escenario.nombre]) or 'ninguna'}")
+    return 0
@@ -0,0 +1,181 @@
+"""Configuración y datos de referencia del análisis de monetización con anuncios.
+
+Solo estructuras de Python (sin NumPy ni xlsxwriter), para que validar
+escenarios no tenga que cargar las dependencias de generación.
+"""
+from analisis_anuncios.escenarios import Escenario
+
+
+# ============= CONFIGURACIÓN =============
+# Escenario del libro publicado; ver Escenario para simulación, streaming, rejilla, etc.
+escenario_base = Escenario()
+
+
+# ============= HOJA 1: RESUMEN EJECUTIVO =============
+metricas = [
+    ['CPM Promedio', '$2.50', '$0.50 - $10.00', 'Estable'],
+    ['CTR Promedio', '2.5%', '1.5% - 4.0%', 'Creciente'],
+    ['Usuarios Diarios (Inicial)', '100', '50 - 200', '+20% mensual'],
+    ['Ingresos Mensuales (Inicial)', '$15 - $45', '$10 - $100', 'Variable'],
+    ['Fill Rate Esperado', '85%', '75% - 95%', 'Optimizable'],
+]
+
+recomendaciones = [
+    ['1. Comenzar con banners no invasivos (inferior y superior)'],
+    ['2. Implementar anuncios nativos después del primer mes'],
+    ['3. Intersticiales solo después de acciones completadas'],
+    ['4. Monitorear métricas semanalmente y optimizar'],
+    ['5. No exceder 3 anuncios visibles simultáneamente'],
+    ['6. Considerar Google AdMob + Facebook Audience Network'],
+]
+
+
+# ============= HOJA 2: UBICACIONES DE ANUNCIOS =============
+ubicaciones = [
+    ['Banner Superior', 'Debajo del header con logo', 'Alta', '$2.00', 'Media', 'Implementar'],
+    ['Banner Inferior (Sticky)', 'Fijo en parte inferior', 'Muy Alta', '$1.50', 'Baja', 'Implementar Primero'],
+    ['Banner Entre Secciones', 'Entre "Chat IA" y "Formularios"', 'Alta', '$2.50', 'Baja', 'Implementar'],
+    ['Anuncio Nativo en Lista', 'Cada 3-4 elementos formularios', 'Media', '$3.00', 'Muy Baja', 'Fase 2'],
+    ['Intersticial al Navegar', 'Al abrir chat IA o formularios', 'Muy Alta', '$8.00', 'Alta', 'Fase 3 (Limitado)'],
+    ['App Open Ad', 'Al abrir la aplicación', 'Alta', '$5.00', 'Alta', 'Opcional'],
+    ['Rewarded Video', 'Por beneficios premium', 'Alta', '$15.00', 'Ninguna', 'Premium Features'],
+]
+
+# Tipos de anuncio compatibles con cada ubicación (el primero es el de "CPM Est.") y si el
+# anuncio queda visible junto a otros (banners, nativos) o ocupa la pantalla completa
+tipos_por_ubicacion = {
+    'Banner Superior': (('Banner Standard',), True),
+    'Banner Inferior (Sticky)': (('Banner Standard',), True),
+    'Banner Entre Secciones': (('Banner Standard', 'Medium Rectangle', 'Native Ads'), True),
+    'Anuncio Nativo en Lista': (('Native Ads',), True),
+    'Intersticial al Navegar': (('Interstitial',), False),
+    'App Open Ad': (('App Open Ad',), False),
+    'Rewarded Video': (('Rewarded Video',), False),
+}
+
+
+# ============= HOJA 3: TIPOS DE ANUNCIOS =============
+tipos_anuncios = [
+    ['Banner Standard', '$0.50', '$3.00', '1.5%', 'Fácil implementación, no invasivo', 'CPM bajo'],
+    ['Interstitial', '$4.00', '$10.00', '3.5%', 'eCPM muy alto, pantalla completa', 'Puede molestar usuarios'],
+    ['Native Ads', '$2.00', '$5.00', '4.0%', 'Integrado, alto CTR, buena UX', 'Requiere diseño custom'],
+    ['Rewarded Video', '$10.00', '$20.00', '8.0%', 'eCPM altísimo, usuarios contentos', 'Requiere incentivo'],
+    ['App Open Ad', '$3.00', '$8.00', '2.0%', 'Primera impresión, buen CPM', 'Solo una vez al abrir'],
+    ['Medium Rectangle', '$1.50', '$4.00', '2.5%', 'Buen tamaño, visible', 'Ocupa espacio'],
+]
+
+
+# ============= HOJA 5: ESTRATEGIA DE IMPLEMENTACIÓN =============
+roadmap = [
+    ['Fase 1\nSemana 1', 'Configuración Inicial', 'Crear cuenta AdMob, configurar IDs, integrar SDK', 'Banner Inferior (Sticky)', '3-5 días'],
+    ['Fase 2\nSemana 2-3', 'Expansión Moderada', 'Agregar banner superior después del header', 'Banner Superior', '2-3 días'],
+    ['Fase 3\nSemana 4', 'Optimización Visual', 'Banner entre secciones (Chat IA y Formularios)', 'Banner Entre Secciones', '2 días'],
+    ['Fase 4\nMes 2', 'Anuncios Integrados', 'Implementar anuncios nativos en lista de formularios', 'Native Ads (cada 4 items)', '5-7 días'],
+    ['Fase 5\nMes 2-3', 'Monetización Avanzada', 'Intersticiales limitados (max 1 cada 3 navegaciones)', 'Interstitial Ads', '3-4 días'],
+    ['Fase 6\nMes 3+', 'Premium Features', 'Rewarded videos para desbloquear funciones', 'Rewarded Video Ads', '5-7 días'],
+]
+
+# KPIs a monitorear
+kpis = [
+    ['KPI', 'Meta Mes 1', 'Meta Mes 3', 'Meta Mes 6', 'Herramienta'],
+    ['CTR (Click-Through Rate)', '1.5%', '2.5%', '3.5%', 'AdMob Dashboard'],
+    ['Fill Rate', '80%', '85%', '90%', 'AdMob Dashboard'],
+    ['eCPM (Effective CPM)', '$2.00', '$2.50', '$3.50', 'AdMob Dashboard'],
+    ['Impresiones Diarias', '300', '1,500', '5,000', 'AdMob Dashboard'],
+    ['Ingresos Diarios', '$0.60', '$3.75', '$17.50', 'AdMob Dashboard'],
+    ['Tasa de Retención', '60%', '70%', '75%', 'Firebase Analytics'],
+    ['Tiempo en App', '3 min', '5 min', '8 min', 'Firebase Analytics'],
+]
+
+
+# ============= HOJA 6: CONFIGURACIÓN ADMOB =============
+# IDs de prueba
+test_ids = [
+    ['Banner', 'ca-app-pub-3940256099942544/6300978111', 'Tu ID de Banner Real'],
+    ['Interstitial', 'ca-app-pub-3940256099942544/1033173712', 'Tu ID de Interstitial Real'],
+    ['Native Advanced', 'ca-app-pub-3940256099942544/2247696110', 'Tu ID de Native Real'],
+    ['Rewarded Video', 'ca-app-pub-3940256099942544/5224354917', 'Tu ID de Rewarded Real'],
+    ['App Open', 'ca-app-pub-3940256099942544/3419835294', 'Tu ID de App Open Real'],
+]
+
+# Pasos de configuración
+pasos = [
+    ['1. Crear cuenta en AdMob', 'https://admob.google.com/'],
+    ['2. Crear nueva app en AdMob', 'Seleccionar Android/iOS + nombre "Logic"'],
+    ['3. Crear unidades de anuncios', 'Banner, Interstitial, Native, etc.'],
+    ['4. Copiar IDs de anuncios', 'Reemplazar en el código los IDs de prueba'],
+    ['5. Configurar pubspec.yaml', 'Agregar: google_mobile_ads: ^5.1.0'],
+    ['6. Inicializar en main.dart', 'MobileAds.instance.initialize()'],
+    ['7. Implementar anuncios', 'Seguir código de ejemplo proporcionado'],
+    ['8. Probar con IDs de prueba', 'Validar que funcionan correctamente'],
+    ['9. Cambiar a IDs reales', 'Después de pruebas exitosas'],
+    ['10. Publicar y monitorear', 'Revisar métricas diariamente'],
+]
+
+
+# ============= HOJA 7: MEJORES PRÁCTICAS =============
+# Categorías
+categorias = [
+    ['EXPERIENCIA DE USUARIO', [
+        ('No más de 3 anuncios visibles simultáneamente', 'Evita saturar la interfaz'),
+        ('Espaciado adecuado entre anuncios', 'Mínimo 200px de separación'),
+        ('Anuncios relevantes al contenido legal', 'Mayor CTR y mejor experiencia'),
+        ('Tiempos de espera razonables', 'Intersticiales cada 3+ navegaciones'),
+        ('Opción de cerrar anuncios', 'Si es posible, dar control al usuario'),
+    ]],
+    ['OPTIMIZACIÓN DE INGRESOS', [
+        ('Probar diferentes ubicaciones (A/B testing)', 'Optimizar basándose en datos'),
+        ('Usar múltiples redes publicitarias', 'AdMob + Facebook Audience Network'),
+        ('Implementar mediation', 'Maximizar fill rate y eCPM'),
+        ('Anuncios nativos cuando sea posible', 'Mejor integración = mayor CTR'),
+        ('Monitorear métricas semanalmente', 'Ajustar estrategia constantemente'),
+    ]],
+    ['CUMPLIMIENTO Y POLÍTICAS', [
+        ('Leer políticas de AdMob', 'Evitar suspensiones de cuenta'),
+        ('No hacer clic en tus propios anuncios', 'Puede resultar en ban permanente'),
+        ('Contenido apropiado', 'Verificar que cumple políticas'),
+        ('Colocación correcta de anuncios', 'No cerca de botones clickeables'),
+        ('Transparencia con usuarios', 'Política de privacidad actualizada'),
+    ]],
+    ['TÉCNICAS AVANZADAS', [
+        ('Segmentación de audiencia', 'Anuncios diferentes por perfil de usuario'),
+        ('Frecuency capping', 'Limitar impresiones por usuario'),
+        ('Rewarded ads para premium', 'Monetizar sin subscripción'),
+        ('Smart Segmentation', 'AdMob optimiza automáticamente'),
+        ('Open Bidding', 'Aumenta competencia y CPM'),
+    ]],
+]
+
+
+# ============= HOJA 8: ANÁLISIS DE COMPETENCIA =============
+# Datos de competencia (ejemplos hipotéticos)
+competencia = [
+    ['LegalZoom', 'Banner + Interstitial', 'Interstitiales después de cotizaciones', 'Balance entre monetización y conversión'],
+    ['Rocket Lawyer', 'Banner + Native', 'Anuncios nativos en resultados búsqueda', 'Alta integración = mejor UX'],
+    ['Avvo', 'Banner + Video', 'Videos recompensados por consultaas', 'Usuarios aceptan anuncios por beneficios'],
+    ['LawRato (India)', 'Banner + Intersticial', 'Banners discretos + intersticiales limitados', 'Menos es más en apps de servicios'],
+    ['JusticeDirect', 'Solo Banner', 'Monetización mínima, enfoque en conversión', 'Priorizar experiencia sobre ads'],
+]
+
+
+# ============= HOJA 9: MÉTRICAS Y BENCHMARKS =============
+benchmarks = [
+    ['CTR - Banner', '0.5%', '1.5%', '2.5%', '4.0%'],
+    ['CTR - Interstitial', '1.0%', '2.0%', '3.5%', '5.0%'],
+    ['CTR - Native', '1.5%', '3.0%', '5.0%', '8.0%'],
+    ['Fill Rate', '60%', '75%', '85%', '95%'],
+    ['eCPM - Banner', '$0.50', '$1.50', '$3.00', '$5.00'],
+    ['eCPM - Interstitial', '$2.00', '$5.00', '$8.00', '$15.00'],
+    ['eCPM - Native', '$1.50', '$3.00', '$5.00', '$8.00'],
+    ['Retención Día 1', '30%', '45%', '60%', '75%'],
+    ['Retención Día 7', '15%', '25%', '35%', '50%'],
+    ['Retención Día 30', '8%', '15%', '22%', '35%'],
+]
+# Fila de CTR de los benchmarks de cada tipo de anuncio (Bajo a Excelente da su rango en la simulación)
+ctr_benchmark_por_tipo = {
+    'Banner Standard': 'CTR - Banner',
+    'Medium Rectangle': 'CTR - Banner',
+    'Interstitial': 'CTR - Interstitial',
+    'App Open Ad': 'CTR - Interstitial',
+    'Native Ads': 'CTR - Native',
+}
@@ -0,0 +1,314 @@
+"""Escenarios de generación: un libro por mercado, nivel de precios y mezcla de anuncios."""
+import os
+from dataclasses import dataclass, fields
+from numbers import Integral, Real
+from typing import Optional
+
+FILAS_EXCEL = 1_048_576
+# Título, espacio y encabezados antes de los datos de una tabla
+FILAS_ENCABEZADO = 3
+# Ejes obligatorios de la rejilla seguidos de los opcionales de ``proyectar_rejilla_por_bloques``
+CLAVES_REJILLA = ('usuarios', 'impresiones_por_usuario', 'cpm', 'fill_rate',
+                  'tamano_bloque', 'dias_mes', 'factor_bajo', 'factor_alto')
+# Columnas de la tabla de benchmarks, de peor a mejor
+NIVELES_BENCHMARK = ('Bajo', 'Promedio', 'Alto', 'Excelente')
+# Columna "Nivel Invasión" de las ubicaciones, de menor a mayor
+NIVELES_INVASION = ('Ninguna', 'Muy Baja', 'Baja', 'Media', 'Alta')
+CLAVES_OPTIMIZACION = ('max_invasion', 'max_visibles', 'penalizacion')
+# Parámetros de ``mediacion.simular_mediacion`` más la estrategia que alimenta el fill rate
+CLAVES_MEDIACION = ('modo', 'redes', 'cascada', 'solicitudes', 'precio_minimo', 'tiempo_limite_ms')
+MODOS_MEDIACION = ('cascada', 'subasta')
+# Nombres de ``mediacion.REDES`` y de las redes que usa ``mediacion.CASCADA``
+REDES_MEDIACION = ('AdMob', 'Meta Audience Network', 'AppLovin', 'Unity Ads')
+REDES_CASCADA = ('AdMob', 'Meta Audience Network', 'AppLovin')
+# Campos de ``mediacion.Red``; ``dispersion`` es opcional
+CAMPOS_RED = ('nombre', 'ecpm', 'fill', 'latencia_ms', 'dispersion')
+CLAVES_SENSIBILIDAD = ('meses', 'muestras', 'rangos')
+# ``sensibilidad.PARAMETROS``: claves admitidas en ``sensibilidad['rangos']``
+PARAMETROS_SENSIBILIDAD = ('cpm', 'fill_rate', 'impresiones_por_usuario', 'usuarios', 'crecimiento')
+# Obligatoria seguida de las opcionales del modelo de cohortes
+CLAVES_COHORTES = ('altas_diarias', 'crecimiento_mensual', 'nivel', 'meses')
+# Campos de ``frecuencia.Sesiones`` y ``frecuencia.Limites`` más el número de usuarios simulados;
+# las fracciones van en (0, 1] y los límites admiten None (sin límite)
+CLAVES_FRECUENCIA = ('sesiones_dia', 'navegaciones_sesion', 'permanencia_seg', 'fraccion_listas',
+                     'elementos_lista', 'prob_recompensa', 'banners_pantalla', 'refresco_banner_seg',
+                     'nativo_cada', 'max_visibles', 'navegaciones_intersticial', 'intersticiales_dia',
+                     'app_open_dia', 'recompensados_dia', 'usuarios')
+FRACCIONES_FRECUENCIA = ('fraccion_listas', 'prob_recompensa')
+# Campos enteros de ``frecuencia.Limites`` y el número de usuarios (se usan como cuentas y tamaños)
+ENTEROS_FRECUENCIA = ('banners_pantalla', 'nativo_cada', 'max_visibles', 'navegaciones_intersticial',
+                      'intersticiales_dia', 'app_open_dia', 'recompensados_dia', 'usuarios')
+OPCIONALES_FRECUENCIA = ('max_visibles', 'navegaciones_intersticial', 'intersticiales_dia',
+                         'app_open_dia', 'recompensados_dia')
+# Archivos y control obligatorios seguidos de los opcionales de ``experimentos.analizar_experimento``
+CLAVES_EXPERIMENTO = ('archivos', 'control', 'remuestreos', 'confianza', 'miradas', 'cubos')
+# El libro Excel seguido de ``exportacion.EXPORTADORES``
+SALIDAS = ('xlsx', 'csv', 'jsonl', 'columnar')
+
+
+def _positivos(valores):
+    return all(isinstance(v, Real) and not isinstance(v, bool) and v > 0 for v in valores)
+
+
+def _no_negativo(valor):
+    return isinstance(valor, Real) and not isinstance(valor, bool) and valor >= 0
+
+
+def _errores_redes(redes):
+    # Nombres de las redes y errores de ``mediacion['redes']`` (dicts o listas con los campos de ``Red``)
+    nombres, errores = [], []
+    for red in redes:
+        campos = dict(zip(CAMPOS_RED, red)) if isinstance(red, (list, tuple)) else red
+        if (not isinstance(campos, dict) or not set(CAMPOS_RED[:4]) <= campos.keys()
+                or len(red) > len(CAMPOS_RED) or campos.keys() - set(CAMPOS_RED)):
+            errores.append(f'mediacion: cada red necesita {list(CAMPOS_RED[:4])} (y opcionalmente dispersion)')
+            continue
+        nombres.append(campos['nombre'])
+        if (not _positivos([campos['ecpm'], campos['latencia_ms'], campos.get('dispersion', 1)])
+                or not _no_negativo(campos['fill']) or campos['fill'] > 1):
+            errores.append(f'mediacion: la red {campos["nombre"]!r} necesita ecpm, latencia_ms y dispersion '
+                           'positivos y fill en [0, 1]')
+    return nombres, errores
+
+
+@dataclass(frozen=True)
+class Escenario:
+    nombre: str = 'Analisis_Monetizacion_Anuncios_Logic'
+    mercado: str = 'Base'
+    nivel_precio: str = 'Estándar'
+    # Escala todos los CPM usados en las proyecciones y la simulación
+    multiplicador_cpm: float = 1.0
+    # Tipo de anuncio -> peso; el CPM de la proyección pasa a ser el punto medio
+    # ponderado de los rangos de "Tipos de Anuncios". None = CPM promedio de métricas.
+    mezcla_anuncios: Optional[dict] = None
+    usuarios_diarios: tuple = (100, 250, 500, 1000, 2500, 5000, 10000)
+    impresiones_por_usuario: float = 3
+    # Modo simulación: reemplaza los escenarios fijos (±33%) por bandas P5/P50/P95 Monte Carlo
+    simulacion: bool = False
+    sorteos: int = 2_000_000
+    semilla: Optional[int] = 2024
+    procesos: Optional[int] = None  # None = todos los núcleos disponibles
+    # Modo streaming: el libro se escribe fila a fila con memoria constante (constant_memory)
+    streaming: bool = False
+    # Modo Excel nativo: colores por formato condicional y columnas derivadas como fórmulas,
+    # de modo que el libro se recalcula al editar un CPM
+    excel_nativo: bool = False
+    # Rejilla de escenarios (usuarios × impresiones/usuario × CPM × fill rate) en una hoja extra;
+    # p.ej. {'usuarios': range(100, 10100, 200), 'impresiones_por_usuario': range(1, 21),
+    #        'cpm': [x / 4 for x in range(2, 42, 2)], 'fill_rate': [0.75, 0.8, 0.85, 0.9, 0.95]}
+    rejilla: Optional[dict] = None
+    # Directorio de agregados de logs (``analisis_anuncios.eventos.ingerir``): el CPM, CTR y
+    # fill rate medidos reemplazan a los de referencia en resumen, ubicaciones y tipos
+    eventos: Optional[str] = None
+    # Modelo de cohortes: los usuarios diarios de las proyecciones salen de las altas y de la
+    # retención D1/D7/D30 de los benchmarks en lugar de ``usuarios_diarios``, una fila por mes;
+    # p.ej. {'altas_diarias': 40, 'crecimiento_mensual': 0.1, 'nivel': 'Promedio', 'meses': 36}
+    cohortes: Optional[dict] = None
+    # Simulador de sesiones y límites de frecuencia (``analisis_anuncios.frecuencia``): las
+    # impresiones por usuario y la mezcla de tipos salen de la simulación y se añade una hoja
+    # con el efecto de cada límite; {} usa los valores por defecto, p.ej. {'max_visibles': 2}
+    frecuencia: Optional[dict] = None
+    # Optimizador de la mezcla (``analisis_anuncios.optimizacion``): hoja extra con la configuración
+    # de ubicaciones y tipos de mayor ingreso y la frontera de Pareto ingreso–invasividad;
+    # p.ej. {'max_invasion': 'Media', 'max_visibles': 3, 'penalizacion': 0.01} ({} = esos valores)
+    optimizacion: Optional[dict] = None
+    # Mediación (``analisis_anuncios.mediacion``): simula cascada y open bidding entre redes, añade
+    # una hoja comparativa y el fill rate de ``modo`` reemplaza al "Fill Rate Esperado" de referencia;
+    # p.ej. {'modo': 'subasta', 'solicitudes': 2_000_000} ({} = redes y cascada por defecto)
+    mediacion: Optional[dict] = None
+    # Análisis de sensibilidad (``analisis_anuncios.sensibilidad``): hoja con el tornado uno a uno
+    # y los índices de Sobol de CPM, fill rate, impresiones, usuarios y crecimiento;
+    # p.ej. {'meses': 12, 'muestras': 4096, 'rangos': {'cpm': [1.0, 6.0]}} ({} = esos valores)
+    sensibilidad: Optional[dict] = None
+    # KPIs reales (``informes.guardar_kpis``): la tabla de KPIs de "Estrategia Implementación"
+    # añade una columna "Real Mes N" junto a cada meta
+    kpis_reales: Optional[str] = None
+    # Volcados de Supabase de marketplace_cases y proposals (``analisis_anuncios.actividad``,
+    # COPY de pg_dump o CSV con encabezado): los usuarios diarios de las proyecciones pasan a
+    # ser los clientes y abogados activos medidos, una fila por mes; p.ej. ('dump.sql.gz',)
+    actividad: Optional[tuple] = None
+    # Formatos generados en la misma construcción: 'xlsx' es el libro; 'csv', 'jsonl' y
+    # 'columnar' (``analisis_anuncios.exportacion``) escriben cada tabla en el directorio
+    # ``nombre`` con un ``indice.json``; p.ej. ('xlsx', 'csv') o ('columnar',)
+    salidas: tuple = ('xlsx',)
+    # Experimento A/B de ubicaciones (``analisis_anuncios.experimentos``): archivos con una fila por
+    # usuario (identificador, variante e ingreso); hoja extra con el lift de ingreso por usuario
+    # frente al control, intervalos bootstrap y fronteras de parada secuenciales; p.ej.
+    # {'archivos': ['ab.csv.gz'], 'control': 'Banner Inferior (Sticky)', 'remuestreos': 10_000}
+    experimento: Optional[dict] = None
+
+    @property
+    def archivo(self):
+        """El libro o, si no se genera, el índice de las tablas exportadas."""
+        if 'xlsx' in self.salidas:
+            return f'{self.nombre}.xlsx'
+        return os.path.join(self.nombre, 'indice.json')
+
+    @property
+    def exportaciones(self):
+        return [salida for salida in self.salidas if salida != 'xlsx']
+
+    def validar(self, tipos_anuncios=None):
+        """Comprueba el escenario sin generar nada; lanza ``ValueError`` con todos los problemas.
+
+        ``tipos_anuncios`` son los nombres válidos para ``mezcla_anuncios`` (None = no comprobar).
+        """
+        errores = []
+        if not self.nombre or any(sep in self.nombre for sep in '/\\'):
+            errores.append('nombre vacío o con separadores de ruta')
+        if not self.usuarios_diarios or not _positivos(self.usuarios_diarios):
+            errores.append('usuarios_diarios necesita al menos un valor y todos positivos')
+        elif len(self.usuarios_diarios) + FILAS_ENCABEZADO > FILAS_EXCEL:
+            errores.append(f'usuarios_diarios supera las {FILAS_EXCEL:,} filas de Excel')
+        for campo in ('impresiones_por_usuario', 'multiplicador_cpm', 'sorteos'):
+            if not _positivos([getattr(self, campo)]):
+                errores.append(f'{campo} debe ser positivo')
+        if self.procesos is not None and (not isinstance(self.procesos, int) or self.procesos < 1):
+            errores.append('procesos debe ser un entero >= 1 o None')
+        if self.mezcla_anuncios is not None:
+            if tipos_anuncios is not None:
+                desconocidos = set(self.mezcla_anuncios) - set(tipos_anuncios)
+                if desconocidos:
+                    errores.append(f'tipos de anuncio desconocidos en la mezcla: {sorted(desconocidos)}')
+            pesos = list(self.mezcla_anuncios.values())
+            if not pesos or not all(isinstance(p, Real) and p >= 0 for p in pesos) or not sum(pesos) > 0:
+                errores.append('mezcla_anuncios necesita pesos no negativos con suma positiva')
+        if self.rejilla is not None:
+            faltan = set(CLAVES_REJILLA[:4]) - self.rejilla.keys()
+            sobran = self.rejilla.keys() - set(CLAVES_REJILLA)
+            if faltan or sobran:
+                errores.append(f'rejilla: faltan {sorted(faltan)}, sobran {sorted(sobran)}')
+            else:
+                filas = 1
+                for clave in CLAVES_REJILLA[:4]:
+                    if not _positivos(self.rejilla[clave]):
+                        errores.append(f'rejilla[{clave!r}] necesita valores positivos')
+                    filas *= len(self.rejilla[clave])
+                if filas + FILAS_ENCABEZADO > FILAS_EXCEL:
+                    errores.append(f'la rejilla tiene {filas:,} filas; Excel admite {FILAS_EXCEL:,}')
+        if self.cohortes is not None:
+            sobran = self.cohortes.keys() - set(CLAVES_COHORTES)
+            if 'altas_diarias' not in self.cohortes or sobran:
+                errores.append(f'cohortes: necesita altas_diarias, sobran {sorted(sobran)}')
+            if not _positivos([self.cohortes.get('altas_diarias', 1)]):
+                errores.append('cohortes: altas_diarias debe ser positivo')
+            crecimiento = self.cohortes.get('crecimiento_mensual', 0)
+            if not isinstance(crecimiento, Real) or crecimiento <= -1:
+                errores.append('cohortes: crecimiento_mensual debe ser un número mayor que -1')
+            if self.cohortes.get('nivel', 'Promedio') not in NIVELES_BENCHMARK:
+                errores.append(f'cohortes: nivel debe ser uno de {list(NIVELES_BENCHMARK)}')
+            meses = self.cohortes.get('meses', 1)
+            if not isinstance(meses, int) or not 0 < meses <= FILAS_EXCEL - FILAS_ENCABEZADO:
+                errores.append('cohortes: meses debe ser un entero positivo')
+        if self.frecuencia is not None:
+            sobran = self.frecuencia.keys() - set(CLAVES_FRECUENCIA)
+            if sobran:
+                errores.append(f'frecuencia: claves desconocidas {sorted(sobran)}')
+            for clave, valor in self.frecuencia.items():
+                if valor is None and clave in OPCIONALES_FRECUENCIA:
+                    continue
+                if not _positivos([valor]) or (clave in FRACCIONES_FRECUENCIA and valor > 1):
+                    errores.append(f'frecuencia[{clave!r}] fuera de rango')
+                elif clave in ENTEROS_FRECUENCIA and not isinstance(valor, Integral):
+                    errores.append(f'frecuencia[{clave!r}] debe ser un entero')
+        if self.optimizacion is not None:
+            sobran = self.optimizacion.keys() - set(CLAVES_OPTIMIZACION)
+            if sobran:
+                errores.append(f'optimizacion: claves desconocidas {sorted(sobran)}')
+            if self.optimizacion.get('max_invasion', 'Media') not in NIVELES_INVASION:
+                errores.append(f'optimizacion: max_invasion debe ser uno de {list(NIVELES_INVASION)}')
+            max_visibles = self.optimizacion.get('max_visibles', 0)
+            if not isinstance(max_visibles, int) or max_visibles < 0:
+                errores.append('optimizacion: max_visibles debe ser un entero no negativo')
+            penalizacion = self.optimizacion.get('penalizacion', 0)
+            if not isinstance(penalizacion, Real) or not 0 <= penalizacion < 1:
+                errores.append('optimizacion: penalizacion debe estar en [0, 1)')
+        if self.mediacion is not None:
+            sobran = self.mediacion.keys() - set(CLAVES_MEDIACION)
+            if sobran:
+                errores.append(f'mediacion: claves desconocidas {sorted(sobran)}')
+            if self.mediacion.get('modo', 'subasta') not in MODOS_MEDIACION:
+                errores.append(f'mediacion: modo debe ser uno de {list(MODOS_MEDIACION)}')
+            solicitudes = self.mediacion.get('solicitudes', 1)
+            if not isinstance(solicitudes, int) or solicitudes < 1:
+                errores.append('mediacion: solicitudes debe ser un entero positivo')
+            redes = REDES_MEDIACION
+            if 'redes' in self.mediacion:
+                redes, errores_redes = _errores_redes(self.mediacion['redes'])
+                errores += errores_redes
+                if not self.mediacion['redes']:
+                    errores.append('mediacion: redes necesita al menos una red')
+            cascada = self.mediacion.get('cascada', [(nombre, 0.0) for nombre in REDES_CASCADA])
+            if not cascada or any(not isinstance(nivel, (list, tuple)) or len(nivel) != 2 or not _no_negativo(nivel[1])
+                                  for nivel in cascada):
+                errores.append('mediacion: cascada debe ser una lista de [red, precio mínimo >= 0]')
+            else:
+                desconocidas = sorted({nivel[0] for nivel in cascada} - set(redes))
+                if desconocidas:
+                    errores.append(f'mediacion: la cascada usa redes desconocidas {desconocidas}')
+            if not _no_negativo(self.mediacion.get('precio_minimo', 0)):
+                errores.append('mediacion: precio_minimo debe ser un número no negativo')
+            if not _positivos([self.mediacion.get('tiempo_limite_ms', 1)]):
+                errores.append('mediacion: tiempo_limite_ms debe ser un número positivo')
+        if self.sensibilidad is not None:
+            sobran = self.sensibilidad.keys() - set(CLAVES_SENSIBILIDAD)
+            if sobran:
+                errores.append(f'sensibilidad: claves desconocidas {sorted(sobran)}')
+            for clave in ('meses', 'muestras'):
+                valor = self.sensibilidad.get(clave, 1)
+                if not isinstance(valor, int) or valor < 1:
+                    errores.append(f'sensibilidad: {clave} debe ser un entero positivo')
+            for nombre, rango in self.sensibilidad.get('rangos', {}).items():
+                if nombre not in PARAMETROS_SENSIBILIDAD:
+                    errores.append(f'sensibilidad: parámetro desconocido {nombre!r}')
+                elif len(rango) != 2 or not all(isinstance(v, Real) for v in rango) or rango[0] > rango[1]:
+                    errores.append(f'sensibilidad: el rango de {nombre} debe ser [mínimo, máximo]')
+        if self.eventos is not None and not os.path.isdir(self.eventos):
+            errores.append(f'no existe el directorio de eventos {self.eventos!r}')
+        if self.kpis_reales is not None and not os.path.isfile(self.kpis_reales):
+            errores.append(f'no existe el archivo de KPIs reales {self.kpis_reales!r}')
+        if self.actividad is not None:
+            if not self.actividad:
+                errores.append('actividad necesita al menos un volcado')
+            if self.cohortes is not None:
+                errores.append('actividad y cohortes son excluyentes: ambas definen los usuarios diarios')
+            errores += [f'no existe el volcado de actividad {ruta!r}' for ruta in self.actividad
+                        if not os.path.isfile(ruta)]
+        if self.experimento is not None:
+            sobran = self.experimento.keys() - set(CLAVES_EXPERIMENTO)
+            if sobran:
+                errores.append(f'experimento: claves desconocidas {sorted(sobran)}')
+            archivos = self.experimento.get('archivos')
+            if not archivos or isinstance(archivos, str):
+                errores.append('experimento necesita una lista de archivos')
+            else:
+                errores += [f'no existe el archivo del experimento {ruta!r}' for ruta in archivos
+                            if not os.path.isfile(ruta)]
+            if not isinstance(self.experimento.get('control'), str):
+                errores.append('experimento necesita el nombre de la ubicación de control')
+            for clave, minimo in (('remuestreos', 100), ('miradas', 1), ('cubos', 2)):
+                valor = self.experimento.get(clave, minimo)
+                if not isinstance(valor, int) or isinstance(valor, bool) or valor < minimo:
+                    errores.append(f'experimento: {clave} debe ser un entero >= {minimo}')
+            confianza = self.experimento.get('confianza', 0.95)
+            if not isinstance(confianza, Real) or not 0 < confianza < 1:
+                errores.append('experimento: confianza debe estar en (0, 1)')
+        if not self.salidas:
+            errores.append('salidas necesita al menos un formato')
+        desconocidas = [s for s in self.salidas if s not in SALIDAS]
+        if desconocidas:
+            errores.append(f'salidas desconocidas {desconocidas}; use {list(SALIDAS)}')
+        if errores:
+            raise ValueError(f'Escenario {self.nombre!r} inválido: ' + '; '.join(errores))
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Construye un escenario desde JSON, rechazando claves desconocidas."""
+        conocidos = {f.name for f in fields(cls)}
+        desconocidos = set(datos) - conocidos
+        if desconocidos:
+            raise ValueError(f'Claves desconocidas en el escenario {datos.get("nombre")!r}: {sorted(desconocidos)}')
+        for clave in ('usuarios_diarios', 'actividad', 'salidas'):
+            if datos.get(clave) is not None:
+                datos = {**datos, clave: tuple(datos[clave])}
+        return cls(**datos)
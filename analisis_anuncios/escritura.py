@@ -0,0 +1,125 @@
+"""Escritura secuencial de hojas para libros en modo ``constant_memory``.
+
+En ese modo xlsxwriter vuelca cada fila a disco en cuanto se empieza la
+siguiente y descarta en silencio cualquier escritura a una fila anterior, así
+que todas las hojas deben escribirse estrictamente en orden de filas.
+"""
+import functools
+
+TAMANO_BLOQUE = 65_536
+
+
+def crear_libro(ruta, streaming=False):
+    """Abre el libro; con ``streaming`` la memoria no crece con el número de filas."""
+    import xlsxwriter  # diferido: solo se carga cuando de verdad se genera un libro
+
+    workbook = xlsxwriter.Workbook(ruta, {'constant_memory': streaming})
+    workbook.worksheet_class = _clase_hoja()
+    return workbook
+
+
+@functools.lru_cache(maxsize=None)
+def _clase_hoja():
+    from xlsxwriter.worksheet import Worksheet
+
+    class HojaFormulas(Worksheet):
+        """Hoja que no repasa con expresiones regulares las fórmulas sin funciones.
+
+        xlsxwriter prueba unas 60 sustituciones (``_xlfn.``) en cada fórmula;
+        en columnas de fórmulas aritméticas por fila eso domina el tiempo total.
+        """
+
+        def _prepare_formula(self, formula, expand_future_functions=False):
+            if '(' in formula or '{' in formula:
+                return super()._prepare_formula(formula, expand_future_functions)
+            return formula[1:] if formula.startswith('=') else formula
+
+    return HojaFormulas
+
+
+class EscritorSecuencial:
+    """Escribe una hoja fila por fila, sin volver nunca atrás.
+
+    Volver a una fila ya escrita (p.ej. moviendo ``fila`` hacia atrás) lanza
+    ``ValueError`` en lugar de perder la escritura como haría el modo streaming.
+    """
+
+    def __init__(self, worksheet, fila=0):
+        self.worksheet = worksheet
+        self.fila = fila
+        # Primera fila que aún se puede escribir
+        self._siguiente = fila
+
+    def saltar(self, n=1):
+        self.fila += n
+
+    def escribir_fila(self, valores, formatos=None, formulas=None):
+        """Escribe ``valores`` en la fila actual y avanza.
+
+        ``formatos`` puede ser un único formato o uno por columna; las columnas
+        contiguas con el mismo formato se envían en una sola llamada a ``write_row``.
+        """
+        self.escribir_filas([valores], formatos, formulas)
+
+    def escribir_filas(self, filas, formatos=None, formulas=None):
+        """Consume un iterable de filas (p.ej. un generador) escribiéndolas en orden.
+
+        ``formulas`` (columna -> plantilla con ``{fila}``, la fila de Excel desde 1)
+        escribe esas columnas como fórmulas vivas; el valor de la fila queda como
+        resultado en caché para los lectores que no recalculan.
+        """
+        formulas = formulas or {}
+        tramos = None
+        for valores in filas:
+            if tramos is None:
+                tramos = _tramos(formatos, len(valores), excluir=formulas)
+                celdas_formula = [(col, plantilla, _formato(formatos, col)) for col, plantilla in formulas.items()]
+            self._escribir(valores, tramos)
+            for col, plantilla, formato in celdas_formula:
+                self.worksheet.write_formula(self.fila, col, plantilla.format(fila=self.fila + 1), formato, valores[col])
+            self.fila += 1
+
+    def fusionar(self, primera_col, ultima_col, valor, formato=None):
+        """Celda combinada en la fila actual; avanza a la siguiente."""
+        self._comprobar()
+        self.worksheet.merge_range(self.fila, primera_col, self.fila, ultima_col, valor, formato)
+        self.fila += 1
+
+    def _comprobar(self):
+        if self.fila < self._siguiente:
+            raise ValueError(f'La hoja {self.worksheet.name!r} ya escribió hasta la fila {self._siguiente}; '
+                             f'no se puede volver a la fila {self.fila + 1}')
+        self._siguiente = self.fila + 1
+
+    def _escribir(self, valores, tramos):
+        if self.fila >= self.worksheet.xls_rowmax:
+            raise ValueError(f'La hoja {self.worksheet.name!r} supera el límite de {self.worksheet.xls_rowmax} filas de Excel')
+        self._comprobar()
+        for inicio, fin, formato in tramos:
+            self.worksheet.write_row(self.fila, inicio, valores[inicio:fin], formato)
+
+
+def _formato(formatos, col):
+    return formatos[col] if isinstance(formatos, (list, tuple)) else formatos
+
+
+def _tramos(formatos, columnas, excluir=()):
+    # Columnas contiguas con el mismo formato, saltando las de ``excluir``
+    tramos = []
+    inicio = None
+    for col in range(columnas + 1):
+        corte = col == columnas or col in excluir
+        if inicio is not None and (corte or _formato(formatos, col) is not _formato(formatos, inicio)):
+            tramos.append((inicio, col, _formato(formatos, inicio)))
+            inicio = None
+        if inicio is None and not corte:
+            inicio = col
+    return tramos
+
+
+def filas_desde_columnas(columnas, tamano_bloque=TAMANO_BLOQUE):
+    """Genera filas (listas) a partir de arrays de columnas, por bloques."""
+    total = len(columnas[0])
+    for inicio in range(0, total, tamano_bloque):
+        bloque = [c[inicio:inicio + tamano_bloque].tolist() for c in columnas]
+        yield from map(list, zip(*bloque))
@@ -0,0 +1,362 @@
+"""Ingesta en streaming de logs de eventos de anuncios (JSONL / CSV, opcionalmente .gz).
+
+Cada registro es un evento con fecha, ubicación, tipo de anuncio, tipo de
+evento (solicitud, impresión o clic) e ingreso opcional. Los registros se leen
+por bloques; cada bloque se reduce con NumPy a sumas por grupo
+(ubicación × tipo × día) y se acumula, de modo que la memoria depende del
+número de grupos y del tamaño de bloque, no del tamaño de los logs.
+
+Las fechas pueden ser ISO 8601 o epoch (segundos o milisegundos), mezcladas en
+un mismo archivo. Un registro sin fecha, ubicación, tipo o evento (o con null,
+o con una fecha o un ingreso que no se entienden) detiene la ingesta con un
+``ValueError`` que indica archivo y línea; los eventos de tipo desconocido se
+cuentan como descartados.
+
+Los agregados se guardan como un ``.npy`` por columna más ``esquema.json`` y se
+cargan con ``mmap_mode='r'``: volver a construir el libro no relee los logs.
+"""
+import contextlib
+import csv
+import gzip
+import itertools
+import json
+import os
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+TAMANO_BLOQUE = 200_000
+ESQUEMA = 'esquema.json'
+COLUMNAS = ('dia', 'ubicacion', 'tipo', 'solicitudes', 'impresiones', 'clics', 'ingresos')
+
+# Nombres aceptados para cada campo (exportaciones en español o inglés)
+CAMPOS = {
+    'fecha': ('fecha', 'timestamp', 'ts', 'date'),
+    'ubicacion': ('ubicacion', 'placement'),
+    'tipo': ('tipo_anuncio', 'ad_type', 'format'),
+    'evento': ('evento', 'event'),
+    'ingreso': ('ingreso', 'revenue'),
+}
+SOLICITUD, IMPRESION, CLIC = 0, 1, 2
+EVENTOS = {
+    'solicitud': SOLICITUD, 'request': SOLICITUD,
+    'impresion': IMPRESION, 'impresión': IMPRESION, 'impression': IMPRESION,
+    'clic': CLIC, 'click': CLIC,
+}
+_EPOCH = re.compile(r'\s*\d+(?:\.\d*)?\s*')
+
+
+class Agregados(NamedTuple):
+    """Totales por grupo (una fila por ubicación × tipo × día con eventos)."""
+    dia: np.ndarray  # días desde 1970-01-01
+    ubicacion: np.ndarray  # índice en ``ubicaciones``
+    tipo: np.ndarray  # índice en ``tipos``
+    solicitudes: np.ndarray
+    impresiones: np.ndarray
+    clics: np.ndarray
+    ingresos: np.ndarray
+    ubicaciones: list
+    tipos: list
+
+    def medidas(self, dimension):
+        """CPM, CTR y fill rate medidos por etiqueta de ``dimension`` ('ubicacion' o 'tipo').
+
+        Devuelve ``{etiqueta: {'cpm', 'ctr', 'fill_rate', 'cpm_p5', 'cpm_p95', 'dias'}}``;
+        los percentiles son sobre el CPM diario y solo cuentan días con impresiones.
+        """
+        codigos = getattr(self, dimension)
+        etiquetas = self.ubicaciones if dimension == 'ubicacion' else self.tipos
+        dias = self.dia - self.dia.min() if len(self.dia) else self.dia
+        num_dias = int(dias.max()) + 1 if len(dias) else 0
+        # Suma por (etiqueta, día) con un único bincount sobre el índice combinado
+        indice = codigos.astype(np.int64) * num_dias + dias
+        forma = (len(etiquetas), num_dias)
+
+        def por_dia(valores):
+            return np.bincount(indice, weights=valores, minlength=forma[0] * forma[1]).reshape(forma)
+
+        solicitudes, impresiones = por_dia(self.solicitudes), por_dia(self.impresiones)
+        clics, ingresos = por_dia(self.clics), por_dia(self.ingresos)
+        resultado = {}
+        for i, etiqueta in enumerate(etiquetas):
+            total_imp = impresiones[i].sum()
+            if not total_imp:
+                continue
+            con_impresiones = impresiones[i] > 0
+            cpm_diario = ingresos[i, con_impresiones] / impresiones[i, con_impresiones] * 1000
+            total_sol = solicitudes[i].sum()
+            resultado[etiqueta] = {
+                'cpm': ingresos[i].sum() / total_imp * 1000,
+                'ctr': clics[i].sum() / total_imp,
+                'fill_rate': total_imp / total_sol if total_sol else None,
+                'cpm_p5': float(np.percentile(cpm_diario, 5)),
+                'cpm_p95': float(np.percentile(cpm_diario, 95)),
+                'dias': int(con_impresiones.sum()),
+            }
+        return resultado
+
+    def totales(self):
+        """Las mismas medidas sobre todos los grupos, más rangos P5–P95 diarios."""
+        dias, inverso = np.unique(self.dia, return_inverse=True)
+        diario = {c: np.bincount(inverso, weights=getattr(self, c), minlength=len(dias))
+                  for c in ('solicitudes', 'impresiones', 'clics', 'ingresos')}
+        con_imp = diario['impresiones'] > 0
+        con_sol = diario['solicitudes'] > 0
+        imp = diario['impresiones'].sum()
+        sol = diario['solicitudes'].sum()
+
+        def banda(valores):
+            return (float(np.percentile(valores, 5)), float(np.percentile(valores, 95))) if len(valores) else None
+
+        return {
+            'cpm': diario['ingresos'].sum() / imp * 1000 if imp else None,
+            'ctr': diario['clics'].sum() / imp if imp else None,
+            'fill_rate': imp / sol if sol else None,
+            'cpm_banda': banda(diario['ingresos'][con_imp] / diario['impresiones'][con_imp] * 1000),
+            'ctr_banda': banda(diario['clics'][con_imp] / diario['impresiones'][con_imp]),
+            'fill_banda': banda(diario['impresiones'][con_sol] / diario['solicitudes'][con_sol]),
+            'dias': int(len(dias)),
+        }
+
+
+def _abrir(ruta):
+    if ruta.endswith('.gz'):
+        return gzip.open(ruta, 'rt', encoding='utf-8', newline='')
+    return open(ruta, encoding='utf-8', newline='')
+
+
+def _registros(ruta):
+    # (línea, registro); en CSV la línea es la última del registro (los campos pueden ocupar varias)
+    base = ruta[:-3] if ruta.endswith('.gz') else ruta
+    with _abrir(ruta) as f:
+        if base.endswith('.csv'):
+            lector = csv.DictReader(f)
+            for registro in lector:
+                yield lector.line_num, registro
+        else:
+            for numero, linea in enumerate(f, 1):
+                if not linea.strip():
+                    continue
+                try:
+                    registro = json.loads(linea)
+                except ValueError as error:
+                    raise ValueError(f'{ruta}:{numero}: JSON inválido ({error})') from None
+                if not isinstance(registro, dict):
+                    raise ValueError(f'{ruta}:{numero}: se esperaba un objeto JSON')
+                yield numero, registro
+
+
+def _resolver_campos(registro, ruta, numero):
+    campos = {}
+    for campo, alias in CAMPOS.items():
+        encontrado = next((a for a in alias if a in registro), None)
+        if encontrado is None and campo != 'ingreso':
+            raise ValueError(f'{ruta}:{numero}: falta el campo {campo!r} (se acepta {", ".join(alias)})')
+        campos[campo] = encontrado
+    return campos
+
+
+def _es_epoch(valor):
+    if isinstance(valor, str):
+        return _EPOCH.fullmatch(valor) is not None
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def _dias(valores):
+    """Días desde 1970-01-01 de fechas ISO o epoch (segundos o milisegundos); el formato se detecta por valor."""
+    epoch = np.fromiter(map(_es_epoch, valores), dtype=bool, count=len(valores))
+    if epoch.all():
+        return _dias_epoch(valores)
+    if not epoch.any():
+        return _dias_iso(valores)
+    dias = np.empty(len(valores), dtype=np.int32)
+    dias[epoch] = _dias_epoch([v for v, e in zip(valores, epoch.tolist()) if e])
+    dias[~epoch] = _dias_iso([v for v, e in zip(valores, epoch.tolist()) if not e])
+    return dias
+
+
+def _dias_epoch(valores):
+    segundos = np.asarray(valores, dtype=np.float64)
+    segundos = np.where(segundos > 1e11, segundos / 1000, segundos)  # epoch en milisegundos
+    return (segundos // 86400).astype(np.int32)
+
+
+def _dias_iso(valores):
+    return np.array([str(v)[:10] for v in valores], dtype='datetime64[D]').astype(np.int32)
+
+
+def _primer_error(valores, convertir):
+    # Posición del primer valor que ``convertir`` rechaza (solo se busca tras un fallo del bloque)
+    for i, valor in enumerate(valores):
+        try:
+            convertir([valor])
+        except (TypeError, ValueError):
+            return i
+    return 0
+
+
+def _codificar(valores, codigos):
+    # np.unique por bloque: un solo acceso al diccionario por valor distinto
+    unicos, inverso = np.unique(np.asarray(valores, dtype=str), return_inverse=True)
+    mapa = np.array([codigos.setdefault(u, len(codigos)) for u in unicos.tolist()], dtype=np.int64)
+    return mapa[inverso]
+
+
+class _Acumulador:
+    def __init__(self):
+        self.ubicaciones = {}
+        self.tipos = {}
+        self.grupos = {}
+        self.sumas = np.zeros((4, 1024))
+        self.leidas = 0
+        self.descartadas = 0
+
+    def agregar(self, bloque, campos, ruta):
+        """Suma un bloque de ``(línea, registro)``; ``campos`` es el nombre de cada campo en los registros."""
+        self.leidas += len(bloque)
+        if campos['ingreso'] is None:
+            # El ingreso es opcional: en JSONL puede no aparecer hasta un registro posterior al primero
+            campos['ingreso'] = next((a for a in CAMPOS['ingreso'] for _, r in bloque if a in r), None)
+        numeros = [n for n, _ in bloque]
+        columnas = {campo: [r.get(clave) for _, r in bloque]
+                    for campo, clave in campos.items() if campo != 'ingreso'}
+        for campo, valores in columnas.items():
+            if None in valores or '' in valores:
+                i = next(i for i, v in enumerate(valores) if v is None or v == '')
+                raise ValueError(f'{ruta}:{numeros[i]}: falta el campo {campo!r} o es nulo')
+
+        evento = np.array([EVENTOS.get(str(n).strip().lower(), -1) for n in columnas['evento']], dtype=np.int8)
+        validos = evento >= 0
+        self.descartadas += int((~validos).sum())
+        if not validos.any():
+            return
+        if not validos.all():
+            elegidos = validos.tolist()
+            numeros = [n for n, v in zip(numeros, elegidos) if v]
+            columnas = {campo: [x for x, v in zip(valores, elegidos) if v] for campo, valores in columnas.items()}
+            bloque = [r for r, v in zip(bloque, elegidos) if v]
+        evento = evento[validos]
+
+        dia = self._convertir(_dias, columnas['fecha'], 'fecha', numeros, ruta).astype(np.int64)
+        ubicacion = _codificar(columnas['ubicacion'], self.ubicaciones)
+        tipo = _codificar(columnas['tipo'], self.tipos)
+        if campos['ingreso']:
+            ingresos = [r.get(campos['ingreso']) or 0 for _, r in bloque]
+            ingreso = self._convertir(lambda v: np.array(v, dtype=np.float64), ingresos, 'ingreso', numeros, ruta)
+        else:
+            ingreso = np.zeros(len(bloque))
+
+        clave = (ubicacion << 48) | (tipo << 32) | (dia & 0xFFFFFFFF)
+        unicas, inverso = np.unique(clave, return_inverse=True)
+        sumas = np.stack([
+            np.bincount(inverso, weights=evento == SOLICITUD, minlength=len(unicas)),
+            np.bincount(inverso, weights=evento == IMPRESION, minlength=len(unicas)),
+            np.bincount(inverso, weights=evento == CLIC, minlength=len(unicas)),
+            np.bincount(inverso, weights=ingreso, minlength=len(unicas)),
+        ])
+        indices = np.array([self.grupos.setdefault(k, len(self.grupos)) for k in unicas.tolist()])
+        capacidad = self.sumas.shape[1]
+        if len(self.grupos) > capacidad:
+            self.sumas = np.pad(self.sumas, ((0, 0), (0, max(len(self.grupos), 2 * capacidad) - capacidad)))
+        self.sumas[:, indices] += sumas
+
+    @staticmethod
+    def _convertir(convertir, valores, campo, numeros, ruta):
+        try:
+            return convertir(valores)
+        except (TypeError, ValueError):
+            i = _primer_error(valores, convertir)
+            raise ValueError(f'{ruta}:{numeros[i]}: valor no válido en {campo!r}: {valores[i]!r}') from None
+
+    def resultado(self):
+        claves = np.fromiter(self.grupos, dtype=np.int64, count=len(self.grupos))
+        sumas = self.sumas[:, list(self.grupos.values())]
+        dia = (claves & 0xFFFFFFFF).astype(np.uint32).astype(np.int32)
+        ubicacion = (claves >> 48).astype(np.int16)
+        tipo = ((claves >> 32) & 0xFFFF).astype(np.int16)
+        orden = np.lexsort((tipo, ubicacion, dia))
+        return Agregados(
+            dia=dia[orden],
+            ubicacion=ubicacion[orden],
+            tipo=tipo[orden],
+            solicitudes=sumas[0, orden].astype(np.int64),
+            impresiones=sumas[1, orden].astype(np.int64),
+            clics=sumas[2, orden].astype(np.int64),
+            ingresos=sumas[3, orden],
+            ubicaciones=list(self.ubicaciones),
+            tipos=list(self.tipos),
+        )
+
+
+def _huella_fuentes(rutas):
+    return [[os.path.abspath(r), os.path.getsize(r), os.stat(r).st_mtime_ns] for r in sorted(rutas)]
+
+
+def ingerir(rutas, directorio, tamano_bloque=TAMANO_BLOQUE, forzar=False):
+    """Agrega los logs ``rutas`` en ``directorio`` y devuelve los ``Agregados`` (mapeados).
+
+    Si los archivos no cambiaron desde la última ingesta (ruta, tamaño y fecha)
+    se reutiliza el resultado guardado sin leerlos.
+    """
+    fuentes = _huella_fuentes(rutas)
+    if not forzar:
+        try:
+            with open(os.path.join(directorio, ESQUEMA), encoding='utf-8') as f:
+                if json.load(f)['fuentes'] == fuentes:
+                    return cargar(directorio)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    acumulador = _Acumulador()
+    for ruta in rutas:
+        registros = _registros(ruta)
+        primero = next(registros, None)
+        if primero is None:
+            continue
+        campos = _resolver_campos(primero[1], ruta, primero[0])
+        registros = itertools.chain([primero], registros)
+        while True:
+            bloque = list(itertools.islice(registros, tamano_bloque))
+            if not bloque:
+                break
+            acumulador.agregar(bloque, campos, ruta)
+
+    agregados = acumulador.resultado()
+    os.makedirs(directorio, exist_ok=True)
+    # Sin esquema la ingesta anterior deja de valer antes de tocar sus columnas:
+    # si esta se interrumpe, la próxima vuelve a leer los logs
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(os.path.join(directorio, ESQUEMA))
+    for columna in COLUMNAS:
+        # Por archivo temporal: los Agregados ya cargados siguen mapeando las columnas viejas
+        ruta = os.path.join(directorio, f'{columna}.npy')
+        with open(ruta + '.tmp', 'wb') as f:
+            np.save(f, getattr(agregados, columna))
+        os.replace(ruta + '.tmp', ruta)
+    esquema = {
+        'ubicaciones': agregados.ubicaciones,
+        'tipos': agregados.tipos,
+        'fuentes': fuentes,
+        'filas_leidas': acumulador.leidas,
+        'filas_descartadas': acumulador.descartadas,
+        'grupos': len(agregados.dia),
+    }
+    # El esquema se escribe al final: sin él la caché se considera incompleta
+    with open(os.path.join(directorio, ESQUEMA), 'w', encoding='utf-8') as f:
+        json.dump(esquema, f, ensure_ascii=False, indent=2)
+    return cargar(directorio)
+
+
+def cargar(directorio):
+    """Agregados guardados por ``ingerir``, con las columnas mapeadas en memoria."""
+    with open(os.path.join(directorio, ESQUEMA), encoding='utf-8') as f:
+        esquema = json.load(f)
+    columnas = {c: np.load(os.path.join(directorio, f'{c}.npy'), mmap_mode='r') for c in COLUMNAS}
+    return Agregados(**columnas, ubicaciones=esquema['ubicaciones'], tipos=esquema['tipos'])
+
+
+def huella_directorio(directorio):
+    """Contenido de ``esquema.json``: cambia con cada ingesta de logs distintos."""
+    with open(os.path.join(directorio, ESQUEMA), encoding='utf-8') as f:
+        return f.read()
@@ -0,0 +1,277 @@
+"""Análisis de experimentos A/B de ubicaciones de anuncios.
+
+Cada archivo (CSV con encabezado o JSONL, opcionalmente .gz) tiene una fila
+por usuario del experimento con su identificador, la variante asignada (una
+ubicación de "Ubicaciones de Anuncios") y el ingreso que generó, en el orden
+en que los usuarios entraron al experimento. Las filas se leen por bloques y
+se reducen a sumas, de modo que la memoria no depende del número de usuarios:
+
+- Cubos: cada usuario cae en uno de ``cubos`` cubos por el CRC32 de su
+  identificador. El bootstrap remuestrea cubos (con sus sumas de ingresos y
+  usuarios) en lugar de usuarios: ``remuestreos`` × millones de usuarios
+  serían decenas de miles de millones de sorteos, y con cientos de cubos la
+  distribución del ingreso por usuario es prácticamente la misma. Los
+  remuestreos se generan por bloques con NumPy y cada variante se remuestrea
+  por separado.
+- Tramos: sumas de usuarios, ingresos e ingresos al cuadrado en como mucho
+  ``MAX_TRAMOS`` tramos consecutivos de igual número de filas, con las que se
+  reconstruye el estadístico z de cada mirada intermedia sin releer los datos.
+  Cuando una fila no cabe, cada par de tramos vecinos se fusiona y el ancho
+  se duplica: siempre hay entre ``MAX_TRAMOS / 2`` y ``MAX_TRAMOS`` tramos en
+  uso, de modo que cada mirada cae a menos de 2 / ``MAX_TRAMOS`` de los
+  usuarios de su fracción.
+
+Las miradas se reparten en fracciones iguales de los usuarios. Sus fronteras
+son las de O'Brien-Fleming con gasto de alfa de Lan-DeMets
+(α(t) = 2 − 2Φ(z₁₋α/₂ / √t)), calculadas por simulación de la secuencia de
+estadísticos z; el alfa se reparte (Bonferroni) entre las comparaciones con
+el control.
+"""
+import csv
+import itertools
+import json
+import operator
+import zlib
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.eventos import _abrir, _codificar, _huella_fuentes
+
+TAMANO_BLOQUE = 200_000
+MAX_TRAMOS = 1_024  # par: los tramos se fusionan de dos en dos
+REMUESTREOS = 10_000
+BLOQUE_REMUESTREOS = 500
+CUBOS = 1_000
+MIRADAS = 5
+CONFIANZA = 0.95
+TRAYECTORIAS = 200_000
+
+# Nombres aceptados para cada campo (exportaciones en español o inglés)
+CAMPOS = {
+    'usuario': ('usuario', 'usuario_id', 'user_id', 'user'),
+    'variante': ('variante', 'variant', 'ubicacion', 'placement'),
+    'ingreso': ('ingreso', 'ingresos', 'revenue'),
+}
+
+
+class Experimento(NamedTuple):
+    """Resultado por variante (el control primero) y por mirada."""
+    variantes: list  # nombres de las variantes
+    usuarios: np.ndarray  # usuarios de cada variante
+    ingresos: np.ndarray  # ingresos totales de cada variante
+    lift: np.ndarray  # ingreso por usuario relativo al control − 1 (0 en el control)
+    ic_inferior: np.ndarray  # percentiles bootstrap del lift al nivel ``confianza``
+    ic_superior: np.ndarray
+    prob_mejora: np.ndarray  # fracción de remuestreos con lift > 0
+    miradas: np.ndarray  # usuarios acumulados (todas las variantes) en cada mirada
+    z: np.ndarray  # (variantes, miradas) estadístico z de Welch frente al control (NaN en el control)
+    fronteras: np.ndarray  # (variantes, miradas) |z| que detiene el experimento
+    remuestreos: int
+    cubos: int
+    confianza: float
+
+    def por_usuario(self):
+        return self.ingresos / self.usuarios
+
+    def parada(self, i):
+        """Primera mirada (desde 0) en la que la variante ``i`` cruza su frontera, o None."""
+        cruces = np.flatnonzero(np.abs(self.z[i]) >= self.fronteras[i])
+        return int(cruces[0]) if len(cruces) else None
+
+
+def _campos(nombres, ruta):
+    encontrados = {}
+    for campo, alias in CAMPOS.items():
+        encontrado = next((a for a in alias if a in nombres), None)
+        if encontrado is None:
+            raise ValueError(f'{ruta}: falta el campo {campo!r} (se acepta {", ".join(alias)})')
+        encontrados[campo] = encontrado
+    return [encontrados[campo] for campo in CAMPOS]
+
+
+def _bloques(ruta, tamano_bloque):
+    # Listas de tuplas (usuario, variante, ingreso) en el orden del archivo
+    base = ruta[:-3] if ruta.endswith('.gz') else ruta
+    with _abrir(ruta) as f:
+        if base.endswith('.csv'):
+            lector = csv.reader(f)
+            encabezado = [c.strip() for c in next(lector, [])]
+            if not encabezado:
+                return
+            extraer = operator.itemgetter(*(encabezado.index(c) for c in _campos(encabezado, ruta)))
+            filas = map(extraer, filter(None, lector))
+        else:
+            registros = (json.loads(linea) for linea in f if linea.strip())
+            primero = next(registros, None)
+            if primero is None:
+                return
+            extraer = operator.itemgetter(*_campos(primero, ruta))
+            filas = map(extraer, itertools.chain([primero], registros))
+        while True:
+            bloque = list(itertools.islice(filas, tamano_bloque))
+            if not bloque:
+                break
+            yield bloque
+
+
+class _Acumulador:
+    def __init__(self, cubos):
+        self.variantes = {}
+        self.cubos = cubos
+        # Por variante: ingresos y usuarios de cada cubo
+        self.sumas = np.zeros((0, cubos))
+        self.conteos = np.zeros((0, cubos))
+        # Usuarios, ingresos e ingresos² por variante y tramo de ``ancho_tramo`` filas
+        self.tramos = np.zeros((3, 0, MAX_TRAMOS))
+        self.ancho_tramo = 1
+        self.filas = 0
+
+    def _crecer(self, variantes):
+        v = len(self.sumas)
+        if variantes > v:
+            self.sumas = np.pad(self.sumas, ((0, variantes - v), (0, 0)))
+            self.conteos = np.pad(self.conteos, ((0, variantes - v), (0, 0)))
+            self.tramos = np.pad(self.tramos, ((0, 0), (0, variantes - v), (0, 0)))
+
+    def _ensanchar(self, ultima_fila):
+        # Fusiona los tramos de dos en dos (ancho doble) hasta que ``ultima_fila`` quepa en el último
+        while ultima_fila // self.ancho_tramo >= MAX_TRAMOS:
+            fusionados = self.tramos.reshape(3, len(self.sumas), MAX_TRAMOS // 2, 2).sum(axis=3)
+            self.tramos = np.concatenate([fusionados, np.zeros_like(fusionados)], axis=2)
+            self.ancho_tramo *= 2
+
+    def agregar(self, bloque):
+        usuarios, variantes, ingresos = zip(*bloque)
+        variante = _codificar(variantes, self.variantes)
+        # Ingreso vacío o nulo: el usuario no generó ingresos
+        ingreso = np.array([float(v) if v not in (None, '') else 0.0 for v in ingresos])
+        cubo = np.fromiter(map(zlib.crc32, map(str.encode, map(str, usuarios))), np.int64, len(bloque)) % self.cubos
+        self._ensanchar(self.filas + len(bloque) - 1)
+        tramo = (self.filas + np.arange(len(bloque))) // self.ancho_tramo
+        self.filas += len(bloque)
+
+        n_variantes, primero = len(self.variantes), int(tramo[0])
+        ancho = int(tramo[-1]) - primero + 1
+        self._crecer(n_variantes)
+        celda = variante * self.cubos + cubo
+        self.sumas += np.bincount(celda, weights=ingreso, minlength=n_variantes * self.cubos).reshape(n_variantes, -1)
+        self.conteos += np.bincount(celda, minlength=n_variantes * self.cubos).reshape(n_variantes, -1)
+        celda = variante * ancho + (tramo - primero)
+        for k, pesos in enumerate((None, ingreso, ingreso ** 2)):
+            self.tramos[k, :, primero:primero + ancho] += np.bincount(
+                celda, weights=pesos, minlength=n_variantes * ancho).reshape(n_variantes, ancho)
+
+
+def _remuestrear(sumas, conteos, remuestreos, rng, bloque=BLOQUE_REMUESTREOS):
+    """Ingreso por usuario de ``remuestreos`` remuestras con reemplazo de los cubos no vacíos."""
+    llenos = conteos > 0
+    sumas, conteos = sumas[llenos], conteos[llenos]
+    g = len(sumas)
+    medias = np.empty(remuestreos)
+    for inicio in range(0, remuestreos, bloque):
+        n = min(bloque, remuestreos - inicio)
+        # Veces que sale cada cubo en cada remuestra: un bincount sobre todas las del bloque
+        indices = rng.integers(0, g, (n, g)) + np.arange(n)[:, None] * g
+        veces = np.bincount(indices.ravel(), minlength=n * g).reshape(n, g)
+        medias[inicio:inicio + n] = (veces @ sumas) / (veces @ conteos)
+    return medias
+
+
+def fronteras_secuenciales(fracciones, alfa, trayectorias=TRAYECTORIAS, semilla=0):
+    """|z| de parada en cada mirada para un test bilateral con gasto de alfa O'Brien-Fleming.
+
+    ``fracciones`` son las fracciones de información (crecientes, la última 1). Las
+    fronteras se calibran sobre ``trayectorias`` secuencias simuladas de estadísticos
+    z bajo la hipótesis nula: en cada mirada se detiene la fracción de alfa gastada
+    en ella entre las secuencias que aún no se detuvieron.
+    """
+    t = np.asarray(fracciones, dtype=np.float64)
+    normal = NormalDist()
+    z = normal.inv_cdf(1 - alfa / 2)
+    gasto = np.diff(np.array([0.0] + [2 - 2 * normal.cdf(z / np.sqrt(x)) for x in t]))
+
+    rng = np.random.default_rng(semilla)
+    incrementos = rng.standard_normal((trayectorias, len(t))) * np.sqrt(np.diff(t, prepend=0.0))
+    estadisticos = np.abs(np.cumsum(incrementos, axis=1) / np.sqrt(t))
+    vivas = np.ones(trayectorias, dtype=bool)
+    fronteras = np.empty(len(t))
+    for k, alfa_k in enumerate(gasto):
+        paradas = int(round(alfa_k * trayectorias))
+        if paradas < 1:
+            # Gasto por debajo de la resolución de la simulación (primeras miradas de
+            # O'Brien-Fleming): las miradas anteriores apenas cambian la frontera
+            fronteras[k] = normal.inv_cdf(1 - alfa_k / 2) if alfa_k > 0 else np.inf
+        else:
+            fronteras[k] = -np.partition(-estadisticos[vivas, k], paradas - 1)[paradas - 1]
+        vivas &= estadisticos[:, k] < fronteras[k]
+    return fronteras
+
+
+def _welch(tramos, control, hasta):
+    # Estadístico z de cada variante frente al control con los tramos [0, hasta) de cada mirada
+    acumulados = np.cumsum(tramos, axis=2)[:, :, np.asarray(hasta) - 1]
+    n, s, s2 = acumulados
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = s / n
+        varianza = (s2 - n * media ** 2) / (n - 1)
+        error = np.sqrt(varianza / n + varianza[control] / n[control])
+        z = (media - media[control]) / error
+    z[control] = np.nan
+    return z, n
+
+
+def analizar_experimento(rutas, control, remuestreos=REMUESTREOS, confianza=CONFIANZA, miradas=MIRADAS,
+                         cubos=CUBOS, semilla=None, tamano_bloque=TAMANO_BLOQUE):
+    """Lift, intervalos bootstrap y fronteras secuenciales de los archivos ``rutas`` frente a ``control``."""
+    acumulador = _Acumulador(cubos)
+    for ruta in rutas:
+        for bloque in _bloques(ruta, tamano_bloque):
+            acumulador.agregar(bloque)
+    nombres = list(acumulador.variantes)
+    if control not in acumulador.variantes:
+        raise ValueError(f'experimento: el control {control!r} no aparece en los datos (variantes: {nombres})')
+    if len(nombres) < 2:
+        raise ValueError('experimento: hacen falta al menos dos variantes')
+    # El control primero y el resto en orden de aparición
+    orden = [acumulador.variantes[control]] + [i for i in range(len(nombres)) if nombres[i] != control]
+    sumas, conteos = acumulador.sumas[orden], acumulador.conteos[orden]
+    # Tramos en uso (los siguientes siguen vacíos)
+    tramos = acumulador.tramos[:, orden, :-(-acumulador.filas // acumulador.ancho_tramo)]
+
+    rng = np.random.default_rng(semilla)
+    medias = np.stack([_remuestrear(sumas[i], conteos[i], remuestreos, rng) for i in range(len(orden))])
+    lifts = medias / medias[0] - 1
+    usuarios, ingresos = conteos.sum(axis=1), sumas.sum(axis=1)
+    cola = (1 - confianza) / 2 * 100
+
+    # Miradas en fracciones iguales de los tramos (menos si hay pocos tramos)
+    total = tramos.shape[2]
+    hasta = np.unique(np.ceil(np.arange(1, miradas + 1) * total / miradas).astype(np.int64))
+    z, n = _welch(tramos, 0, hasta)
+    alfa = (1 - confianza) / (len(orden) - 1)
+    fronteras = np.full(z.shape, np.nan)
+    for i in range(1, len(orden)):
+        pares = n[0] + n[i]
+        fronteras[i] = fronteras_secuenciales(pares / pares[-1], alfa, semilla=0)
+    return Experimento(
+        variantes=[nombres[i] for i in orden],
+        usuarios=usuarios.astype(np.int64),
+        ingresos=ingresos,
+        lift=(ingresos / usuarios) / (ingresos[0] / usuarios[0]) - 1,
+        ic_inferior=np.percentile(lifts, cola, axis=1),
+        ic_superior=np.percentile(lifts, 100 - cola, axis=1),
+        prob_mejora=(lifts > 0).mean(axis=1),
+        miradas=n.sum(axis=0).astype(np.int64),
+        z=z,
+        fronteras=fronteras,
+        remuestreos=remuestreos,
+        cubos=cubos,
+        confianza=confianza,
+    )
+
+
+def huella_experimento(rutas):
+    """Ruta, tamaño y fecha de cada archivo del experimento: cambia si se reemplaza alguno, sin leerlos."""
+    return _huella_fuentes(rutas)
@@ -0,0 +1,227 @@
+"""Exportación de las tablas del libro a CSV, JSON Lines y formato columnar.
+
+Los paneles solo necesitan los números: ``exportar`` recorre las mismas ``Hoja``
+que ``hojas.renderizar`` y escribe cada ``Tabla`` con ``nombre`` sin pasar por
+xlsxwriter (ni XML ni zip). Las tablas con origen ``hojas.Columnas``
+(proyecciones, rejilla, cohortes...) se escriben por bloques directamente desde
+sus arrays: cada columna se convierte a texto con NumPy y las líneas se
+concatenan columna a columna, sin objetos por celda. Las demás (tablas de
+referencia, unas pocas filas) se pasan a columnas una sola vez.
+
+Formatos (``EXPORTADORES``; se puede registrar cualquier clase con la misma
+interfaz ``(ruta_base, encabezados)`` / ``escribir(columnas)`` / ``cerrar()``):
+
+- ``csv``: encabezados en la primera fila; NaN y None quedan vacíos.
+- ``jsonl``: un objeto por fila con los encabezados como claves; NaN y None son null.
+- ``columnar``: un directorio por tabla con un ``.npy`` por columna y
+  ``esquema.json``, como los agregados de ``analisis_anuncios.eventos``; se lee
+  con ``np.load(..., mmap_mode='r')``.
+
+Todos los formatos pedidos se alimentan en la misma pasada por los datos de
+cada tabla, y ``indice.json`` (escrito al final) lista tablas, columnas, filas y
+archivos.
+"""
+import json
+import os
+import shutil
+from numbers import Integral, Number
+
+import numpy as np
+
+from analisis_anuncios.hojas import Columnas, Tabla
+from analisis_anuncios.perfil import SinPerfil
+
+INDICE = 'indice.json'
+ESQUEMA = 'esquema.json'
+
+
+def _numero(v):
+    return isinstance(v, Number) and not isinstance(v, bool)
+
+
+def _columna(valores):
+    # Columna de una tabla de filas: entera o real si todos los valores son números (None -> NaN)
+    if all(isinstance(v, Integral) and not isinstance(v, bool) for v in valores):
+        return np.array(valores, dtype=np.int64)
+    if all(v is None or _numero(v) for v in valores):
+        return np.array([np.nan if v is None else float(v) for v in valores])
+    return np.array(valores, dtype=object)
+
+
+def _bloques(tabla):
+    if isinstance(tabla.filas, Columnas):
+        for columnas in tabla.filas.por_bloques():
+            yield [np.asarray(c) for c in columnas]
+        return
+    filas = [list(fila) for fila in (tabla.filas() if callable(tabla.filas) else tabla.filas)]
+    if filas:
+        yield [_columna(list(valores)) for valores in zip(*filas)]
+
+
+def _texto(columna, nulo, texto):
+    """Cada valor de ``columna`` como texto; ``texto(valor)`` serializa los no numéricos."""
+    if columna.dtype.kind in 'iu':
+        return columna.astype(str)
+    if columna.dtype.kind == 'f':
+        finitos = np.isfinite(columna)
+        return columna.astype(str) if finitos.all() else np.where(finitos, columna.astype(str), nulo)
+    # Texto o mezcla (tablas pequeñas): una serialización por valor distinto
+    vistos = {}
+    return np.array([
+        vistos[v] if v in vistos else vistos.setdefault(v, _valor(v, nulo, texto))
+        for v in columna.tolist()
+    ])
+
+
+def _valor(v, nulo, texto):
+    if v is None or (isinstance(v, float) and not np.isfinite(v)):
+        return nulo
+    if _numero(v):
+        return str(v) if isinstance(v, Integral) else repr(float(v))
+    return texto(str(v))
+
+
+def _lineas(partes):
+    """Concatena elemento a elemento arrays de texto y constantes; una cadena por fila."""
+    linea = partes[0]
+    for parte in partes[1:]:
+        linea = np.char.add(linea, parte)
+    return linea
+
+
+def _csv(texto):
+    if any(c in texto for c in ',"\r\n'):
+        return '"' + texto.replace('"', '""') + '"'
+    return texto
+
+
+def _json(texto):
+    return json.dumps(texto, ensure_ascii=False)
+
+
+class ExportadorCSV:
+    extension = '.csv'
+
+    def __init__(self, ruta_base, encabezados):
+        self.ruta = ruta_base + self.extension
+        self._archivo = open(self.ruta, 'w', encoding='utf-8', newline='')
+        self._archivo.write(','.join(_csv(e) for e in encabezados) + '\n')
+
+    def escribir(self, columnas):
+        partes = []
+        for i, columna in enumerate(columnas):
+            partes += [','] * bool(i) + [_texto(columna, '', _csv)]
+        self._archivo.write('\n'.join(_lineas(partes).tolist()) + '\n')
+
+    def cerrar(self):
+        self._archivo.close()
+        return self.ruta
+
+
+class ExportadorJSONL(ExportadorCSV):
+    extension = '.jsonl'
+
+    def __init__(self, ruta_base, encabezados):
+        self.ruta = ruta_base + self.extension
+        self._archivo = open(self.ruta, 'w', encoding='utf-8', newline='')
+        # Prefijo de cada valor: '{"clave": ' en la primera columna y ', "clave": ' en las demás
+        self._claves = [('{' if i == 0 else ', ') + _json(e) + ': ' for i, e in enumerate(encabezados)]
+
+    def escribir(self, columnas):
+        partes = []
+        for clave, columna in zip(self._claves, columnas):
+            partes += [clave, _texto(columna, 'null', _json)]
+        self._archivo.write('\n'.join(_lineas(partes + ['}']).tolist()) + '\n')
+
+
+class ExportadorColumnar:
+    """Un ``.npy`` por columna; las numéricas se vuelcan por bloques sin acumularse en memoria."""
+
+    def __init__(self, ruta_base, encabezados):
+        self.ruta = ruta_base
+        self.encabezados = list(encabezados)
+        self.filas = 0
+        self._tipos = None
+        self._crudos = []  # archivo temporal de cada columna numérica, o lista de bloques de texto
+        os.makedirs(self.ruta, exist_ok=True)
+
+    def _archivo(self, i):
+        return os.path.join(self.ruta, f'{i:02d}.npy')
+
+    def escribir(self, columnas):
+        if self._tipos is None:
+            self._tipos = [c.dtype if c.dtype.kind in 'iuf' else None for c in columnas]
+            self._crudos = [open(self._archivo(i) + '.tmp', 'wb') if tipo is not None else []
+                            for i, tipo in enumerate(self._tipos)]
+        for columna, tipo, crudo in zip(columnas, self._tipos, self._crudos):
+            if tipo is not None:
+                crudo.write(np.ascontiguousarray(columna, dtype=tipo).tobytes())
+            else:
+                crudo.append(['' if v is None else str(v) for v in columna.tolist()])
+        self.filas += len(columnas[0])
+
+    def cerrar(self):
+        esquema = []
+        for i, encabezado in enumerate(self.encabezados):
+            tipo = self._tipos[i] if self._tipos else np.dtype(np.float64)
+            crudo = self._crudos[i] if self._crudos else None
+            if tipo is None:
+                valores = np.array([v for bloque in crudo for v in bloque], dtype=str)
+                np.save(self._archivo(i), valores)
+                tipo = valores.dtype
+            else:
+                # Cabecera .npy con el número de filas ya conocido seguida de los datos volcados
+                with open(self._archivo(i), 'wb') as f:
+                    np.lib.format.write_array_header_1_0(
+                        f, {'descr': np.lib.format.dtype_to_descr(tipo), 'fortran_order': False,
+                            'shape': (self.filas,)})
+                    if crudo is not None:
+                        crudo.close()
+                        with open(crudo.name, 'rb') as datos:
+                            shutil.copyfileobj(datos, f)
+                        os.remove(crudo.name)
+            esquema.append({'nombre': encabezado, 'archivo': os.path.basename(self._archivo(i)), 'tipo': tipo.str})
+        with open(os.path.join(self.ruta, ESQUEMA), 'w', encoding='utf-8') as f:
+            json.dump({'columnas': esquema, 'filas': self.filas}, f, ensure_ascii=False, indent=2)
+        return self.ruta
+
+
+EXPORTADORES = {
+    'csv': ExportadorCSV,
+    'jsonl': ExportadorJSONL,
+    'columnar': ExportadorColumnar,
+}
+
+
+def exportar(hojas, directorio, formatos, perfil=SinPerfil()):
+    """Escribe las tablas con nombre de ``hojas`` en ``directorio`` en cada uno de ``formatos``.
+
+    Devuelve la ruta de ``indice.json``, que se escribe al final.
+    """
+    desconocidos = [f for f in formatos if f not in EXPORTADORES]
+    if desconocidos:
+        raise ValueError(f'formatos de exportación desconocidos {desconocidos}; use {sorted(EXPORTADORES)}')
+    os.makedirs(directorio, exist_ok=True)
+    indice = {}
+    with perfil.fase('exportacion'):
+        for hoja in hojas:
+            for tabla in hoja.bloques:
+                if not isinstance(tabla, Tabla) or not tabla.nombre:
+                    continue
+                exportadores = [EXPORTADORES[f](os.path.join(directorio, tabla.nombre), tabla.encabezados)
+                                for f in formatos]
+                filas = 0
+                for columnas in _bloques(tabla):
+                    for exportador in exportadores:
+                        exportador.escribir(columnas)
+                    filas += len(columnas[0])
+                indice[tabla.nombre] = {
+                    'hoja': hoja.nombre,
+                    'columnas': tabla.encabezados,
+                    'filas': filas,
+                    'archivos': {f: os.path.basename(e.cerrar()) for f, e in zip(formatos, exportadores)},
+                }
+    ruta = os.path.join(directorio, INDICE)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'tablas': indice}, f, ensure_ascii=False, indent=2)
+    return ruta
@@ -0,0 +1,105 @@
+"""Registro de formatos internados y clasificadores valor -> formato.
+
+``workbook.add_format`` crea un objeto por llamada aunque las propiedades se
+repitan. El registro guarda definiciones por nombre y crea cada formato solo
+la primera vez que se usa, reutilizando el mismo objeto para propiedades
+equivalentes: el número de formatos crece con los estilos distintos, no con
+las celdas.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable, Collection, Tuple, Union
+
+
+def _canonizar(propiedades):
+    # Propiedades equivalentes (orden, True/1, mayúsculas en colores, False/None
+    # = ausente) producen la misma clave
+    clave = []
+    for nombre, valor in propiedades.items():
+        if valor is None or valor is False:
+            continue
+        if valor is True:
+            valor = 1
+        elif isinstance(valor, str) and 'color' in nombre:
+            valor = valor.lower()
+        clave.append((nombre, valor))
+    return tuple(sorted(clave))
+
+
+class RegistroFormatos(Mapping):
+    """Formatos por nombre, creados bajo demanda e internados por propiedades."""
+
+    def __init__(self, workbook, estilos=None):
+        self.workbook = workbook
+        self._definiciones = dict(estilos or {})
+        self._por_nombre = {}
+        self._por_clave = {}
+
+    def definir(self, nombre, propiedades):
+        if nombre in self._por_nombre:
+            raise ValueError(f'El formato {nombre!r} ya se usó; no puede redefinirse')
+        self._definiciones[nombre] = propiedades
+
+    def formato(self, propiedades):
+        """Formato con ``propiedades``; el mismo objeto para propiedades equivalentes."""
+        clave = _canonizar(propiedades)
+        if clave not in self._por_clave:
+            self._por_clave[clave] = self.workbook.add_format(dict(clave))
+        return self._por_clave[clave]
+
+    def __getitem__(self, nombre):
+        if nombre not in self._por_nombre:
+            self._por_nombre[nombre] = self.formato(self._definiciones[nombre])
+        return self._por_nombre[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self._definiciones
+
+    def __iter__(self):
+        return iter(self._definiciones)
+
+    def __len__(self):
+        return len(self._definiciones)
+
+    @property
+    def creados(self):
+        """Formatos distintos realmente añadidos al libro."""
+        return len(self._por_clave)
+
+
+@dataclass(frozen=True)
+class Clasificador:
+    """Regla ``valor -> nombre de formato``: la primera condición que se cumple gana.
+
+    Cada condición es una colección de valores (pertenencia) o un predicado.
+    Se usa como formato de columna en ``hojas.Tabla``.
+    """
+    reglas: Tuple[Tuple[Union[Collection, Callable[[object], bool]], str], ...]
+    defecto: str = 'data'
+
+    def __call__(self, valor):
+        for condicion, nombre in self.reglas:
+            if condicion(valor) if callable(condicion) else valor in condicion:
+                return nombre
+        return self.defecto
+
+    def condicionales(self):
+        """Las mismas reglas como formatos condicionales nativos de Excel (``Tabla.condicionales``).
+
+        Excel da prioridad a la primera regla, así que el orden se conserva y el
+        formato por defecto queda como última regla sobre las celdas no vacías.
+        """
+        reglas = []
+        for condicion, nombre in self.reglas:
+            if callable(condicion):
+                raise ValueError('Un predicado de Python no tiene equivalente como formato condicional')
+            for valor in sorted(condicion, key=str):
+                reglas.append({'type': 'cell', 'criteria': '==', 'value': _literal(valor), 'format': nombre})
+        reglas.append({'type': 'no_blanks', 'format': self.defecto})
+        return reglas
+
+
+def _literal(valor):
+    if isinstance(valor, str):
+        return '"{}"'.format(valor.replace('"', '""'))
+    return valor
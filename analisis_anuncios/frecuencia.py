@@ -0,0 +1,159 @@
+"""Simulador de sesiones con ritmo de anuncios y límites de frecuencia.
+
+Genera un día de uso sintético por usuario (aperturas de la app, navegaciones
+por sesión, permanencia por pantalla y elementos de lista recorridos) y aplica
+las reglas de la estrategia: como mucho ``max_visibles`` anuncios a la vista,
+un intersticial cada ``navegaciones_intersticial`` navegaciones, un nativo cada
+``nativo_cada`` elementos, refresco de banners y topes diarios por usuario.
+
+Todo se muestrea por lotes de usuarios con NumPy (las sesiones se aplanan y se
+reducen por usuario con ``bincount``), opcionalmente en paralelo. Cada lote
+calcula a la vez las impresiones con todos los límites y las que habría sin
+cada uno de ellos sobre las mismas sesiones, así que el efecto de cada límite
+no tiene ruido de muestreo entre variantes.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from analisis_anuncios.lote import repartir
+
+TAMANO_LOTE = 250_000
+# Las impresiones diarias por usuario se cuentan en histogramas de enteros hasta este valor
+MAX_IMPRESIONES = 512
+
+# Nombres de "Tipos de Anuncios"; el total se añade como última fila de los resultados
+TIPOS = ('Banner Standard', 'Interstitial', 'Native Ads', 'Rewarded Video', 'App Open Ad')
+BANNER, INTERSTICIAL, NATIVO, RECOMPENSA, APERTURA = range(len(TIPOS))
+
+
+class Sesiones(NamedTuple):
+    """Comportamiento diario medio de un usuario."""
+    sesiones_dia: float = 2.0  # aperturas de la app (Poisson)
+    navegaciones_sesion: float = 4.0  # pantallas por sesión (1 + Poisson)
+    permanencia_seg: float = 45.0  # segundos por pantalla (exponencial)
+    fraccion_listas: float = 0.4  # pantallas que son listas de formularios
+    elementos_lista: float = 10.0  # elementos recorridos por pantalla de lista (Poisson)
+    prob_recompensa: float = 0.1  # sesiones en las que el usuario pide un rewarded
+
+
+class Limites(NamedTuple):
+    """Reglas de ritmo y topes; ``None`` desactiva la regla."""
+    banners_pantalla: int = 3  # superior, sticky y entre secciones
+    refresco_banner_seg: float = 60.0
+    nativo_cada: int = 4  # "Native Ads (cada 4 items)"
+    max_visibles: Optional[int] = 3  # "No más de 3 anuncios visibles simultáneamente"
+    navegaciones_intersticial: Optional[int] = 3  # "max 1 cada 3 navegaciones"
+    intersticiales_dia: Optional[int] = 4
+    app_open_dia: Optional[int] = 1
+    recompensados_dia: Optional[int] = 3
+
+
+# Límites cuyo efecto se mide quitándolos uno a uno
+LIMITES_MEDIDOS = ('max_visibles', 'navegaciones_intersticial', 'intersticiales_dia',
+                   'app_open_dia', 'recompensados_dia')
+
+
+class Muestra(NamedTuple):
+    """Sesiones de un lote aplanadas (una posición por sesión)."""
+    usuarios: int
+    usuario: np.ndarray  # usuario de cada sesión
+    navegaciones: np.ndarray
+    vistas: np.ndarray  # pantallas más refrescos de banner
+    vistas_lista: np.ndarray
+    elementos: np.ndarray
+    recompensas: np.ndarray
+
+
+def _muestrear(rng, sesiones, limites, n):
+    por_usuario = rng.poisson(sesiones.sesiones_dia, n)
+    usuario = np.repeat(np.arange(n), por_usuario)
+    total = len(usuario)
+    navegaciones = 1 + rng.poisson(max(sesiones.navegaciones_sesion - 1, 0), total)
+    # floor(permanencia / refresco) de una exponencial es geométrica; su suma por sesión, binomial negativa
+    continua = np.exp(-limites.refresco_banner_seg / sesiones.permanencia_seg)
+    vistas = navegaciones + rng.negative_binomial(navegaciones, 1 - continua)
+    listas = rng.binomial(navegaciones, sesiones.fraccion_listas)
+    return Muestra(
+        usuarios=n,
+        usuario=usuario,
+        navegaciones=navegaciones,
+        vistas=vistas,
+        vistas_lista=rng.binomial(vistas, listas / navegaciones),
+        elementos=rng.poisson(sesiones.elementos_lista * listas),
+        recompensas=rng.binomial(1, sesiones.prob_recompensa, total),
+    )
+
+
+def _tope(valores, limite):
+    return valores if limite is None else np.minimum(valores, limite)
+
+
+def impresiones(muestra, limites):
+    """Impresiones por tipo y usuario (``len(TIPOS) × usuarios``) bajo ``limites``."""
+    visibles = np.inf if limites.max_visibles is None else limites.max_visibles
+    # En las listas el nativo ocupa uno de los huecos visibles
+    banners_lista = max(min(limites.banners_pantalla, visibles - 1), 0)
+    banners_resto = min(limites.banners_pantalla, visibles)
+    banner = (muestra.vistas - muestra.vistas_lista) * banners_resto + muestra.vistas_lista * banners_lista
+    nativo = muestra.elementos // limites.nativo_cada if visibles >= 1 else np.zeros_like(muestra.elementos)
+    # El intersticial se muestra al navegar: nunca en la primera pantalla de la sesión
+    cada = limites.navegaciones_intersticial or 1
+    intersticial = (muestra.navegaciones - 1) // cada
+
+    def por_usuario(valores):
+        return np.bincount(muestra.usuario, weights=valores, minlength=muestra.usuarios).astype(np.int64)
+
+    resultado = np.empty((len(TIPOS), muestra.usuarios), dtype=np.int64)
+    resultado[BANNER] = por_usuario(banner)
+    resultado[NATIVO] = por_usuario(nativo)
+    resultado[INTERSTICIAL] = _tope(por_usuario(intersticial), limites.intersticiales_dia)
+    resultado[RECOMPENSA] = _tope(por_usuario(muestra.recompensas), limites.recompensados_dia)
+    resultado[APERTURA] = _tope(np.bincount(muestra.usuario, minlength=muestra.usuarios), limites.app_open_dia)
+    return resultado
+
+
+def variantes(limites):
+    """Límites completos seguidos de una copia sin cada límite de ``LIMITES_MEDIDOS``."""
+    return [limites] + [limites._replace(**{nombre: None}) for nombre in LIMITES_MEDIDOS]
+
+
+class DistribucionFrecuencia(NamedTuple):
+    """Histogramas de impresiones diarias por usuario: ``variantes × (tipos + total) × conteo``."""
+    usuarios: int
+    conteos: np.ndarray
+
+    def medias(self):
+        """Impresiones medias por usuario y día: ``variantes × (tipos + total)``."""
+        return self.conteos @ np.arange(self.conteos.shape[-1]) / self.usuarios
+
+    def percentiles(self, q, variante=0):
+        """Percentiles (enteros) de impresiones por usuario: ``len(q) × (tipos + total)``."""
+        acumulado = np.cumsum(self.conteos[variante], axis=-1)
+        objetivo = np.asarray(q, dtype=np.float64) / 100 * self.usuarios
+        return np.array([np.searchsorted(fila, objetivo) for fila in acumulado]).T
+
+    def ingresos_por_usuario(self, cpm):
+        """Ingreso diario medio por usuario de cada variante con ``cpm`` por tipo (orden de ``TIPOS``)."""
+        return self.medias()[:, :len(TIPOS)] @ np.asarray(cpm, dtype=np.float64) / 1000
+
+
+def _simular_lote(tarea):
+    semilla, n, sesiones, limites = tarea
+    muestra = _muestrear(np.random.default_rng(semilla), sesiones, limites, n)
+    conteos = np.zeros((len(LIMITES_MEDIDOS) + 1, len(TIPOS) + 1, MAX_IMPRESIONES + 1), dtype=np.int64)
+    for v, variante in enumerate(variantes(limites)):
+        por_tipo = impresiones(muestra, variante)
+        filas = np.vstack([por_tipo, por_tipo.sum(axis=0)])
+        np.clip(filas, 0, MAX_IMPRESIONES, out=filas)
+        # Un único bincount para todos los tipos: desplazamiento por fila
+        desplazado = filas + np.arange(len(filas))[:, None] * (MAX_IMPRESIONES + 1)
+        conteos[v] = np.bincount(desplazado.ravel(), minlength=conteos[v].size).reshape(conteos[v].shape)
+    return conteos
+
+
+def simular_frecuencia(sesiones=Sesiones(), limites=Limites(), usuarios=1_000_000, semilla=None,
+                       tamano_lote=TAMANO_LOTE, procesos=None):
+    """Simula un día de ``usuarios`` en lotes vectorizados con ``lote.repartir``."""
+    resultados = repartir(_simular_lote, usuarios, tamano_lote, semilla, procesos, (sesiones, limites))
+    return DistribucionFrecuencia(usuarios=usuarios, conteos=np.sum(resultados, axis=0))
@@ -0,0 +1,333 @@
+"""Especificación declarativa de hojas y su renderizador.
+
+Cada hoja se describe como una lista de bloques (título, tablas, secciones,
+espacios y gráficos) que se escriben de arriba abajo con ``EscritorSecuencial``,
+por lo que cualquier especificación es válida también en modo streaming.
+Las series de gráficos con más de ``Grafico.max_puntos`` filas se submuestrean
+(``analisis_anuncios.submuestreo``) en una hoja oculta cuyas celdas son
+fórmulas hacia las filas elegidas; la tabla completa queda en su hoja.
+Los formatos se referencian por nombre y se resuelven al renderizar; una
+celda numérica con tipo (ver ``normalizacion``) usa la variante
+``'<formato>:<tipo>'`` si existe, p.ej. ``'high:porcentaje'``.
+"""
+from dataclasses import dataclass, field
+from itertools import islice
+from numbers import Real
+from typing import Callable, Iterable, List, Optional, Union
+
+import numpy as np
+from xlsxwriter.utility import quote_sheetname, xl_rowcol_to_cell
+
+from analisis_anuncios.escritura import EscritorSecuencial, filas_desde_columnas
+from analisis_anuncios.perfil import SinPerfil
+from analisis_anuncios.submuestreo import MAX_PUNTOS, METODOS, submuestrear
+
+# Hoja oculta con las series submuestreadas de los gráficos
+HOJA_GRAFICOS = 'Datos Gráficos'
+
+# Un formato de columna es un nombre fijo o una regla ``valor -> nombre``
+FormatoColumna = Union[str, Callable[[object], str]]
+
+
+@dataclass
+class Titulo:
+    texto: str
+    formato: str = 'title'
+
+
+@dataclass
+class Seccion:
+    """Fila de encabezado combinada a todo el ancho de la hoja."""
+    texto: str
+    formato: str = 'header'
+
+
+@dataclass
+class Espacio:
+    filas: int = 1
+
+
+@dataclass
+class Columnas:
+    """Origen de ``Tabla.filas`` a partir de arrays de columnas.
+
+    ``columnas`` es una lista de arrays o una función sin argumentos que genera
+    listas de arrays por bloques (tablas largas). Al renderizar se recorre como
+    filas; ``analisis_anuncios.exportacion`` lee los arrays directamente.
+    """
+    columnas: Union[list, Callable[[], Iterable[list]]]
+
+    def por_bloques(self):
+        if callable(self.columnas):
+            yield from self.columnas()
+        else:
+            yield self.columnas
+
+    def __call__(self):
+        for columnas in self.por_bloques():
+            yield from filas_desde_columnas(columnas)
+
+
+@dataclass
+class Tabla:
+    # Filas, o función sin argumentos que las genera al renderizar (tablas largas
+    # o derivadas de arrays, p.ej. ``Columnas``); así la especificación no consume nada al crearse
+    filas: Union[Iterable[list], Callable[[], Iterable[list]]]
+    encabezados: Optional[list] = None
+    formatos: Union[str, List[FormatoColumna]] = 'data'
+    # Tipo por celda (``TablaNumerica.tipos_celdas()``) para elegir el formato numérico
+    tipos: Optional[list] = None
+    # Nombre con el que los gráficos referencian el rango de datos
+    nombre: Optional[str] = None
+    # Combina el último valor de cada fila hasta la última columna de la hoja
+    fusionar_ultima: bool = False
+    congelar: bool = False
+    # Columna -> plantilla de fórmula con ``{fila}`` (fila de Excel), p.ej. '=B{fila}*C{fila}/1000'
+    formulas: Optional[dict] = None
+    # Columna -> reglas de ``worksheet.conditional_format`` con 'format' por nombre;
+    # Excel colorea el rango entero en lugar de formatear celda a celda
+    condicionales: Optional[dict] = None
+
+
+@dataclass
+class Serie:
+    nombre: str
+    tabla: str
+    valores: int
+    categorias: int = 0
+    # Subrango (inicio, fin) de filas de datos; None = toda la tabla
+    filas: Optional[tuple] = None
+    estilo: dict = field(default_factory=dict)
+
+
+@dataclass
+class Grafico:
+    tipo: str
+    series: list
+    # Claves de ``set_*`` del gráfico: title, x_axis, y_axis, legend, size...
+    opciones: dict = field(default_factory=dict)
+    # Series con más filas se dibujan submuestreadas con ``reduccion`` ('lttb' o 'minmax')
+    max_puntos: int = MAX_PUNTOS
+    reduccion: str = 'lttb'
+
+
+@dataclass
+class Hoja:
+    nombre: str
+    columnas: int
+    anchos: dict
+    bloques: list
+
+
+def renderizar(workbook, hojas, formatos, perfil=SinPerfil()):
+    """Escribe todas las ``hojas`` en ``workbook``; devuelve las posiciones de las tablas.
+
+    Los gráficos se construyen al final, cuando ya se conocen los rangos de todas
+    las tablas con nombre (pueden referenciar tablas de otras hojas). ``perfil``
+    mide por separado las fases ``celdas`` y ``graficos``.
+    """
+    posiciones = {}
+    tablas = {}
+    graficos = []
+    with perfil.fase('celdas'):
+        for hoja in hojas:
+            worksheet = workbook.add_worksheet(hoja.nombre)
+            for rango, ancho in hoja.anchos.items():
+                worksheet.set_column(rango, ancho)
+
+            escritor = EscritorSecuencial(worksheet)
+            ultima_col = hoja.columnas - 1
+            for bloque in hoja.bloques:
+                if isinstance(bloque, (Titulo, Seccion)):
+                    escritor.fusionar(0, ultima_col, bloque.texto, formatos[bloque.formato])
+                elif isinstance(bloque, Espacio):
+                    escritor.saltar(bloque.filas)
+                elif isinstance(bloque, Tabla):
+                    primera, ultima = _renderizar_tabla(escritor, bloque, formatos, ultima_col)
+                    if bloque.nombre:
+                        posiciones[bloque.nombre] = (hoja.nombre, primera, ultima)
+                        tablas[bloque.nombre] = bloque
+                elif isinstance(bloque, Grafico):
+                    graficos.append((worksheet, escritor.fila, bloque))
+                else:
+                    raise TypeError(f'Bloque desconocido en la hoja {hoja.nombre!r}: {bloque!r}')
+
+    with perfil.fase('graficos'):
+        auxiliar = _DatosGraficos(workbook, tablas, posiciones)
+        for worksheet, fila, grafico in graficos:
+            worksheet.insert_chart(fila, 0, _crear_grafico(workbook, grafico, auxiliar.rangos(grafico)))
+    return posiciones
+
+
+def _renderizar_tabla(escritor, tabla, formatos, ultima_col):
+    if tabla.encabezados:
+        escritor.escribir_fila(tabla.encabezados, formatos['header'])
+    primera = escritor.fila
+    if tabla.congelar:
+        escritor.worksheet.freeze_panes(primera, 0)
+
+    filas = tabla.filas() if callable(tabla.filas) else tabla.filas
+    reglas = tabla.formatos if isinstance(tabla.formatos, list) else None
+    dinamico = tabla.tipos is not None or (reglas and any(callable(r) for r in reglas))
+    if tabla.fusionar_ultima:
+        for i, valores in enumerate(filas):
+            fmts = _resolver(tabla, i, valores, formatos)
+            for col, (valor, fmt) in enumerate(zip(valores[:-1], fmts)):
+                escritor.worksheet.write(escritor.fila, col, valor, fmt)
+            escritor.fusionar(len(valores) - 1, ultima_col, valores[-1], fmts[-1])
+    elif dinamico:
+        for i, valores in enumerate(filas):
+            escritor.escribir_fila(valores, _resolver(tabla, i, valores, formatos), tabla.formulas)
+    elif reglas:
+        escritor.escribir_filas(filas, [formatos[r] for r in reglas], tabla.formulas)
+    else:
+        escritor.escribir_filas(filas, formatos[tabla.formatos], tabla.formulas)
+
+    ultima = escritor.fila - 1
+    if ultima >= primera:
+        for col, reglas_col in (tabla.condicionales or {}).items():
+            for regla in reglas_col:
+                escritor.worksheet.conditional_format(
+                    primera, col, ultima, col, {**regla, 'format': formatos[regla['format']]})
+    return primera, ultima
+
+
+def _resolver(tabla, i, valores, formatos):
+    reglas = tabla.formatos if isinstance(tabla.formatos, list) else [tabla.formatos] * len(valores)
+    nombres = [r(v) if callable(r) else r for r, v in zip(reglas, valores)]
+    if tabla.tipos is not None:
+        nombres = [f'{n}:{t}' if t and f'{n}:{t}' in formatos else n for n, t in zip(nombres, tabla.tipos[i])]
+    return [formatos[n] for n in nombres]
+
+
+def _crear_grafico(workbook, grafico, rangos):
+    chart = workbook.add_chart({'type': grafico.tipo})
+    for serie, (hoja, primera, ultima, categorias, valores) in zip(grafico.series, rangos):
+        chart.add_series({
+            'name': serie.nombre,
+            'categories': [hoja, primera, categorias, ultima, categorias],
+            'values': [hoja, primera, valores, ultima, valores],
+            **serie.estilo,
+        })
+    for opcion, valor in grafico.opciones.items():
+        getattr(chart, f'set_{opcion}')(valor)
+    return chart
+
+
+class _DatosGraficos:
+    """Rangos de las series de cada gráfico; submuestrea las largas en ``HOJA_GRAFICOS``.
+
+    La hoja se crea (oculta) con la primera serie que lo necesita y se escribe de
+    arriba abajo, un grupo de filas por tabla y rango, como exige el modo streaming.
+    """
+
+    def __init__(self, workbook, tablas, posiciones):
+        self.workbook = workbook
+        self.tablas = tablas
+        self.posiciones = posiciones
+        self.worksheet = None
+        self.fila = 0
+
+    def _rango(self, serie):
+        hoja, primera, ultima = self.posiciones[serie.tabla]
+        if serie.filas:
+            primera, ultima = primera + serie.filas[0], min(primera + serie.filas[1] - 1, ultima)
+        return hoja, primera, ultima
+
+    def rangos(self, grafico):
+        """``(hoja, primera, última, col. categorías, col. valores)`` de cada serie de ``grafico``."""
+        if grafico.reduccion not in METODOS:
+            raise ValueError(f'Reducción desconocida {grafico.reduccion!r}; use {sorted(METODOS)}')
+        rangos = [(*self._rango(serie), serie.categorias, serie.valores) for serie in grafico.series]
+        grupos = {}
+        for i, serie in enumerate(grafico.series):
+            hoja, primera, ultima = rangos[i][:3]
+            # Solo se releen tablas con filas repetibles (listas o funciones)
+            filas = self.tablas[serie.tabla].filas
+            if ultima - primera + 1 > grafico.max_puntos and (callable(filas) or isinstance(filas, (list, tuple))):
+                grupos.setdefault((serie.tabla, primera, ultima, serie.categorias), []).append(i)
+        for (nombre, primera, ultima, categorias), indices in grupos.items():
+            tabla = self.tablas[nombre]
+            inicio = primera - self.posiciones[nombre][1]
+            columnas = [categorias] + [grafico.series[i].valores for i in indices]
+            numeros = _numeros(tabla, columnas, inicio, ultima - primera + 1)
+            x = numeros[0] if grafico.tipo == 'scatter' else np.arange(numeros.shape[1])
+            filas = submuestrear(x, numeros[1:], grafico.max_puntos, grafico.reduccion)
+            valores = _valores(tabla, columnas, filas + inicio)
+            desde, hasta = self._escribir(nombre, primera, columnas, valores, filas)
+            for j, i in enumerate(indices):
+                rangos[i] = (HOJA_GRAFICOS, desde, hasta, 0, j + 1)
+        return rangos
+
+    def _escribir(self, nombre, primera, columnas, valores, filas):
+        # Encabezado y, por fila elegida, fórmulas a la celda original con su valor en caché
+        if self.worksheet is None:
+            self.worksheet = self.workbook.add_worksheet(HOJA_GRAFICOS)
+            self.worksheet.hide()
+        hoja = quote_sheetname(self.posiciones[nombre][0])
+        encabezados = self.tablas[nombre].encabezados or [f'Columna {c + 1}' for c in range(max(columnas) + 1)]
+        self.worksheet.write_row(self.fila, 0, [encabezados[c] for c in columnas])
+        desde = self.fila + 1
+        for n, (fila, valores_fila) in enumerate(zip(filas.tolist(), valores), start=desde):
+            for j, (columna, valor) in enumerate(zip(columnas, valores_fila)):
+                celda = xl_rowcol_to_cell(primera + fila, columna, row_abs=True, col_abs=True)
+                self.worksheet.write_formula(n, j, f'={hoja}!{celda}', None, _en_cache(valor))
+        self.fila = desde + len(filas) + 1
+        return desde, desde + len(filas) - 1
+
+
+def _numeros(tabla, columnas, inicio, largo):
+    # Matriz ``columnas × largo`` de las filas ``inicio:inicio + largo`` de ``tabla`` (NaN si no es número);
+    # se recorre por bloques o por filas sin guardar los valores originales
+    resultado = np.full((len(columnas), largo), np.nan)
+    fin = inicio + largo
+    if isinstance(tabla.filas, Columnas):
+        desde = 0
+        for bloque in tabla.filas.por_bloques():
+            n = len(bloque[0])
+            a, b = max(inicio - desde, 0), min(fin - desde, n)
+            for k, c in enumerate(columnas):
+                if a < b:
+                    resultado[k, desde + a - inicio:desde + b - inicio] = _a_numeros(np.asarray(bloque[c][a:b]))
+            desde += n
+            if desde >= fin:
+                break
+        return resultado
+    filas = tabla.filas() if callable(tabla.filas) else tabla.filas
+    for i, fila in enumerate(islice(filas, inicio, fin)):
+        resultado[:, i] = [v if isinstance(v, Real) else np.nan for v in (fila[c] for c in columnas)]
+    return resultado
+
+
+def _a_numeros(valores):
+    if valores.dtype.kind in 'biuf':
+        return valores
+    return np.array([v if isinstance(v, Real) else np.nan for v in valores.tolist()], dtype=np.float64)
+
+
+def _valores(tabla, columnas, filas):
+    # Valores originales de las ``columnas`` en las ``filas`` (crecientes) de ``tabla``, una lista por fila
+    if len(filas) == 0:
+        return []
+    if isinstance(tabla.filas, Columnas):
+        resultado, desde = [], 0
+        for bloque in tabla.filas.por_bloques():
+            n = len(bloque[0])
+            locales = filas[(filas >= desde) & (filas < desde + n)] - desde
+            if len(locales):
+                resultado += map(list, zip(*(np.asarray(bloque[c])[locales].tolist() for c in columnas)))
+            desde += n
+            if desde > filas[-1]:
+                break
+        return resultado
+    if isinstance(tabla.filas, (list, tuple)):
+        return [[tabla.filas[i][c] for c in columnas] for i in filas.tolist()]
+    elegidas = set(filas.tolist())
+    return [[fila[c] for c in columnas]
+            for i, fila in enumerate(islice(tabla.filas(), int(filas[-1]) + 1)) if i in elegidas]
+
+
+def _en_cache(valor):
+    if valor is None or (isinstance(valor, float) and not np.isfinite(valor)):
+        return ''
+    return valor
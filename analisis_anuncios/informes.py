@@ -0,0 +1,291 @@
+"""Cliente asíncrono de la API de informes para los KPIs reales.
+
+La API devuelve KPIs diarios paginados por app:
+
+    GET /v1/apps/{app}/kpis?desde=AAAA-MM-DD&hasta=AAAA-MM-DD[&pagina=TOKEN]
+    -> {"filas": [{"fecha", "solicitudes", "impresiones", "clics", "ingresos",
+                   "usuarios_activos", "usuarios_nuevos", "retenidos_d1",
+                   "segundos_en_app"}, ...],
+        "siguiente": TOKEN | null}
+
+``ClienteInformes`` pide muchas apps y rangos a la vez sobre un pool de
+conexiones HTTP/1.1 persistentes (solo biblioteca estándar), con límite de
+peticiones por segundo, reintentos con espera exponencial (respetando
+``Retry-After``) y caché en disco de las respuestas de rangos ya cerrados.
+``servidor_informes`` es un servidor local que imita la API para probar sin red.
+
+``resumir_kpis`` reduce las filas a los valores de Mes 1, 3 y 6 de la tabla de
+KPIs de "Estrategia Implementación"; ``guardar_kpis`` los escribe en JSON para
+``Escenario.kpis_reales``.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import ssl
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote, urlencode, urlsplit
+
+from analisis_anuncios.cache import _escribir_atomico
+
+CONEXIONES = 8
+PETICIONES_POR_SEGUNDO = 20
+REINTENTOS = 4
+ESPERA_BASE = 0.2
+TIEMPO_LIMITE = 30
+REINTENTABLES = {429, 500, 502, 503, 504}
+# Días (desde el lanzamiento) de cada columna "Meta Mes N" de la tabla de KPIs
+MESES_KPI = {1: (0, 30), 3: (60, 90), 6: (150, 180)}
+
+
+class ErrorInformes(RuntimeError):
+    """La API respondió con un error no recuperable o se agotaron los reintentos."""
+
+
+async def _leer_respuesta(lector):
+    estado = int((await lector.readline()).split()[1])
+    cabeceras = {}
+    while True:
+        linea = (await lector.readline()).decode('latin-1').strip()
+        if not linea:
+            break
+        nombre, _, valor = linea.partition(':')
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    if cabeceras.get('transfer-encoding', '').lower() == 'chunked':
+        partes = []
+        while True:
+            tamano = int((await lector.readline()).split(b';')[0], 16)
+            if not tamano:
+                await lector.readline()
+                break
+            partes.append(await lector.readexactly(tamano))
+            await lector.readline()
+        cuerpo = b''.join(partes)
+    else:
+        cuerpo = await lector.readexactly(int(cabeceras.get('content-length', 0)))
+    return estado, cabeceras, cuerpo
+
+
+def _segundos_reintento(valor):
+    """Espera indicada por ``Retry-After`` (segundos o fecha HTTP); None si falta o no se entiende."""
+    if not valor:
+        return None
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    try:
+        fecha = parsedate_to_datetime(valor)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max((fecha - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class _Conexiones:
+    """Pool de conexiones keep-alive a un host; como mucho ``maximo`` en uso a la vez."""
+
+    def __init__(self, url, maximo):
+        partes = urlsplit(url)
+        self.host = partes.hostname
+        self.seguro = partes.scheme == 'https'
+        self.puerto = partes.port or (443 if self.seguro else 80)
+        self._libres = []
+        self._semaforo = asyncio.Semaphore(maximo)
+
+    async def pedir(self, ruta, cabeceras):
+        async with self._semaforo:
+            if self._libres:
+                lector, escritor = self._libres.pop()
+            else:
+                contexto = ssl.create_default_context() if self.seguro else None
+                lector, escritor = await asyncio.open_connection(self.host, self.puerto, ssl=contexto)
+            peticion = [f'GET {ruta} HTTP/1.1', f'Host: {self.host}', 'Connection: keep-alive',
+                        *(f'{k}: {v}' for k, v in cabeceras.items())]
+            try:
+                escritor.write(('\r\n'.join(peticion) + '\r\n\r\n').encode())
+                await escritor.drain()
+                estado, respuesta, cuerpo = await _leer_respuesta(lector)
+            except BaseException:
+                escritor.close()
+                raise
+            if respuesta.get('connection', '').lower() == 'close':
+                escritor.close()
+            else:
+                self._libres.append((lector, escritor))
+            return estado, respuesta, cuerpo
+
+    async def cerrar(self):
+        for _, escritor in self._libres:
+            escritor.close()
+        self._libres.clear()
+
+
+class _Ritmo:
+    """Reparte las peticiones a intervalos regulares (``por_segundo``)."""
+
+    def __init__(self, por_segundo):
+        self._intervalo = 1 / por_segundo
+        self._siguiente = 0.0
+
+    async def esperar(self):
+        ahora = asyncio.get_running_loop().time()
+        turno = max(ahora, self._siguiente)
+        self._siguiente = turno + self._intervalo
+        if turno > ahora:
+            await asyncio.sleep(turno - ahora)
+
+
+class ClienteInformes:
+    """Cliente de la API de informes; usar con ``async with``.
+
+    ``cache`` es un directorio para las respuestas de rangos que terminan antes
+    de hoy (ya no cambian); None desactiva la caché.
+    """
+
+    def __init__(self, url, token=None, conexiones=CONEXIONES, por_segundo=PETICIONES_POR_SEGUNDO,
+                 reintentos=REINTENTOS, tiempo_limite=TIEMPO_LIMITE, cache=None):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.reintentos = reintentos
+        self.tiempo_limite = tiempo_limite
+        self.cache = cache
+        self.peticiones = 0
+        self.desde_cache = 0
+        self._conexiones = _Conexiones(self.url, conexiones)
+        self._ritmo = _Ritmo(por_segundo)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *error):
+        await self._conexiones.cerrar()
+
+    def _ruta_cache(self, ruta):
+        return os.path.join(self.cache, hashlib.sha256(f'{self.url}{ruta}'.encode()).hexdigest()[:32] + '.json')
+
+    async def obtener(self, ruta, cacheable=False):
+        """JSON de ``ruta`` con reintentos; de la caché en disco si ``cacheable``."""
+        if cacheable and self.cache:
+            try:
+                with open(self._ruta_cache(ruta), encoding='utf-8') as f:
+                    self.desde_cache += 1
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+
+        cabeceras = {'Accept': 'application/json'}
+        if self.token:
+            cabeceras['Authorization'] = f'Bearer {self.token}'
+        motivo = None
+        for intento in range(self.reintentos + 1):
+            if intento:
+                espera = motivo[1] if motivo[1] is not None else ESPERA_BASE * 2 ** (intento - 1)
+                await asyncio.sleep(espera * (1 + random.random() / 2))
+            await self._ritmo.esperar()
+            self.peticiones += 1
+            try:
+                estado, respuesta, cuerpo = await asyncio.wait_for(
+                    self._conexiones.pedir(ruta, cabeceras), self.tiempo_limite)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, IndexError) as error:
+                motivo = (f'{type(error).__name__}: {error}', None)
+                continue
+            if estado == 200:
+                datos = json.loads(cuerpo)
+                if cacheable and self.cache:
+                    os.makedirs(self.cache, exist_ok=True)
+                    _escribir_atomico(self._ruta_cache(ruta), cuerpo)
+                return datos
+            if estado not in REINTENTABLES:
+                raise ErrorInformes(f'HTTP {estado} en {ruta}: {cuerpo[:200].decode(errors="replace")}')
+            # Sin Retry-After válido se usa la espera exponencial
+            motivo = (f'HTTP {estado}', _segundos_reintento(respuesta.get('retry-after')))
+        raise ErrorInformes(f'{ruta}: sin respuesta tras {self.reintentos + 1} intentos ({motivo[0]})')
+
+    async def kpis(self, app, desde, hasta):
+        """Filas diarias de ``app`` entre ``desde`` y ``hasta`` (fechas ISO, inclusive), todas las páginas."""
+        cacheable = date.fromisoformat(hasta) < date.today()
+        filas, pagina = [], None
+        while True:
+            parametros = {'desde': desde, 'hasta': hasta, **({'pagina': pagina} if pagina else {})}
+            ruta = f'/v1/apps/{quote(app, safe="")}/kpis?{urlencode(parametros)}'
+            datos = await self.obtener(ruta, cacheable)
+            if not isinstance(datos, dict) or not isinstance(datos.get('filas'), list):
+                raise ErrorInformes(f'{ruta}: respuesta sin lista "filas"')
+            filas += [{**fila, 'app': app} for fila in datos['filas']]
+            pagina = datos.get('siguiente')
+            if not pagina:
+                return filas
+
+    async def kpis_varios(self, consultas):
+        """Filas de todas las ``consultas`` ``(app, desde, hasta)`` pedidas a la vez."""
+        resultados = await asyncio.gather(*(self.kpis(*consulta) for consulta in consultas))
+        return [fila for filas in resultados for fila in filas]
+
+
+def descargar_kpis(url, apps, desde, hasta, **opciones):
+    """Versión síncrona: filas de ``apps`` entre ``desde`` y ``hasta``, partidas por mes."""
+    consultas = [(app, inicio, fin) for app in apps for inicio, fin in _tramos_mensuales(desde, hasta)]
+
+    async def descargar():
+        async with ClienteInformes(url, **opciones) as cliente:
+            return await cliente.kpis_varios(consultas)
+
+    return asyncio.run(descargar())
+
+
+def _tramos_mensuales(desde, hasta):
+    # Rangos de 30 días: así los meses cerrados se cachean aunque el último siga abierto
+    inicio, fin = date.fromisoformat(desde), date.fromisoformat(hasta)
+    while inicio <= fin:
+        tramo = min(inicio + timedelta(days=29), fin)
+        yield inicio.isoformat(), tramo.isoformat()
+        inicio = tramo + timedelta(days=1)
+
+
+def resumir_kpis(filas, lanzamiento):
+    """KPIs reales de los meses 1, 3 y 6 desde ``lanzamiento`` (fecha ISO).
+
+    Devuelve ``{kpi: {mes: valor}}`` con los nombres de la tabla de KPIs; los
+    meses sin datos no aparecen. Los totales diarios suman todas las apps.
+    """
+    inicio = date.fromisoformat(lanzamiento)
+    resumen = {}
+    for mes, (primero, ultimo) in MESES_KPI.items():
+        del_mes = [f for f in filas if primero <= (date.fromisoformat(f['fecha']) - inicio).days < ultimo]
+        if not del_mes:
+            continue
+        total = {campo: sum(f.get(campo, 0) for f in del_mes)
+                 for campo in ('solicitudes', 'impresiones', 'clics', 'ingresos', 'usuarios_activos',
+                               'usuarios_nuevos', 'retenidos_d1', 'segundos_en_app')}
+        dias = len({f['fecha'] for f in del_mes})
+        valores = {
+            'CTR (Click-Through Rate)': total['clics'] / total['impresiones'] if total['impresiones'] else None,
+            'Fill Rate': total['impresiones'] / total['solicitudes'] if total['solicitudes'] else None,
+            'eCPM (Effective CPM)': total['ingresos'] / total['impresiones'] * 1000 if total['impresiones'] else None,
+            'Impresiones Diarias': total['impresiones'] / dias,
+            'Ingresos Diarios': total['ingresos'] / dias,
+            'Tasa de Retención': total['retenidos_d1'] / total['usuarios_nuevos'] if total['usuarios_nuevos'] else None,
+            'Tiempo en App': total['segundos_en_app'] / total['usuarios_activos'] / 60 if total['usuarios_activos'] else None,
+        }
+        for kpi, valor in valores.items():
+            if valor is not None:
+                resumen.setdefault(kpi, {})[mes] = valor
+    return resumen
+
+
+def guardar_kpis(ruta, resumen, **origen):
+    """Escribe el resumen (y datos de ``origen``: url, apps, fechas) para ``Escenario.kpis_reales``."""
+    datos = {'kpis': {kpi: {str(mes): v for mes, v in meses.items()} for kpi, meses in resumen.items()}, **origen}
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    _escribir_atomico(os.path.abspath(ruta), json.dumps(datos, ensure_ascii=False, indent=2).encode())
+
+
+def cargar_kpis(ruta):
+    """``{kpi: {mes: valor}}`` guardado por ``guardar_kpis``."""
+    with open(ruta, encoding='utf-8') as f:
+        return {kpi: {int(mes): v for mes, v in meses.items()} for kpi, meses in json.load(f)['kpis'].items()}
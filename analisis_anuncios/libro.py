@@ -0,0 +1,1268 @@
+"""Definición del libro de monetización con anuncios: formatos, hojas y ``build_workbook``.
+
+Importar este módulo no escribe nada; carga NumPy y prepara los datos
+normalizados. La línea de comandos (``analisis_anuncios.cli``) solo lo importa
+cuando de verdad hay que generar un libro.
+"""
+import os
+from dataclasses import replace
+from datetime import datetime
+from fractions import Fraction
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.actividad import huella_volcados, leer_volcados
+from analisis_anuncios.cache import FUENTES, SinCache, huella, huella_fuentes, memo_sorteos
+from analisis_anuncios.cohortes import (
+    DIAS_RETENCION, HORIZONTE_MESES, ajustar_retencion, altas_diarias, curvas_retencion, dau_mensual, proyectar_dau,
+)
+from analisis_anuncios.datos import (
+    benchmarks, categorias, competencia, ctr_benchmark_por_tipo, escenario_base, kpis, metricas, pasos,
+    recomendaciones, roadmap, test_ids, tipos_anuncios, tipos_por_ubicacion, ubicaciones,
+)
+from analisis_anuncios.escenarios import NIVELES_BENCHMARK, NIVELES_INVASION
+from analisis_anuncios.escritura import crear_libro
+from analisis_anuncios.eventos import cargar as cargar_eventos
+from analisis_anuncios.eventos import huella_directorio as huella_eventos
+from analisis_anuncios.experimentos import analizar_experimento, huella_experimento
+from analisis_anuncios.exportacion import exportar
+from analisis_anuncios.formatos import Clasificador, RegistroFormatos
+from analisis_anuncios.frecuencia import LIMITES_MEDIDOS, Limites, Sesiones, simular_frecuencia
+from analisis_anuncios.frecuencia import TIPOS as TIPOS_FRECUENCIA
+from analisis_anuncios.hojas import Columnas, Espacio, Grafico, Hoja, Seccion, Serie, Tabla, Titulo, renderizar
+from analisis_anuncios.informes import MESES_KPI, cargar_kpis
+from analisis_anuncios.mediacion import MODOS as MODOS_MEDIACION
+from analisis_anuncios.mediacion import REDES as REDES_MEDIACION
+from analisis_anuncios.mediacion import Red, simular_mediacion
+from analisis_anuncios.normalizacion import CONTEO, MONEDA, PORCENTAJE, TEXTO, TablaNumerica, normalizar
+from analisis_anuncios.optimizacion import PENALIZACION, Candidata, Restricciones, describir, optimizar
+from analisis_anuncios.perfil import SinPerfil
+from analisis_anuncios.proyecciones import (
+    DIAS_MES, FACTOR_ALTO, FACTOR_BAJO, proyectar_ingresos, proyectar_rejilla_por_bloques,
+)
+from analisis_anuncios.sensibilidad import MESES as MESES_SENSIBILIDAD
+from analisis_anuncios.sensibilidad import MUESTRAS as MUESTRAS_SENSIBILIDAD
+from analisis_anuncios.sensibilidad import PARAMETROS as PARAMETROS_SENSIBILIDAD
+from analisis_anuncios.sensibilidad import Parametro, analizar
+from analisis_anuncios.simulacion import PERCENTILES, Rango, bandas_clics, bandas_ingresos, simular
+
+# ============= FORMATOS =============
+estilos = {
+    # Título principal
+    'title': {
+        'bold': True,
+        'font_size': 16,
+        'font_color': '#1a237e',
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#e3f2fd',
+        'border': 2
+    },
+    # Encabezados
+    'header': {
+        'bold': True,
+        'font_size': 11,
+        'font_color': 'white',
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#1976d2',
+        'border': 1
+    },
+    # Subencabezados
+    'subheader': {
+        'bold': True,
+        'font_size': 10,
+        'font_color': 'white',
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#42a5f5',
+        'border': 1
+    },
+    # Datos normales
+    'data': {
+        'font_size': 10,
+        'align': 'left',
+        'valign': 'vcenter',
+        'border': 1
+    },
+    # Números con formato moneda
+    'currency': {
+        'font_size': 10,
+        'align': 'right',
+        'valign': 'vcenter',
+        'border': 1,
+        'num_format': '$#,##0.00'
+    },
+    # Porcentajes
+    'percent': {
+        'font_size': 10,
+        'align': 'center',
+        'valign': 'vcenter',
+        'border': 1,
+        'num_format': '0.0%'
+    },
+    # Destacado verde (alta rentabilidad)
+    'high': {
+        'font_size': 10,
+        'bold': True,
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#c8e6c9',
+        'font_color': '#1b5e20',
+        'border': 1
+    },
+    # Destacado amarillo (media rentabilidad)
+    'medium': {
+        'font_size': 10,
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#fff9c4',
+        'font_color': '#f57f17',
+        'border': 1
+    },
+    # Destacado rojo (baja rentabilidad)
+    'low': {
+        'font_size': 10,
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#ffcdd2',
+        'font_color': '#b71c1c',
+        'border': 1
+    },
+}
+
+# Formato numérico según el tipo de valor normalizado
+formatos_numericos = {
+    'moneda': '$#,##0.00',
+    'porcentaje': '0.0%',
+    'conteo': '#,##0',
+}
+
+
+def crear_formatos(workbook):
+    # Solo definiciones: cada formato se añade al libro la primera vez que se usa
+    formatos = RegistroFormatos(workbook, estilos)
+    for nombre in ('data', 'high', 'medium', 'low'):
+        for tipo, num_format in formatos_numericos.items():
+            propiedades = {**estilos[nombre], 'num_format': num_format}
+            if nombre == 'data':
+                propiedades['align'] = 'right'
+            formatos.definir(f'{nombre}:{tipo}', propiedades)
+    return formatos
+
+
+# ============= HOJA 1: RESUMEN EJECUTIVO =============
+# Valores numéricos parseados una sola vez; el resto del módulo usa estos arrays
+num_metricas = normalizar(metricas)
+
+
+def hoja_resumen(escenario, tablas):
+    origen = ' · Valores medidos en logs' if escenario.eventos else ''
+    return Hoja(
+        nombre='Resumen Ejecutivo',
+        columnas=4,
+        anchos={'A:A': 30, 'B:B': 20, 'C:C': 25, 'D:D': 20},
+        bloques=[
+            Titulo('📊 ANÁLISIS DE MONETIZACIÓN CON ANUNCIOS - APP LOGIC'),
+            Titulo(
+                f'Fecha de análisis: {datetime.now().strftime("%d/%m/%Y")} · '
+                f'Mercado: {escenario.mercado} · Precios: {escenario.nivel_precio}{origen}',
+                formato='subheader',
+            ),
+            Espacio(),
+            Tabla(
+                tablas.metricas.celdas(),
+                encabezados=['MÉTRICAS CLAVE', 'VALOR', 'RANGO', 'PROYECCIÓN'],
+                tipos=tablas.metricas.tipos_celdas(),
+                nombre='metricas',
+            ),
+            Espacio(),
+            Seccion('⭐ RECOMENDACIONES PRINCIPALES'),
+            Tabla(recomendaciones, fusionar_ultima=True),
+        ],
+    )
+
+
+# ============= HOJA 2: UBICACIONES DE ANUNCIOS =============
+num_ubicaciones = normalizar(ubicaciones)
+
+
+# Color según nivel de invasión
+color_invasion = Clasificador(
+    reglas=(
+        ({'Baja', 'Muy Baja'}, 'high'),
+        ({'Media'}, 'medium'),
+    ),
+    defecto='low',
+)
+
+
+def hoja_ubicaciones(escenario, tablas):
+    # En modo nativo Excel colorea la columna de invasión con formatos condicionales
+    if escenario.excel_nativo:
+        formato_invasion, condicionales = 'data', {4: color_invasion.condicionales()}
+    else:
+        formato_invasion, condicionales = color_invasion, None
+    return Hoja(
+        nombre='Ubicaciones de Anuncios',
+        columnas=6,
+        anchos={'A:A': 25, 'B:B': 40, 'C:C': 15, 'D:D': 15, 'E:E': 20, 'F:F': 15},
+        bloques=[
+            Titulo('📍 ANÁLISIS DE UBICACIONES DE ANUNCIOS'),
+            Espacio(),
+            Tabla(
+                tablas.ubicaciones.celdas(),
+                encabezados=['Ubicación', 'Descripción', 'Visibilidad', 'CPM Est.', 'Nivel Invasión', 'Recomendación'],
+                formatos=['data', 'data', 'data', 'data', formato_invasion, 'data'],
+                tipos=tablas.ubicaciones.tipos_celdas(),
+                nombre='ubicaciones',
+                condicionales=condicionales,
+            ),
+        ],
+    )
+
+
+# ============= HOJA 3: TIPOS DE ANUNCIOS =============
+num_tipos = normalizar(tipos_anuncios)
+
+
+def hoja_tipos(tablas):
+    return Hoja(
+        nombre='Tipos de Anuncios',
+        columnas=6,
+        anchos={'A:A': 20, 'B:B': 15, 'C:C': 15, 'D:D': 12, 'E:E': 40, 'F:F': 15},
+        bloques=[
+            Titulo('🎯 COMPARATIVA DE TIPOS DE ANUNCIOS'),
+            Espacio(),
+            Tabla(
+                tablas.tipos.celdas(),
+                encabezados=['Tipo de Anuncio', 'CPM Mín.', 'CPM Máx.', 'CTR', 'Ventajas', 'Desventajas'],
+                tipos=tablas.tipos.tipos_celdas(),
+                nombre='tipos',
+            ),
+        ],
+    )
+
+
+# ============= VALORES MEDIDOS (OPCIONAL) =============
+class Tablas(NamedTuple):
+    """Tablas numéricas que alimentan las hojas 1 a 4."""
+    metricas: TablaNumerica
+    ubicaciones: TablaNumerica
+    tipos: TablaNumerica
+
+
+tablas_referencia = Tablas(num_metricas, num_ubicaciones, num_tipos)
+
+# Métrica clave -> (medida en ``Agregados.totales``, banda diaria P5–P95, tipo)
+metricas_medidas = {
+    'CPM Promedio': ('cpm', 'cpm_banda', MONEDA),
+    'CTR Promedio': ('ctr', 'ctr_banda', PORCENTAJE),
+    'Fill Rate Esperado': ('fill_rate', 'fill_banda', PORCENTAJE),
+}
+
+
+def tablas_escenario(escenario, mediacion=None, actividad=None):
+    """Tablas de referencia con los valores simulados o medidos del escenario.
+
+    Con ``mediacion`` (``mediacion_escenario``) el fill rate esperado pasa a ser
+    el de la estrategia elegida, con el rango entre cascada y subasta. Con
+    ``actividad`` (``actividad_escenario``) los usuarios diarios iniciales son los
+    activos del primer mes, con el rango de los promedios mensuales. Con
+    ``escenario.eventos`` los CPM, CTR y fill rate medidos reemplazan a los
+    demás; solo se tocan las filas con datos y las ubicaciones y tipos de los
+    logs se emparejan por nombre con la primera columna de cada tabla.
+    """
+    metricas_t = num_metricas
+    if mediacion is not None:
+        fill = mediacion[escenario.mediacion.get('modo', 'subasta')].fill_rate
+        extremos = [resultado.fill_rate for resultado in mediacion.values()]
+        metricas_t = (metricas_t
+                      .con_valor('Fill Rate Esperado', 1, PORCENTAJE, fill)
+                      .con_valor('Fill Rate Esperado', 2, PORCENTAJE, min(extremos), max(extremos)))
+    if actividad is not None:
+        activos = np.round(actividad.activos)
+        metricas_t = (metricas_t
+                      .con_valor('Usuarios Diarios (Inicial)', 1, CONTEO, activos[0])
+                      .con_valor('Usuarios Diarios (Inicial)', 2, CONTEO, activos.min(), activos.max()))
+    if not escenario.eventos:
+        return Tablas(metricas_t, num_ubicaciones, num_tipos)
+    agregados = cargar_eventos(escenario.eventos)
+
+    totales = agregados.totales()
+    for etiqueta, (medida, banda, tipo) in metricas_medidas.items():
+        if totales[medida] is None:
+            continue
+        # La banda incluye siempre el valor medio (la simulación usa valor y rango como PERT)
+        minimo, maximo = totales[banda]
+        metricas_t = (metricas_t
+                      .con_valor(etiqueta, 1, tipo, totales[medida])
+                      .con_valor(etiqueta, 2, tipo, min(minimo, totales[medida]), max(maximo, totales[medida])))
+
+    ubicaciones_t = num_ubicaciones
+    conocidas = {fila[0] for fila in ubicaciones}
+    for etiqueta, medida in agregados.medidas('ubicacion').items():
+        if etiqueta in conocidas:
+            ubicaciones_t = ubicaciones_t.con_valor(etiqueta, 3, MONEDA, medida['cpm'])
+
+    tipos_t = num_tipos
+    conocidos = {fila[0] for fila in tipos_anuncios}
+    for etiqueta, medida in agregados.medidas('tipo').items():
+        if etiqueta in conocidos:
+            tipos_t = (tipos_t
+                       .con_valor(etiqueta, 1, MONEDA, medida['cpm_p5'])
+                       .con_valor(etiqueta, 2, MONEDA, medida['cpm_p95'])
+                       .con_valor(etiqueta, 3, PORCENTAJE, medida['ctr']))
+    return Tablas(metricas_t, ubicaciones_t, tipos_t)
+
+
+# ============= COHORTES (OPCIONAL) =============
+def dau_cohortes(escenario):
+    """Usuarios activos al cierre de cada mes con cada nivel de retención (niveles × meses).
+
+    Las curvas se ajustan a la retención D1/D7/D30 de la tabla de benchmarks.
+    """
+    parametros = escenario.cohortes
+    horizonte = parametros.get('meses', HORIZONTE_MESES) * DIAS_MES
+    filas = [num_benchmarks.indice(f'Retención Día {dia}') for dia in DIAS_RETENCION]
+    a, b = ajustar_retencion(num_benchmarks.minimo[filas, 1:].T)
+    altas = altas_diarias(parametros['altas_diarias'], parametros.get('crecimiento_mensual', 0), horizonte)
+    return dau_mensual(proyectar_dau(altas, curvas_retencion(a, b, horizonte)))
+
+
+def bloques_cohortes(escenario, dau):
+    parametros = escenario.cohortes
+    meses = dau.shape[1]
+    return [
+        Tabla([[f"Usuarios diarios al cierre de cada mes (1–{meses}): {parametros['altas_diarias']:,} altas/día, "
+                f"{parametros.get('crecimiento_mensual', 0):+.0%} mensual, retención "
+                f"{parametros.get('nivel', 'Promedio')} ajustada a D1/D7/D30"]]),
+        Espacio(),
+        Seccion('👥 USUARIOS DIARIOS POR NIVEL DE RETENCIÓN'),
+        Tabla(
+            Columnas([np.arange(1, meses + 1), *np.round(dau)]),
+            encabezados=['Mes', *NIVELES_BENCHMARK],
+            formatos=['subheader'] + ['data'] * len(NIVELES_BENCHMARK),
+            nombre='cohortes',
+        ),
+    ]
+
+
+# ============= ACTIVIDAD DEL MARKETPLACE (OPCIONAL) =============
+def actividad_escenario(escenario):
+    """Actividad mensual medida en ``escenario.actividad`` (None si no se pidió)."""
+    if escenario.actividad is None:
+        return None
+    return leer_volcados(escenario.actividad).mensual()
+
+
+def bloques_actividad(actividad):
+    meses = actividad.meses()
+    columnas = [np.array(meses), np.round(actividad.clientes), np.round(actividad.abogados),
+                np.round(actividad.activos), actividad.casos, actividad.propuestas, actividad.expirados]
+    return [
+        Tabla([[f'Usuarios diarios medidos en Supabase ({meses[0]} a {meses[-1]}): promedio mensual de '
+                f'clientes y abogados activos, {actividad.filas:,} filas de marketplace_cases y proposals']]),
+        Espacio(),
+        Seccion('🏛️ ACTIVIDAD DEL MARKETPLACE POR MES'),
+        Tabla(
+            Columnas(columnas),
+            encabezados=['Mes', 'Clientes/Día', 'Abogados/Día', 'Usuarios/Día', 'Casos Publicados',
+                         'Propuestas', 'Casos Expirados'],
+            formatos=['subheader'] + ['data'] * 6,
+            nombre='actividad',
+        ),
+    ]
+
+
+# ============= FRECUENCIA (OPCIONAL) =============
+def parametros_frecuencia(escenario):
+    """``(Sesiones, Limites, usuarios)`` a partir de ``escenario.frecuencia``."""
+    parametros = dict(escenario.frecuencia)
+    usuarios = parametros.pop('usuarios', 1_000_000)
+    sesiones = Sesiones(**{k: v for k, v in parametros.items() if k in Sesiones._fields})
+    limites = Limites(**{k: v for k, v in parametros.items() if k in Limites._fields})
+    return sesiones, limites, usuarios
+
+
+def frecuencia_escenario(escenario, cache=SinCache()):
+    """Distribución de impresiones de ``escenario.frecuencia`` (None si no se pidió)."""
+    if escenario.frecuencia is None:
+        return None
+    sesiones, limites, usuarios = parametros_frecuencia(escenario)
+    return memo_sorteos(
+        cache,
+        simular_frecuencia,
+        sesiones=sesiones,
+        limites=limites,
+        usuarios=usuarios,
+        semilla=escenario.semilla,
+        procesos=escenario.procesos,
+    )
+
+
+# ============= MEDIACIÓN (OPCIONAL) =============
+def redes_mediacion(escenario):
+    """Redes de ``escenario.mediacion['redes']`` (dicts o listas con los campos de ``Red``)."""
+    if 'redes' not in escenario.mediacion:
+        return REDES_MEDIACION
+    return tuple(Red(**r) if isinstance(r, dict) else Red(*r) for r in escenario.mediacion['redes'])
+
+
+def mediacion_escenario(escenario, cache=SinCache()):
+    """Resultados de cascada y subasta para ``escenario.mediacion`` (None si no se pidió)."""
+    if escenario.mediacion is None:
+        return None
+    parametros = {k: v for k, v in escenario.mediacion.items() if k != 'modo'}
+    parametros['redes'] = redes_mediacion(escenario)
+    if 'cascada' in parametros:
+        parametros['cascada'] = tuple(tuple(nivel) for nivel in parametros['cascada'])
+    return {
+        modo: memo_sorteos(cache, simular_mediacion, modo=modo, semilla=escenario.semilla,
+                           procesos=escenario.procesos, **parametros)
+        for modo in MODOS_MEDIACION
+    }
+
+
+# ============= HOJA 4: PROYECCIONES DE INGRESOS =============
+def cpm_escenario(escenario, tablas=tablas_referencia):
+    """CPM de la proyección: promedio de métricas o punto medio ponderado de la mezcla."""
+    if escenario.mezcla_anuncios:
+        desconocidos = set(escenario.mezcla_anuncios) - {t[0] for t in tipos_anuncios}
+        if desconocidos:
+            raise ValueError(f'Tipos de anuncio desconocidos en la mezcla: {sorted(desconocidos)}')
+        filas = [tablas.tipos.indice(tipo) for tipo in escenario.mezcla_anuncios]
+        pesos = np.array(list(escenario.mezcla_anuncios.values()), dtype=np.float64)
+        puntos_medios = (tablas.tipos.minimo[filas, 1] + tablas.tipos.maximo[filas, 2]) / 2
+        cpm = float(pesos @ puntos_medios / pesos.sum())
+    else:
+        cpm = tablas.metricas.valor('CPM Promedio', 1)
+    return cpm * escenario.multiplicador_cpm
+
+
+def rangos_simulacion(escenario, tablas=tablas_referencia):
+    """``Rango`` de CPM, fill rate y CTR que sortea el modo simulación.
+
+    Sin mezcla, valor típico y rango de las métricas clave. Con mezcla, el CPM
+    va del mínimo al máximo ponderados de "Tipos de Anuncios" y el CTR toma el
+    valor ponderado de esa tabla y el rango Bajo–Excelente de los benchmarks de
+    cada tipo (los tipos sin fila de benchmark aportan su propio CTR). El fill
+    rate sale siempre de las métricas, que ya recogen mediación y eventos.
+    """
+    def rango_metrica(etiqueta):
+        minimo, maximo = tablas.metricas.rango(etiqueta, 2)
+        return Rango(minimo, tablas.metricas.valor(etiqueta, 1), maximo)
+
+    fill = rango_metrica('Fill Rate Esperado')
+    if not escenario.mezcla_anuncios:
+        cpm, ctr = rango_metrica('CPM Promedio'), rango_metrica('CTR Promedio')
+        escala = escenario.multiplicador_cpm
+        return Rango(cpm.minimo * escala, cpm.moda * escala, cpm.maximo * escala), fill, ctr
+    cpm_escenario(escenario, tablas)  # valida los tipos de la mezcla
+    filas = [tablas.tipos.indice(tipo) for tipo in escenario.mezcla_anuncios]
+    pesos = np.array(list(escenario.mezcla_anuncios.values()), dtype=np.float64)
+    pesos /= pesos.sum()
+    cpm_minimo = pesos @ tablas.tipos.minimo[filas, 1] * escenario.multiplicador_cpm
+    cpm_maximo = pesos @ tablas.tipos.maximo[filas, 2] * escenario.multiplicador_cpm
+    ctr_tipos = tablas.tipos.minimo[filas, 3]
+    extremos = np.array([
+        (num_benchmarks.valor(ctr_benchmark_por_tipo[tipo], 1), num_benchmarks.valor(ctr_benchmark_por_tipo[tipo], 4))
+        if tipo in ctr_benchmark_por_tipo else (ctr, ctr)
+        for tipo, ctr in zip(escenario.mezcla_anuncios, ctr_tipos)
+    ])
+    ctr_minimo, ctr_maximo = pesos @ extremos[:, 0], pesos @ extremos[:, 1]
+    cpm = Rango(cpm_minimo, cpm_escenario(escenario, tablas), cpm_maximo)
+    # El CTR medido de un tipo puede quedar fuera de su benchmark: el rango siempre lo incluye
+    ctr_moda = pesos @ ctr_tipos
+    ctr = Rango(min(ctr_minimo, ctr_moda), ctr_moda, max(ctr_maximo, ctr_moda))
+    return cpm, fill, ctr
+
+
+def usuarios_escenario(escenario, actividad=None):
+    """Usuarios diarios de cada fila de la proyección.
+
+    Con ``escenario.cohortes`` una fila por mes del modelo de cohortes del nivel
+    elegido; si no, con ``actividad`` los activos medidos de cada mes; si no,
+    ``escenario.usuarios_diarios``.
+    """
+    if escenario.cohortes:
+        dau = dau_cohortes(escenario)
+        return np.round(dau[NIVELES_BENCHMARK.index(escenario.cohortes.get('nivel', 'Promedio'))])
+    if actividad is not None:
+        return np.round(actividad.activos)
+    return escenario.usuarios_diarios
+
+
+def hoja_proyecciones(escenario, tablas=tablas_referencia, cache=SinCache(), frecuencia=None, actividad=None):
+    # Datos de proyección (entradas del motor vectorizado)
+    usuarios_diarios = usuarios_escenario(escenario, actividad)
+    notas_usuarios = []
+    if escenario.cohortes:
+        notas_usuarios = bloques_cohortes(escenario, dau_cohortes(escenario))
+    elif actividad is not None:
+        notas_usuarios = bloques_actividad(actividad)
+    impresiones_por_usuario = escenario.impresiones_por_usuario
+    escenario_mezcla = escenario
+    if frecuencia is not None:
+        # Impresiones simuladas con los límites; sin mezcla explícita, la simulada pondera el CPM
+        medias = frecuencia.medias()[0]
+        impresiones_por_usuario = float(medias[-1])
+        if escenario.mezcla_anuncios is None and impresiones_por_usuario > 0:
+            mezcla = dict(zip(TIPOS_FRECUENCIA, medias[:len(TIPOS_FRECUENCIA)].tolist()))
+            escenario_mezcla = replace(escenario, mezcla_anuncios=mezcla)
+    cpm_promedio = cpm_escenario(escenario_mezcla, tablas)
+
+    encabezados_proyeccion = ['Usuarios Diarios', 'Impresiones/Día', 'CPM Promedio', 'Ingresos Diarios', 'Ingresos Mensuales']
+    rangos = rangos_simulacion(escenario_mezcla, tablas) if escenario.simulacion else None
+    proyecciones = cache.memo(
+        proyectar_ingresos,
+        usuarios=usuarios_diarios,
+        impresiones_por_usuario=impresiones_por_usuario,
+        cpm=cpm_promedio,
+        # Con simulación, mismo fill típico que sortean las bandas: Impresiones/Día son las servidas
+        fill_rate=rangos[1].moda if rangos else 1.0,
+    )
+    columnas_proyeccion = list(proyecciones[:5])
+    notas_clics = []
+    if escenario.simulacion:
+        cpm, fill, ctr = rangos
+        distribucion = memo_sorteos(
+            cache,
+            simular,
+            cpm=cpm,
+            fill_rate=fill,
+            ctr=ctr,
+            sorteos=escenario.sorteos,
+            semilla=escenario.semilla,
+            procesos=escenario.procesos,
+        )
+        encabezados_proyeccion += [f'P{p} Mensual' for p in PERCENTILES]
+        columnas_proyeccion += list(bandas_ingresos(distribucion, usuarios_diarios, impresiones_por_usuario))
+        colores_bandas = ['#f44336', '#ff9800', '#4caf50']
+        nota_proyeccion = [Tabla([[f'Monte Carlo: {escenario.sorteos:,} sorteos, semilla {escenario.semilla}'],
+                                  [f'Ingresos Mensuales usa los valores típicos (CPM ${cpm_promedio:.2f}, '
+                                   f'fill {fill.moda:.0%}); los percentiles sortean CPM, fill y CTR en sus '
+                                   'rangos, asimétricos, por eso P50 puede diferir']])]
+        notas_clics = [
+            Espacio(),
+            Seccion(f'🖱️ CLICS MENSUALES (CTR {ctr.minimo:.1%} – {ctr.maximo:.1%}, típico {ctr.moda:.1%})'),
+            Tabla(
+                Columnas([np.asarray(usuarios_diarios, dtype=np.float64),
+                          *np.round(bandas_clics(distribucion, usuarios_diarios, impresiones_por_usuario))]),
+                encabezados=['Usuarios Diarios', *(f'Clics P{p} Mensual' for p in PERCENTILES)],
+                formatos='data',
+                nombre='clics',
+            ),
+        ]
+    else:
+        encabezados_proyeccion += ['Escenario Bajo', 'Escenario Alto']
+        columnas_proyeccion += list(proyecciones[5:])
+        colores_bandas = ['#f44336', '#4caf50']
+        nota_proyeccion = []
+
+    # Modo nativo: las columnas derivadas son fórmulas sobre impresiones y CPM
+    formulas = None
+    if escenario.excel_nativo:
+        formulas = {3: '=B{fila}*C{fila}/1000', 4: f'=D{{fila}}*{DIAS_MES}'}
+        if not escenario.simulacion:
+            formulas.update({5: f'=E{{fila}}*{Fraction(FACTOR_BAJO).limit_denominator()}',
+                             6: f'=E{{fila}}*{Fraction(FACTOR_ALTO).limit_denominator()}'})
+
+    # Gráfico de proyecciones
+    chart1 = Grafico(
+        tipo='line',
+        series=[Serie(
+            nombre='Ingresos Mensuales',
+            tabla='proyecciones',
+            valores=4,
+            estilo={
+                'line': {'color': '#1976d2', 'width': 3},
+                'marker': {'type': 'circle', 'size': 8, 'fill': {'color': '#1976d2'}},
+            },
+        )] + [
+            Serie(
+                nombre=encabezados_proyeccion[col],
+                tabla='proyecciones',
+                valores=col,
+                estilo={'line': {'color': color, 'width': 2, 'dash_type': 'dash'}},
+            )
+            for col, color in enumerate(colores_bandas, start=5)
+        ],
+        opciones={
+            'title': {'name': 'Proyección de Ingresos por Usuarios Diarios'},
+            'x_axis': {'name': 'Usuarios Diarios', 'num_font': {'size': 10}},
+            'y_axis': {'name': 'Ingresos Mensuales (USD)', 'num_font': {'size': 10}},
+            'legend': {'position': 'bottom'},
+            'size': {'width': 720, 'height': 400},
+        },
+    )
+
+    return Hoja(
+        nombre='Proyecciones de Ingresos',
+        columnas=len(encabezados_proyeccion),
+        anchos={'A:A': 20, 'B:H': 15},
+        bloques=[
+            Titulo('💰 PROYECCIONES DE INGRESOS MENSUALES'),
+            Espacio(),
+            Tabla(
+                Columnas(columnas_proyeccion),
+                encabezados=encabezados_proyeccion,
+                formatos=['data', 'data'] + ['currency'] * (len(columnas_proyeccion) - 2),
+                nombre='proyecciones',
+                formulas=formulas,
+            ),
+            *nota_proyeccion,
+            *notas_clics,
+            *notas_usuarios,
+            Espacio(),
+            chart1,
+        ],
+    )
+
+
+# ============= HOJA 5: ESTRATEGIA DE IMPLEMENTACIÓN =============
+num_kpis = normalizar(kpis[1:])
+
+
+def tabla_kpis(reales):
+    """KPIs con una columna "Real Mes N" tras cada meta (``reales`` de ``informes.cargar_kpis``)."""
+    metas, tipos_metas = num_kpis.celdas(), num_kpis.tipos_celdas()
+    filas, tipos = [], []
+    for i, fila in enumerate(metas):
+        kpi = fila[0]
+        filas.append([kpi])
+        tipos.append([None])
+        for col, mes in enumerate(MESES_KPI, start=1):
+            real = reales.get(kpi, {}).get(mes)
+            if real is not None and num_kpis.tipo[i, col] == TEXTO:
+                real = f'{real:.1f} min' if kpi == 'Tiempo en App' else str(real)
+            filas[-1] += [fila[col], real]
+            tipos[-1] += [tipos_metas[i][col], tipos_metas[i][col]]
+        filas[-1].append(fila[-1])
+        tipos[-1].append(None)
+    encabezados = [kpis[0][0]]
+    for mes in MESES_KPI:
+        encabezados += [f'Meta Mes {mes}', f'Real Mes {mes}']
+    return Tabla(filas, encabezados=encabezados + [kpis[0][-1]], tipos=tipos, nombre='kpis')
+
+
+def hoja_estrategia(escenario):
+    if escenario.kpis_reales:
+        columnas, anchos = 8, {'A:A': 15, 'B:B': 30, 'C:C': 40, 'D:D': 20, 'E:H': 15}
+        tabla = tabla_kpis(cargar_kpis(escenario.kpis_reales))
+    else:
+        columnas, anchos = 5, {'A:A': 15, 'B:B': 30, 'C:C': 40, 'D:D': 20, 'E:E': 15}
+        tabla = Tabla(num_kpis.celdas(), encabezados=kpis[0], tipos=num_kpis.tipos_celdas(), nombre='kpis')
+    return Hoja(
+        nombre='Estrategia Implementación',
+        columnas=columnas,
+        anchos=anchos,
+        bloques=[
+            Titulo('🚀 ROADMAP DE IMPLEMENTACIÓN'),
+            Espacio(),
+            Tabla(
+                roadmap,
+                encabezados=['Fase', 'Acción', 'Descripción', 'Anuncios a Implementar', 'Tiempo Est.'],
+                formatos=['subheader', 'data', 'data', 'data', 'data'],
+            ),
+            Espacio(),
+            Seccion('📊 KPIs A MONITOREAR'),
+            tabla,
+        ],
+    )
+
+# ============= HOJA 6: CONFIGURACIÓN ADMOB =============
+hoja_config = Hoja(
+    nombre='Configuración AdMob',
+    columnas=3,
+    anchos={'A:A': 25, 'B:B': 50, 'C:C': 30},
+    bloques=[
+        Titulo('⚙️ GUÍA DE CONFIGURACIÓN ADMOB'),
+        Espacio(),
+        Tabla(test_ids, encabezados=['TIPO DE ANUNCIO', 'ID DE PRUEBA (TEST)', 'REEMPLAZAR CON']),
+        Espacio(),
+        Seccion('PASOS DE CONFIGURACIÓN'),
+        Tabla(pasos, fusionar_ultima=True),
+    ],
+)
+
+# ============= HOJA 7: MEJORES PRÁCTICAS =============
+bloques_practicas = [Titulo('✅ MEJORES PRÁCTICAS Y RECOMENDACIONES'), Espacio()]
+for categoria in categorias:
+    bloques_practicas += [
+        Seccion(f'📌 {categoria[0]}'),
+        Tabla([list(practica) for practica in categoria[1]]),
+        Espacio(),  # Espacio entre categorías
+    ]
+
+hoja_practicas = Hoja(
+    nombre='Mejores Prácticas',
+    columnas=2,
+    anchos={'A:A': 40, 'B:B': 60},
+    bloques=bloques_practicas,
+)
+
+# ============= HOJA 8: ANÁLISIS DE COMPETENCIA =============
+hoja_competencia = Hoja(
+    nombre='Análisis Competencia',
+    columnas=4,
+    anchos={'A:A': 25, 'B:B': 20, 'C:C': 20, 'D:D': 40},
+    bloques=[
+        Titulo('🔍 ANÁLISIS DE APPS LEGALES SIMILARES'),
+        Espacio(),
+        Tabla(
+            competencia,
+            encabezados=['App Competidora', 'Tipos de Anuncios', 'Estrategia Principal', 'Lecciones Aprendidas'],
+        ),
+    ],
+)
+
+# ============= HOJA 9: MÉTRICAS Y BENCHMARKS =============
+num_benchmarks = normalizar(benchmarks)
+
+# Gráfico de benchmarks (filas de CTR)
+chart2 = Grafico(
+    tipo='column',
+    series=[
+        Serie(nombre=nombre, tabla='benchmarks', valores=col, filas=(0, 3), estilo={'fill': {'color': color}})
+        for col, (nombre, color) in enumerate([('Bajo', '#f44336'), ('Promedio', '#ff9800'), ('Alto', '#4caf50')], start=1)
+    ],
+    opciones={
+        'title': {'name': 'Benchmarks de CTR por Tipo de Anuncio'},
+        'x_axis': {'name': 'Tipo de Anuncio'},
+        'y_axis': {'name': 'Porcentaje (%)', 'num_format': '0%'},
+        'legend': {'position': 'bottom'},
+        'size': {'width': 720, 'height': 400},
+    },
+)
+
+niveles_benchmark = ['low', 'medium', 'high', 'high']
+
+
+def hoja_metricas(escenario):
+    # En modo nativo cada columna de nivel recibe una sola regla condicional sobre su rango
+    if escenario.excel_nativo:
+        formatos = ['data'] * 5
+        condicionales = {col: [{'type': 'no_blanks', 'format': nivel}]
+                         for col, nivel in enumerate(niveles_benchmark, start=1)}
+    else:
+        formatos, condicionales = ['data'] + niveles_benchmark, None
+    return Hoja(
+        nombre='Métricas y Benchmarks',
+        columnas=5,
+        anchos={'A:A': 25, 'B:E': 15},
+        bloques=[
+            Titulo('📈 BENCHMARKS DE LA INDUSTRIA'),
+            Espacio(),
+            Tabla(
+                num_benchmarks.celdas(),
+                encabezados=['Métrica', *NIVELES_BENCHMARK],
+                formatos=formatos,
+                tipos=num_benchmarks.tipos_celdas(),
+                nombre='benchmarks',
+                condicionales=condicionales,
+            ),
+            Espacio(),
+            chart2,
+        ],
+    )
+
+
+# ============= HOJA 10 (OPCIONAL): REJILLA DE ESCENARIOS =============
+def hoja_rejilla(escenario):
+    def columnas_rejilla():
+        for entradas, bloque in proyectar_rejilla_por_bloques(**escenario.rejilla):
+            yield [*entradas, bloque.impresiones, bloque.ingresos_diarios, bloque.ingresos_mensuales]
+
+    return Hoja(
+        nombre='Rejilla de Escenarios',
+        columnas=7,
+        anchos={'A:G': 16},
+        bloques=[
+            Titulo('🧮 REJILLA DE ESCENARIOS DE INGRESOS'),
+            Espacio(),
+            Tabla(
+                Columnas(columnas_rejilla),
+                encabezados=['Usuarios Diarios', 'Impresiones/Usuario', 'CPM', 'Fill Rate', 'Impresiones/Día', 'Ingresos Diarios', 'Ingresos Mensuales'],
+                formatos=['data', 'data', 'currency', 'percent', 'data', 'currency', 'currency'],
+                nombre='rejilla',
+                congelar=True,
+                formulas={
+                    4: '=A{fila}*B{fila}*D{fila}',
+                    5: '=E{fila}*C{fila}/1000',
+                    6: f"=F{{fila}}*{escenario.rejilla.get('dias_mes', DIAS_MES)}",
+                } if escenario.excel_nativo else None,
+            ),
+        ],
+    )
+
+
+# ============= HOJA 11 (OPCIONAL): FRECUENCIA DE ANUNCIOS =============
+etiquetas_limites = {
+    'max_visibles': 'Máx. anuncios visibles',
+    'navegaciones_intersticial': 'Intersticial cada N navegaciones',
+    'intersticiales_dia': 'Intersticiales por día',
+    'app_open_dia': 'App Open por día',
+    'recompensados_dia': 'Rewarded por día',
+}
+
+
+def hoja_frecuencia(escenario, tablas, frecuencia):
+    _, limites, _ = parametros_frecuencia(escenario)
+    filas = [tablas.tipos.indice(tipo) for tipo in TIPOS_FRECUENCIA]
+    cpm = (tablas.tipos.minimo[filas, 1] + tablas.tipos.maximo[filas, 2]) / 2 * escenario.multiplicador_cpm
+    medias = frecuencia.medias()
+    percentiles = frecuencia.percentiles(PERCENTILES)
+    mensual = frecuencia.ingresos_por_usuario(cpm) * DIAS_MES
+    por_tipo = medias[0, :len(TIPOS_FRECUENCIA)] * cpm / 1000 * DIAS_MES
+
+    impacto = [
+        [etiquetas_limites[nombre], getattr(limites, nombre), medias[v, -1], medias[v, -1] / medias[0, -1] - 1,
+         mensual[v], mensual[v] / mensual[0] - 1]
+        for v, nombre in enumerate(LIMITES_MEDIDOS, start=1)
+        if getattr(limites, nombre) is not None
+    ]
+    return Hoja(
+        nombre='Frecuencia de Anuncios',
+        columnas=7,
+        anchos={'A:A': 32, 'B:G': 16},
+        bloques=[
+            Titulo('⏱️ RITMO Y LÍMITES DE FRECUENCIA'),
+            Tabla([[f'{frecuencia.usuarios:,} usuarios simulados (un día); impresiones por usuario con todos los límites']]),
+            Espacio(),
+            Tabla(
+                [[tipo, medias[0, i], *percentiles[:, i], cpm[i], por_tipo[i]]
+                 for i, tipo in enumerate(TIPOS_FRECUENCIA)]
+                + [['Total', medias[0, -1], *percentiles[:, -1], None, mensual[0]]],
+                encabezados=['Tipo de Anuncio', 'Media/Día', *(f'P{p}' for p in PERCENTILES), 'CPM', 'Ingreso Mensual/Usuario'],
+                formatos=['data', 'data', 'data', 'data', 'data', 'currency', 'currency'],
+                nombre='frecuencia',
+            ),
+            Espacio(),
+            Seccion('🚦 EFECTO DE CADA LÍMITE (SIN ESE LÍMITE)'),
+            Tabla(
+                impacto,
+                encabezados=['Límite', 'Valor', 'Impresiones/Día', 'Δ Impresiones', 'Ingreso Mensual/Usuario', 'Δ Ingresos'],
+                formatos=['data', 'data', 'data', 'percent', 'currency', 'percent'],
+                nombre='limites',
+            ),
+        ],
+    )
+
+
+# ============= HOJA 12 (OPCIONAL): OPTIMIZACIÓN DE LA MEZCLA =============
+# Impresiones diarias de una ubicación como fracción de ``impresiones_por_usuario`` según su visibilidad
+peso_visibilidad = {'Muy Alta': 1.0, 'Alta': 0.75, 'Media': 0.5}
+
+
+def candidatas_mezcla(escenario, tablas):
+    """Ubicaciones de ``tipos_por_ubicacion`` con el ingreso diario por usuario de cada tipo.
+
+    El tipo principal usa el "CPM Est." de la ubicación y los alternativos el
+    punto medio de su rango en "Tipos de Anuncios".
+    """
+    candidatas = []
+    for ubicacion, (tipos, visible) in tipos_por_ubicacion.items():
+        i = tablas.ubicaciones.indice(ubicacion)
+        fila = tablas.ubicaciones.textos[i]
+        alternativos = [tablas.tipos.indice(tipo) for tipo in tipos[1:]]
+        cpm = np.concatenate(([tablas.ubicaciones.minimo[i, 3]],
+                              (tablas.tipos.minimo[alternativos, 1] + tablas.tipos.maximo[alternativos, 2]) / 2))
+        impresiones = escenario.impresiones_por_usuario * peso_visibilidad[fila[2]]
+        ingresos = impresiones * cpm * escenario.multiplicador_cpm / 1000
+        candidatas.append(Candidata(ubicacion, NIVELES_INVASION.index(fila[4]), visible, tipos, tuple(ingresos.tolist())))
+    return candidatas
+
+
+def hoja_optimizacion(escenario, tablas):
+    parametros = escenario.optimizacion
+    restricciones = Restricciones(
+        max_invasion=NIVELES_INVASION.index(parametros.get('max_invasion', 'Media')),
+        max_visibles=parametros.get('max_visibles', 3),
+        penalizacion=parametros.get('penalizacion', PENALIZACION),
+    )
+    candidatas = candidatas_mezcla(escenario, tablas)
+    configuraciones = optimizar(candidatas, restricciones)
+    # Ingresos mensuales por cada 1.000 usuarios diarios
+    escala = 1000 * DIAS_MES
+    optima = configuraciones.optima()
+    eleccion = configuraciones.eleccion[optima]
+
+    def estado(candidata, e):
+        if candidata.invasion > restricciones.max_invasion:
+            return 'Excluida (invasión)'
+        return candidata.tipos[e] if e >= 0 else 'Desactivada'
+
+    frontera = configuraciones.pareto()
+    return Hoja(
+        nombre='Optimización de Anuncios',
+        columnas=5,
+        anchos={'A:A': 28, 'B:D': 18, 'E:E': 90},
+        bloques=[
+            Titulo('🧭 MEZCLA ÓPTIMA DE UBICACIONES Y TIPOS'),
+            Tabla([[f'{configuraciones.evaluadas:,} nodos explorados por ramificación y poda '
+                    f'({configuraciones.posibles:,} configuraciones posibles) · '
+                    f'invasión máx. {NIVELES_INVASION[restricciones.max_invasion]}, '
+                    f'{restricciones.max_visibles} anuncios visibles, '
+                    f'penalización de retención {restricciones.penalizacion:.1%} por nivel']]),
+            Espacio(),
+            Tabla(
+                [[c.ubicacion, estado(c, e), NIVELES_INVASION[c.invasion], c.ingresos[e] * escala if e >= 0 else 0.0]
+                 for c, e in zip(candidatas, eleccion)]
+                + [['Total (tras retención)', None, None, configuraciones.ingreso[optima] * escala]],
+                encabezados=['Ubicación', 'Tipo de Anuncio', 'Nivel Invasión', 'Ingreso Mensual/1.000 Usuarios'],
+                formatos=['data', 'data', 'data', 'currency'],
+                nombre='mezcla',
+            ),
+            Espacio(),
+            Seccion('📐 FRONTERA DE PARETO: INGRESOS VS. INVASIVIDAD'),
+            Tabla(
+                [[int(configuraciones.invasividad[k]), configuraciones.ingreso[k] * escala,
+                  configuraciones.retencion[k], int(configuraciones.visibles[k]),
+                  ', '.join(f'{u} ({t})' for u, t in describir(candidatas, configuraciones.eleccion[k])) or 'Sin anuncios']
+                 for k in frontera],
+                encabezados=['Invasividad', 'Ingreso Mensual/1.000 Usuarios', 'Retención', 'Anuncios Visibles', 'Ubicaciones Activas'],
+                formatos=['data', 'currency', 'percent', 'data', 'data'],
+                nombre='pareto',
+            ),
+            Espacio(),
+            Grafico(
+                tipo='scatter',
+                series=[Serie(
+                    nombre='Frontera de Pareto',
+                    tabla='pareto',
+                    valores=1,
+                    estilo={
+                        'line': {'color': '#1976d2', 'width': 2},
+                        'marker': {'type': 'circle', 'size': 7, 'fill': {'color': '#1976d2'}},
+                    },
+                )],
+                opciones={
+                    'title': {'name': 'Ingresos vs. Invasividad'},
+                    'x_axis': {'name': 'Invasividad (suma de niveles)'},
+                    'y_axis': {'name': 'Ingreso Mensual por 1.000 Usuarios (USD)'},
+                    'legend': {'none': True},
+                    'size': {'width': 720, 'height': 400},
+                },
+            ),
+        ],
+    )
+
+
+# ============= HOJA 13 (OPCIONAL): MEDIACIÓN =============
+def hoja_mediacion(escenario, mediacion):
+    redes = redes_mediacion(escenario)
+    cascada, subasta = mediacion['cascada'], mediacion['subasta']
+    modo = escenario.mediacion.get('modo', 'subasta')
+    comparativa = [
+        ['Fill Rate', cascada.fill_rate, subasta.fill_rate],
+        ['eCPM (por impresión servida)', cascada.ecpm, subasta.ecpm],
+        ['Ingreso por 1.000 Solicitudes', cascada.ingreso_por_mil, subasta.ingreso_por_mil],
+        ['Latencia Media (ms)', cascada.latencia_media_ms, subasta.latencia_media_ms],
+        ['Latencia P95 (ms)', cascada.latencia_percentil_ms(95), subasta.latencia_percentil_ms(95)],
+    ]
+    tipos = [[None, tipo, tipo] for tipo in ('porcentaje', 'moneda', 'moneda', 'conteo', 'conteo')]
+    return Hoja(
+        nombre='Mediación de Anuncios',
+        columnas=6,
+        anchos={'A:A': 30, 'B:F': 18},
+        bloques=[
+            Titulo('🔀 MEDIACIÓN: CASCADA VS. OPEN BIDDING'),
+            Tabla([[f'{cascada.solicitudes:,} solicitudes simuladas por estrategia; el fill rate de '
+                    f'{modo} reemplaza al "Fill Rate Esperado" del resumen']]),
+            Espacio(),
+            Tabla(comparativa, encabezados=['Métrica', 'Cascada', 'Subasta'], tipos=tipos, nombre='mediacion'),
+            Espacio(),
+            Seccion('📡 REDES PUBLICITARIAS'),
+            Tabla(
+                [[red.nombre, red.ecpm, red.fill, red.latencia_ms,
+                  cascada.ganadas[i] / max(cascada.servidas, 1), subasta.ganadas[i] / max(subasta.servidas, 1)]
+                 for i, red in enumerate(redes)],
+                encabezados=['Red', 'eCPM Medio', 'Fill', 'Latencia Media (ms)', 'Cuota Cascada', 'Cuota Subasta'],
+                formatos=['data', 'currency', 'percent', 'data', 'percent', 'percent'],
+                nombre='redes',
+            ),
+        ],
+    )
+
+
+# ============= HOJA 14 (OPCIONAL): SENSIBILIDAD =============
+etiquetas_parametros = {
+    'cpm': 'CPM Promedio',
+    'fill_rate': 'Fill Rate',
+    'impresiones_por_usuario': 'Impresiones/Usuario',
+    'usuarios': 'Usuarios Diarios (Inicial)',
+    'crecimiento': 'Crecimiento Mensual',
+}
+tipos_parametros = {'cpm': 'moneda', 'fill_rate': 'porcentaje', 'usuarios': 'conteo', 'crecimiento': 'porcentaje'}
+# "+20% mensual" de las métricas clave y un rango de 0% a 40%
+crecimiento_mensual = Rango(0.0, 0.2, 0.4)
+
+
+def parametros_sensibilidad(escenario, tablas, actividad=None):
+    """Rangos de cada parámetro de ``PARAMETROS_SENSIBILIDAD`` alrededor de los valores del escenario.
+
+    CPM, fill rate y usuarios toman el rango de las métricas clave (el CPM y los
+    usuarios escalados a los del escenario); los usuarios base son los del primer
+    mes de la proyección (``usuarios_escenario``). Si el fill rate coincide con un
+    extremo de su rango (p.ej. el de la estrategia de mediación elegida) el rango
+    se amplía para que quede dentro. Las impresiones por usuario varían ±50%.
+    ``escenario.sensibilidad['rangos']`` reemplaza cualquiera de ellos.
+    """
+    cpm = cpm_escenario(escenario, tablas)
+    escala_cpm = cpm / tablas.metricas.valor('CPM Promedio', 1)
+    usuarios = float(usuarios_escenario(escenario, actividad)[0])
+    escala_usuarios = usuarios / tablas.metricas.valor('Usuarios Diarios (Inicial)', 1)
+    fill = tablas.metricas.valor('Fill Rate Esperado', 1)
+    fill_minimo, fill_maximo = tablas.metricas.rango('Fill Rate Esperado', 2)
+    if not fill_minimo < fill < fill_maximo:
+        margen = (fill_maximo - fill_minimo) / 2 or 0.05
+        fill_minimo, fill_maximo = max(min(fill_minimo, fill - margen), 0.0), min(max(fill_maximo, fill + margen), 1.0)
+    impresiones = escenario.impresiones_por_usuario
+    rangos = {
+        'cpm': [v * escala_cpm for v in tablas.metricas.rango('CPM Promedio', 2)],
+        'fill_rate': (fill_minimo, fill_maximo),
+        'impresiones_por_usuario': (impresiones * 0.5, impresiones * 1.5),
+        'usuarios': [v * escala_usuarios for v in tablas.metricas.rango('Usuarios Diarios (Inicial)', 2)],
+        'crecimiento': (crecimiento_mensual.minimo, crecimiento_mensual.maximo),
+        **escenario.sensibilidad.get('rangos', {}),
+    }
+    bases = {'cpm': cpm, 'fill_rate': fill, 'impresiones_por_usuario': impresiones,
+             'usuarios': usuarios, 'crecimiento': crecimiento_mensual.moda}
+    return [Parametro(nombre, float(rangos[nombre][0]), float(bases[nombre]), float(rangos[nombre][1]))
+            for nombre in PARAMETROS_SENSIBILIDAD]
+
+
+def hoja_sensibilidad(escenario, tablas, cache=SinCache(), actividad=None):
+    parametros = parametros_sensibilidad(escenario, tablas, actividad)
+    meses = escenario.sensibilidad.get('meses', MESES_SENSIBILIDAD)
+    analisis = memo_sorteos(
+        cache,
+        analizar,
+        parametros=parametros,
+        meses=meses,
+        muestras=escenario.sensibilidad.get('muestras', MUESTRAS_SENSIBILIDAD),
+        semilla=escenario.semilla,
+        procesos=escenario.procesos,
+    )
+    orden = analisis.orden()
+    filas, tipos = [], []
+    for i in orden:
+        p = analisis.parametros[i]
+        filas.append([etiquetas_parametros[p.nombre], p.minimo, p.base, p.maximo,
+                      analisis.bajo[i] - analisis.base, analisis.alto[i] - analisis.base,
+                      analisis.primer_orden[i], analisis.total[i]])
+        tipo = tipos_parametros.get(p.nombre)
+        tipos.append([None, tipo, tipo, tipo, None, None, None, None])
+    evaluaciones = analisis.muestras * (len(parametros) + 2)
+    return Hoja(
+        nombre='Sensibilidad',
+        columnas=8,
+        anchos={'A:A': 28, 'B:H': 15},
+        bloques=[
+            Titulo('🌪️ SENSIBILIDAD DE LOS INGRESOS A CADA SUPUESTO'),
+            Tabla([[f'Ingresos acumulados a {meses} meses: base ${analisis.base:,.2f}. Sobol con '
+                    f'{analisis.muestras:,} muestras ({evaluaciones:,} evaluaciones). El CTR no interviene: '
+                    f'los ingresos se calculan por CPM.']]),
+            Espacio(),
+            Tabla(
+                filas,
+                encabezados=['Parámetro', 'Mínimo', 'Base', 'Máximo', 'Δ Ingresos (Mín.)', 'Δ Ingresos (Máx.)',
+                             'Sobol S1', 'Sobol ST'],
+                formatos=['data', 'data', 'data', 'data', 'currency', 'currency', 'percent', 'percent'],
+                tipos=tipos,
+                nombre='tornado',
+            ),
+            Espacio(),
+            Grafico(
+                tipo='bar',
+                series=[
+                    Serie(nombre='Parámetro en su mínimo', tabla='tornado', valores=4,
+                          estilo={'fill': {'color': '#f44336'}, 'overlap': 100, 'gap': 50}),
+                    Serie(nombre='Parámetro en su máximo', tabla='tornado', valores=5,
+                          estilo={'fill': {'color': '#4caf50'}, 'overlap': 100, 'gap': 50}),
+                ],
+                opciones={
+                    'title': {'name': f'Tornado: variación de ingresos a {meses} meses'},
+                    'x_axis': {'name': 'Δ Ingresos vs. base (USD)'},
+                    # El parámetro más influyente arriba
+                    'y_axis': {'reverse': True},
+                    'legend': {'position': 'bottom'},
+                    'size': {'width': 720, 'height': 400},
+                },
+            ),
+        ],
+    )
+
+
+# ============= HOJA 15 (OPCIONAL): EXPERIMENTO A/B =============
+# Resultado de cada variante frente al control
+color_decision = Clasificador(reglas=(({'Gana'}, 'high'), ({'Pierde'}, 'low')))
+
+
+def experimento_escenario(escenario):
+    """``experimentos.Experimento`` de ``escenario.experimento`` (None si no se pidió)."""
+    if escenario.experimento is None:
+        return None
+    opciones = {k: v for k, v in escenario.experimento.items() if k != 'archivos'}
+    nombres = [u[0] for u in ubicaciones]
+    if opciones['control'] not in nombres:
+        raise ValueError(f"experimento: el control {opciones['control']!r} no es una ubicación de anuncios")
+    experimento = analizar_experimento(escenario.experimento['archivos'], semilla=escenario.semilla, **opciones)
+    desconocidas = [v for v in experimento.variantes if v not in nombres]
+    if desconocidas:
+        raise ValueError(f'experimento: variantes que no son ubicaciones de anuncios: {desconocidas}')
+    return experimento
+
+
+def hoja_experimento(escenario, experimento):
+    por_mil = experimento.por_usuario() * 1000
+    filas = [[experimento.variantes[0], int(experimento.usuarios[0]), float(experimento.ingresos[0]),
+              float(por_mil[0]), None, None, None, None, None, 'Control']]
+    secuencial = []
+    for i in range(1, len(experimento.variantes)):
+        parada = experimento.parada(i)
+        if parada is None:
+            decision = 'Sin diferencia'
+        else:
+            decision = 'Gana' if experimento.z[i, parada] > 0 else 'Pierde'
+        filas.append([experimento.variantes[i], int(experimento.usuarios[i]), float(experimento.ingresos[i]),
+                      float(por_mil[i]), float(experimento.lift[i]), float(experimento.ic_inferior[i]),
+                      float(experimento.ic_superior[i]), float(experimento.prob_mejora[i]),
+                      None if parada is None else parada + 1, decision])
+        for k, usuarios in enumerate(experimento.miradas):
+            z = experimento.z[i, k]
+            secuencial.append([experimento.variantes[i], k + 1, int(usuarios), usuarios / experimento.miradas[-1],
+                               round(float(z), 2) if np.isfinite(z) else None,
+                               round(float(experimento.fronteras[i, k]), 2),
+                               'Cruza' if parada is not None and k >= parada else 'Continuar'])
+    if escenario.excel_nativo:
+        formato_decision, condicionales = 'data', {9: color_decision.condicionales()}
+    else:
+        formato_decision, condicionales = color_decision, None
+    comparaciones = len(experimento.variantes) - 1
+    alfa = (1 - experimento.confianza) / comparaciones
+    return Hoja(
+        nombre='Experimento A-B',
+        columnas=10,
+        anchos={'A:A': 28, 'B:J': 15},
+        bloques=[
+            Titulo('🧪 EXPERIMENTO A/B DE UBICACIONES'),
+            Tabla([[f'{int(experimento.usuarios.sum()):,} usuarios en {len(escenario.experimento["archivos"])} '
+                    f'archivo(s). Bootstrap: {experimento.remuestreos:,} remuestreos de {experimento.cubos:,} '
+                    f'cubos de usuarios por variante; intervalos al {experimento.confianza:.0%}.']]),
+            Tabla([[f"Parada secuencial: fronteras O'Brien-Fleming (gasto de alfa de Lan-DeMets) en "
+                    f'{len(experimento.miradas)} miradas, alfa {alfa:.2%} por comparación '
+                    f'({comparaciones} frente al control).']]),
+            Espacio(),
+            Tabla(
+                filas,
+                encabezados=['Variante', 'Usuarios', 'Ingresos', 'Ingresos/1.000 Usuarios', 'Lift',
+                             'IC Inferior', 'IC Superior', 'P(Lift > 0)', 'Mirada de Parada', 'Decisión'],
+                formatos=['data', 'data', 'currency', 'currency', 'percent', 'percent', 'percent', 'percent',
+                          'data', formato_decision],
+                nombre='experimento',
+                condicionales=condicionales,
+            ),
+            Espacio(),
+            Seccion('⏱️ MIRADAS SECUENCIALES'),
+            Tabla(
+                secuencial,
+                encabezados=['Variante', 'Mirada', 'Usuarios Acumulados', 'Fracción', 'Estadístico z',
+                             'Frontera |z|', 'Estado'],
+                formatos=['data', 'data', 'data', 'percent', 'data', 'data', 'data'],
+                nombre='secuencial',
+            ),
+            Espacio(),
+            Grafico(
+                tipo='column',
+                series=[Serie(nombre='Ingresos por 1.000 usuarios', tabla='experimento', valores=3,
+                              estilo={'fill': {'color': '#1976d2'}})],
+                opciones={
+                    'title': {'name': 'Ingresos por 1.000 usuarios por variante'},
+                    'y_axis': {'name': 'USD'},
+                    'legend': {'none': True},
+                    'size': {'width': 720, 'height': 360},
+                },
+            ),
+        ],
+    )
+
+
+# ============= GENERACIÓN =============
+def build_workbook(escenario=None, directorio='.', cache=None, perfil=None, **cambios):
+    """Genera el libro de ``escenario`` en ``directorio`` y devuelve su ruta.
+
+    ``escenario`` por defecto es ``datos.escenario_base``; ``cambios`` reemplaza
+    campos sueltos, p.ej. ``build_workbook(simulacion=True, semilla=7)``. Se valida
+    antes de escribir nada.
+
+    Con ``cache`` (``CacheConstruccion``) el libro no se regenera si el escenario,
+    el código y la fecha coinciden con la última construcción, y las proyecciones
+    y simulaciones se reutilizan cuando sus entradas no cambiaron. ``perfil``
+    (``analisis_anuncios.perfil.Perfil``) registra tiempo y memoria por fase.
+
+    Con ``escenario.salidas`` distintas de 'xlsx' las tablas se exportan además (o
+    solo, si falta 'xlsx') al directorio ``escenario.nombre`` (``exportacion.exportar``);
+    sin libro, la ruta devuelta es la de su ``indice.json``.
+    """
+    escenario = replace(escenario or escenario_base, **cambios)
+    escenario.validar(tipos_anuncios=[tipo[0] for tipo in tipos_anuncios])
+    cache = cache or SinCache()
+    perfil = perfil or SinPerfil()
+    ruta = os.path.normpath(os.path.join(directorio, escenario.archivo))
+    eventos = huella_eventos(escenario.eventos) if escenario.eventos else None
+    reales = huella_fuentes(escenario.kpis_reales) if escenario.kpis_reales else None
+    volcados = huella_volcados(escenario.actividad) if escenario.actividad else None
+    asignaciones = huella_experimento(escenario.experimento['archivos']) if escenario.experimento else None
+    clave = huella(escenario, huella_fuentes(*FUENTES), eventos, reales, volcados, asignaciones,
+                   datetime.now().date().isoformat())
+    if cache.vigente(escenario.nombre, clave, ruta):
+        return ruta
+
+    with perfil.fase('datos'):
+        mediacion = mediacion_escenario(escenario, cache)
+        actividad = actividad_escenario(escenario)
+        tablas = tablas_escenario(escenario, mediacion, actividad)
+        frecuencia = frecuencia_escenario(escenario, cache)
+        experimento = experimento_escenario(escenario)
+        hojas = [
+            hoja_resumen(escenario, tablas),
+            hoja_ubicaciones(escenario, tablas),
+            hoja_tipos(tablas),
+            hoja_proyecciones(escenario, tablas, cache, frecuencia, actividad),
+            hoja_estrategia(escenario),
+            hoja_config,
+            hoja_practicas,
+            hoja_competencia,
+            hoja_metricas(escenario),
+        ]
+        if escenario.rejilla:
+            hojas.append(hoja_rejilla(escenario))
+        if frecuencia is not None:
+            hojas.append(hoja_frecuencia(escenario, tablas, frecuencia))
+        if escenario.optimizacion is not None:
+            hojas.append(hoja_optimizacion(escenario, tablas))
+        if mediacion is not None:
+            hojas.append(hoja_mediacion(escenario, mediacion))
+        if escenario.sensibilidad is not None:
+            hojas.append(hoja_sensibilidad(escenario, tablas, cache, actividad))
+        if experimento is not None:
+            hojas.append(hoja_experimento(escenario, experimento))
+
+    if escenario.exportaciones:
+        exportar(hojas, os.path.join(directorio, escenario.nombre), escenario.exportaciones, perfil)
+    if 'xlsx' in escenario.salidas:
+        with perfil.fase('formatos'):
+            workbook = crear_libro(ruta, streaming=escenario.streaming)
+            formatos = crear_formatos(workbook)
+        renderizar(workbook, hojas, formatos, perfil)
+
+        # Cerrar el archivo (serialización XML y compresión zip)
+        with perfil.fase('cierre'):
+            workbook.close()
+    cache.registrar(escenario.nombre, clave, ruta, {
+        hoja.nombre: huella(hoja, estilos, formatos_numericos) for hoja in hojas
+    })
+    return ruta
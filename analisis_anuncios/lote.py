@@ -0,0 +1,109 @@
+"""Generación en lote: reparte escenarios entre un pool de procesos, un libro por tarea.
+
+También reparte en lotes el trabajo dentro de un libro (``mapear`` y
+``repartir``), que usan las simulaciones y el análisis de sensibilidad.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, replace
+from datetime import datetime
+
+MANIFIESTO = 'manifest.json'
+
+
+def nombres_repetidos(escenarios):
+    """Nombres que aparecen más de una vez (cada libro se escribe en ``<nombre>.xlsx``)."""
+    nombres = [e.nombre for e in escenarios]
+    return sorted({n for n in nombres if nombres.count(n) > 1})
+
+
+def mapear(funcion, tareas, procesos=None):
+    """``[funcion(t) for t in tareas]`` en un pool de ``procesos`` si hay más de una tarea.
+
+    ``procesos=None`` usa todos los núcleos; con uno solo (o una sola tarea) se
+    ejecuta en línea sin arrancar procesos.
+    """
+    procesos = min(procesos or os.cpu_count() or 1, len(tareas))
+    if procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            return list(pool.map(funcion, tareas))
+    return [funcion(tarea) for tarea in tareas]
+
+
+def repartir(funcion, n, tamano_lote, semilla=None, procesos=None, argumentos=()):
+    """Simula ``n`` elementos en lotes de hasta ``tamano_lote`` con ``mapear``.
+
+    Cada lote llama a ``funcion((semilla_lote, tamaño, *argumentos))`` con su
+    propia ``SeedSequence`` derivada de ``semilla`` por ``spawn``, así que con la
+    misma ``semilla`` los resultados (en orden de lote) no dependen de ``procesos``.
+    """
+    # NumPy solo al repartir: la CLI importa este módulo para validar sin cargarlo
+    import numpy as np
+
+    lotes = [tamano_lote] * (n // tamano_lote)
+    if n % tamano_lote:
+        lotes.append(n % tamano_lote)
+    semillas = np.random.SeedSequence(semilla).spawn(len(lotes))
+    return mapear(funcion, [(s, m, *argumentos) for s, m in zip(semillas, lotes)], procesos)
+
+
+def _generar_uno(generar, escenario, directorio):
+    inicio = time.perf_counter()
+    ruta = os.path.join(directorio, escenario.archivo)
+    anterior = os.stat(ruta).st_mtime_ns if os.path.exists(ruta) else None
+    ruta = generar(escenario, directorio)
+    return {
+        'escenario': asdict(escenario),
+        'archivo': os.path.relpath(ruta, directorio),
+        'bytes': os.path.getsize(ruta),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        # El generador puede omitir libros sin cambios (ver ``cache``)
+        'reutilizado': os.stat(ruta).st_mtime_ns == anterior,
+    }
+
+
+def generar_lote(generar, escenarios, directorio, procesos=None, informar=print):
+    """Genera un libro por escenario con ``generar(escenario, directorio) -> ruta``.
+
+    ``generar`` debe ser una función importable a nivel de módulo para que los
+    workers la reciban; los datos de referencia que use se cargan una vez por
+    proceso y solo se leen. Cada escenario se ejecuta con ``procesos=1`` para no
+    anidar pools. Escribe ``manifest.json`` en ``directorio`` y lo devuelve; los
+    escenarios que fallan quedan registrados con su error en vez de abortar el lote.
+    """
+    repetidos = nombres_repetidos(escenarios)
+    if repetidos:
+        raise ValueError(f'Nombres de escenario repetidos: {repetidos}')
+
+    os.makedirs(directorio, exist_ok=True)
+    total = len(escenarios)
+    libros = []
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = {
+            pool.submit(_generar_uno, generar, replace(e, procesos=1), directorio): e
+            for e in escenarios
+        }
+        for n, futuro in enumerate(as_completed(futuros), start=1):
+            escenario = futuros[futuro]
+            try:
+                entrada = futuro.result()
+            except Exception as error:
+                entrada = {'escenario': asdict(escenario), 'error': f'{type(error).__name__}: {error}'}
+                informar(f'[{n}/{total}] ❌ {escenario.nombre}: {entrada["error"]}')
+            else:
+                icono = '♻️' if entrada['reutilizado'] else '✅'
+                informar(f'[{n}/{total}] {icono} {entrada["archivo"]} ({entrada["segundos"]:.1f} s)')
+            libros.append(entrada)
+
+    manifiesto = {
+        'generado': datetime.now().isoformat(timespec='seconds'),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'libros': sorted(libros, key=lambda entrada: entrada['escenario']['nombre']),
+        'errores': sum('error' in entrada for entrada in libros),
+    }
+    with open(os.path.join(directorio, MANIFIESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2, default=list)
+    return manifiesto
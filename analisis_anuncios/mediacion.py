@@ -0,0 +1,150 @@
+"""Simulación de mediación: cascada (waterfall) frente a subasta (open bidding).
+
+Cada solicitud de anuncio recibe de cada red una respuesta aleatoria: si tiene
+anuncio (probabilidad de fill), cuánto pagaría (eCPM log-normal alrededor de su
+media) y cuánto tarda (latencia exponencial). Las solicitudes se procesan por
+lotes como matrices ``solicitudes × redes``:
+
+- Cascada: los niveles se consultan en orden, cada uno con un precio mínimo;
+  gana el primero cuya red tiene anuncio y paga al menos el mínimo. La red
+  responde una sola vez por solicitud aunque aparezca en varios niveles (si no
+  tenía anuncio a $6 tampoco lo tiene a $3) y se cobra su puja, el eCPM que de
+  verdad paga, que por construcción es al menos el mínimo del nivel; el mínimo
+  solo decide qué nivel gana. La latencia es la suma de los niveles consultados
+  hasta entonces.
+- Subasta: todas las redes pujan a la vez; gana la puja más alta por encima del
+  precio mínimo (primer precio) y la latencia es la de la respuesta más lenta,
+  acotada por el tiempo límite (las pujas que llegan tarde se descartan).
+
+El resultado da el fill rate efectivo, el eCPM, el ingreso por mil solicitudes
+y la latencia añadida a la carga del anuncio.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.lote import repartir
+
+TAMANO_LOTE = 250_000
+# Histograma de latencias (ms) para percentiles exactos a 1 ms
+MAX_LATENCIA_MS = 10_000
+MODOS = ('cascada', 'subasta')
+
+
+class Red(NamedTuple):
+    nombre: str
+    ecpm: float  # eCPM medio de sus pujas (USD)
+    fill: float  # probabilidad de tener anuncio para una solicitud
+    latencia_ms: float  # tiempo medio de respuesta
+    dispersion: float = 0.6  # sigma del logaritmo de la puja
+
+
+REDES = (
+    Red('AdMob', 2.50, 0.70, 150),
+    Red('Meta Audience Network', 2.20, 0.50, 200),
+    Red('AppLovin', 2.00, 0.45, 180),
+    Red('Unity Ads', 1.60, 0.40, 220),
+)
+# (red, precio mínimo) de mayor a menor precio; el último nivel sin mínimo recoge el resto
+CASCADA = (
+    ('AdMob', 6.00), ('Meta Audience Network', 4.00), ('AdMob', 3.00),
+    ('AppLovin', 2.00), ('Meta Audience Network', 1.50), ('AdMob', 0.0),
+)
+PRECIO_MINIMO_SUBASTA = 0.0
+TIEMPO_LIMITE_MS = 1_000
+
+
+class ResultadoMediacion(NamedTuple):
+    solicitudes: int
+    servidas: int
+    ingresos: float  # USD por todas las solicitudes
+    ganadas: np.ndarray  # impresiones por red (orden de ``redes``)
+    latencias: np.ndarray  # histograma de latencia añadida, 1 ms por bin
+
+    @property
+    def fill_rate(self):
+        return self.servidas / self.solicitudes
+
+    @property
+    def ecpm(self):
+        """Ingreso por mil impresiones servidas."""
+        return self.ingresos / self.servidas * 1000 if self.servidas else 0.0
+
+    @property
+    def ingreso_por_mil(self):
+        """Ingreso por mil solicitudes (eCPM efectivo de la solicitud)."""
+        return self.ingresos / self.solicitudes * 1000
+
+    @property
+    def latencia_media_ms(self):
+        return float(self.latencias @ np.arange(len(self.latencias)) / self.solicitudes)
+
+    def latencia_percentil_ms(self, q):
+        return int(np.searchsorted(np.cumsum(self.latencias), q / 100 * self.solicitudes))
+
+
+def _respuestas(rng, redes, n):
+    # Matrices solicitudes × redes: tiene anuncio, puja (eCPM) y latencia
+    redes = list(redes)
+    media = np.array([r.ecpm for r in redes])
+    sigma = np.array([r.dispersion for r in redes])
+    # Log-normal con la media indicada: mu = log(media) - sigma² / 2
+    pujas = np.exp(rng.standard_normal((n, len(redes))) * sigma + np.log(media) - sigma ** 2 / 2)
+    tiene = rng.random((n, len(redes))) < np.array([r.fill for r in redes])
+    latencia = rng.exponential(np.array([r.latencia_ms for r in redes]), (n, len(redes)))
+    return tiene, pujas, latencia
+
+
+def _cascada(tiene, pujas, latencia, minimos):
+    # Columnas en orden de nivel: gana el primero que acepta y cobra su puja (>= su mínimo)
+    acepta = tiene & (pujas >= minimos)
+    servida = acepta.any(axis=1)
+    primero = np.where(servida, acepta.argmax(axis=1), len(minimos) - 1)
+    filas = np.arange(len(tiene))
+    latencia_total = np.cumsum(latencia, axis=1)[filas, primero]
+    return servida, primero, np.where(servida, pujas[filas, primero], 0.0), latencia_total
+
+
+def _subasta(tiene, pujas, latencia, minimo, tiempo_limite):
+    validas = tiene & (latencia <= tiempo_limite) & (pujas >= minimo)
+    ofertas = np.where(validas, pujas, -np.inf)
+    ganadora = ofertas.argmax(axis=1)
+    servida = validas.any(axis=1)
+    precio = np.where(servida, ofertas[np.arange(len(tiene)), ganadora], 0.0)
+    return servida, ganadora, precio, np.minimum(latencia.max(axis=1), tiempo_limite)
+
+
+def _simular_lote(tarea):
+    semilla, n, modo, redes, cascada, minimo, tiempo_limite = tarea
+    rng = np.random.default_rng(semilla)
+    if modo == 'cascada':
+        indice = {r.nombre: i for i, r in enumerate(redes)}
+        niveles = [indice[nombre] for nombre, _ in cascada]
+        # Una respuesta por red, repetida en cada nivel en que aparece
+        tiene, pujas, latencia = _respuestas(rng, redes, n)
+        servida, nivel, precio, lat = _cascada(tiene[:, niveles], pujas[:, niveles], latencia[:, niveles],
+                                               np.array([m for _, m in cascada]))
+        red = np.asarray(niveles)[nivel]
+    else:
+        tiene, pujas, latencia = _respuestas(rng, redes, n)
+        servida, red, precio, lat = _subasta(tiene, pujas, latencia, minimo, tiempo_limite)
+    ganadas = np.bincount(red[servida], minlength=len(redes))
+    latencias = np.bincount(np.minimum(lat, MAX_LATENCIA_MS).astype(np.intp), minlength=MAX_LATENCIA_MS + 1)
+    return int(servida.sum()), float(precio.sum() / 1000), ganadas, latencias
+
+
+def simular_mediacion(modo, redes=REDES, cascada=CASCADA, solicitudes=2_000_000, semilla=None,
+                      precio_minimo=PRECIO_MINIMO_SUBASTA, tiempo_limite_ms=TIEMPO_LIMITE_MS,
+                      tamano_lote=TAMANO_LOTE, procesos=None):
+    """Pasa ``solicitudes`` por la cascada o la subasta (``modo``) en lotes con ``lote.repartir``."""
+    if modo not in MODOS:
+        raise ValueError(f'modo de mediación desconocido {modo!r}; use uno de {MODOS}')
+    resultados = repartir(_simular_lote, solicitudes, tamano_lote, semilla, procesos,
+                          (modo, tuple(redes), tuple(cascada), precio_minimo, tiempo_limite_ms))
+    return ResultadoMediacion(
+        solicitudes=solicitudes,
+        servidas=sum(r[0] for r in resultados),
+        ingresos=sum(r[1] for r in resultados),
+        ganadas=np.sum([r[2] for r in resultados], axis=0),
+        latencias=np.sum([r[3] for r in resultados], axis=0),
+    )
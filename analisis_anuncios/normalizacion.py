@@ -0,0 +1,123 @@
+"""Normalización única de los valores numéricos escritos como texto.
+
+Las tablas de datos guardan dinero, porcentajes y conteos como cadenas
+(``'$2.50'``, ``'2.5%'``, ``'1,500'``) y rangos como ``'$0.50 - $10.00'``.
+``normalizar`` las convierte una sola vez en arrays ``float64`` de mínimos y
+máximos más un código de tipo por celda; las celdas no numéricas quedan como
+texto (código ``TEXTO``, NaN en los arrays).
+"""
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+TEXTO, MONEDA, PORCENTAJE, CONTEO = 0, 1, 2, 3
+NOMBRES_TIPO = {MONEDA: 'moneda', PORCENTAJE: 'porcentaje', CONTEO: 'conteo'}
+
+_NUMERO = re.compile(r'^(\$?)(\d[\d,]*(?:\.\d+)?|\.\d+)(%?)$')
+
+
+def parsear(valor):
+    """Devuelve ``(tipo, minimo, maximo)`` o ``None`` si el valor no es numérico.
+
+    Los porcentajes se expresan como fracción (``'2.5%'`` → 0.025) y un valor
+    simple tiene ``minimo == maximo``.
+    """
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return CONTEO, float(valor), float(valor)
+    if not isinstance(valor, str):
+        return None
+
+    partes = [_parsear_numero(p) for p in valor.split(' - ')]
+    if len(partes) > 2 or None in partes or len({tipo for tipo, _ in partes}) > 1:
+        return None
+    return partes[0][0], partes[0][1], partes[-1][1]
+
+
+def _parsear_numero(texto):
+    m = _NUMERO.match(texto.strip())
+    if not m or (m.group(1) and m.group(3)):
+        return None
+    numero = float(m.group(2).replace(',', ''))
+    if m.group(1):
+        return MONEDA, numero
+    if m.group(3):
+        return PORCENTAJE, numero / 100
+    return CONTEO, numero
+
+
+def formatear(tipo, minimo, maximo=None):
+    """Inverso de ``parsear``: texto con el mismo estilo que los datos de origen."""
+    def numero(valor):
+        if tipo == MONEDA:
+            return f'${valor:,.2f}'
+        if tipo == PORCENTAJE:
+            return f'{valor * 100:.1f}%'
+        return f'{valor:,.0f}'
+
+    if maximo is None or maximo == minimo:
+        return numero(minimo)
+    return f'{numero(minimo)} - {numero(maximo)}'
+
+
+class TablaNumerica(NamedTuple):
+    textos: list
+    tipo: np.ndarray
+    minimo: np.ndarray
+    maximo: np.ndarray
+
+    def indice(self, etiqueta):
+        """Fila cuya primera columna es ``etiqueta``."""
+        for i, fila in enumerate(self.textos):
+            if fila[0] == etiqueta:
+                return i
+        raise KeyError(etiqueta)
+
+    def valor(self, etiqueta, col):
+        return self.minimo[self.indice(etiqueta), col]
+
+    def rango(self, etiqueta, col):
+        i = self.indice(etiqueta)
+        return self.minimo[i, col], self.maximo[i, col]
+
+    def con_valor(self, etiqueta, col, tipo, minimo, maximo=None):
+        """Copia de la tabla con la celda reemplazada por un valor (o rango) numérico."""
+        maximo = minimo if maximo is None else maximo
+        i = self.indice(etiqueta)
+        textos = [list(fila) for fila in self.textos]
+        textos[i][col] = formatear(tipo, minimo, maximo)
+        tipos, minimos, maximos = self.tipo.copy(), self.minimo.copy(), self.maximo.copy()
+        tipos[i, col], minimos[i, col], maximos[i, col] = tipo, minimo, maximo
+        return TablaNumerica(textos, tipos, minimos, maximos)
+
+    def celdas(self):
+        """Filas listas para escribir: número en los valores simples, texto en el resto."""
+        simples = (self.tipo != TEXTO) & (self.minimo == self.maximo)
+        return [
+            [float(self.minimo[i, j]) if simples[i, j] else valor for j, valor in enumerate(fila)]
+            for i, fila in enumerate(self.textos)
+        ]
+
+    def tipos_celdas(self):
+        """Nombre del tipo de cada celda numérica simple (``None`` en texto y rangos)."""
+        simples = (self.tipo != TEXTO) & (self.minimo == self.maximo)
+        return [
+            [NOMBRES_TIPO[int(t)] if s else None for t, s in zip(fila_tipo, fila_simple)]
+            for fila_tipo, fila_simple in zip(self.tipo, simples)
+        ]
+
+
+def normalizar(filas):
+    """Parsea una tabla rectangular de una vez."""
+    forma = (len(filas), max((len(f) for f in filas), default=0))
+    tipo = np.zeros(forma, dtype=np.int8)
+    minimo = np.full(forma, np.nan)
+    maximo = np.full(forma, np.nan)
+    for i, fila in enumerate(filas):
+        for j, valor in enumerate(fila):
+            parseado = parsear(valor)
+            if parseado:
+                tipo[i, j], minimo[i, j], maximo[i, j] = parseado
+    return TablaNumerica([list(f) for f in filas], tipo, minimo, maximo)
@@ -0,0 +1,185 @@
+"""Optimización de la mezcla de anuncios: qué ubicaciones activar y con qué tipo.
+
+Cada ubicación candidata puede quedar desactivada o activarse con uno de sus
+tipos compatibles. Una configuración es una elección por ubicación; su ingreso
+es la suma de los ingresos de las ubicaciones activas multiplicada por la
+retención que conservan (cada ubicación activa cuesta una fracción de usuarios
+proporcional a su nivel de invasión).
+
+Restricciones: nivel de invasión máximo por ubicación y número máximo de
+anuncios visibles a la vez (banners y nativos; los de pantalla completa no
+cuentan). Las ubicaciones que superan el nivel máximo se podan antes de buscar.
+
+La búsqueda es exacta pero no enumera las configuraciones (crecen como el
+producto de las opciones de cada ubicación): una ramificación y poda en
+profundidad descarta cada rama cuyo ingreso máximo posible no supera a la
+mejor configuración encontrada. La cota es el ingreso acumulado más el mayor
+ingreso que pueden sumar las ubicaciones restantes con la invasividad y los
+anuncios visibles que quedan libres (una mochila resuelta de antemano para
+cada profundidad), todo con la retención ya perdida, que solo puede bajar.
+La frontera ingreso–invasividad se obtiene resolviendo el óptimo con
+invasividad total acotada para cada cota creciente; cada resolución parte de
+la anterior como mejor conocida. En el peor caso la búsqueda sigue siendo
+exponencial: si supera ``MAX_NODOS`` nodos se detiene con un ``ValueError``.
+"""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.escenarios import NIVELES_INVASION
+
+# Fracción de usuarios que se pierde por cada nivel de invasión de una ubicación activa
+PENALIZACION = 0.01
+# Mejora relativa mínima para añadir un punto a la frontera (ingresos iguales sumados en otro orden)
+TOLERANCIA = 1e-12
+# Nodos de la búsqueda antes de rendirse (unos segundos); con las ubicaciones del libro bastan unos cientos
+MAX_NODOS = 5_000_000
+
+
+class Candidata(NamedTuple):
+    ubicacion: str
+    invasion: int  # índice en NIVELES_INVASION
+    visible: bool  # permanece en pantalla junto a otros anuncios
+    tipos: tuple  # tipos de anuncio compatibles
+    ingresos: tuple  # ingreso diario por usuario de cada tipo en esta ubicación
+
+
+class Restricciones(NamedTuple):
+    max_invasion: int = NIVELES_INVASION.index('Media')
+    max_visibles: int = 3
+    penalizacion: float = PENALIZACION
+
+
+class Configuraciones(NamedTuple):
+    """Configuraciones de la frontera ingreso–invasividad, de menor a mayor invasividad.
+
+    ``eleccion`` vale -1 si la ubicación está desactivada.
+    """
+    eleccion: np.ndarray  # configuraciones × ubicaciones
+    ingreso: np.ndarray  # ingreso diario por usuario tras la penalización de retención
+    retencion: np.ndarray  # fracción de usuarios conservada
+    invasividad: np.ndarray  # suma de niveles de invasión de las ubicaciones activas
+    visibles: np.ndarray
+    evaluadas: int  # nodos del árbol de búsqueda visitados
+    posibles: int  # configuraciones que habría que enumerar sin poda
+
+    def optima(self):
+        """Índice de la configuración de mayor ingreso (la menos invasiva si hay empate)."""
+        return int(np.lexsort((self.invasividad, -self.ingreso))[0])
+
+    def pareto(self):
+        """Índices de la frontera ingreso–invasividad, de menor a mayor invasividad."""
+        orden = np.lexsort((-self.ingreso, self.invasividad))
+        ingreso = self.ingreso[orden]
+        # Una configuración está en la frontera si supera a todas las menos invasivas
+        previo = np.maximum.accumulate(np.concatenate(([-np.inf], ingreso[:-1])))
+        return orden[ingreso > previo]
+
+
+def _contribuciones(candidatas, restricciones):
+    # Por ubicación, una entrada por opción: desactivada (0) y cada tipo (1..)
+    tablas = []
+    for c in candidatas:
+        podada = c.invasion > restricciones.max_invasion
+        tipos = 0 if podada else len(c.tipos)
+        activa = np.arange(tipos + 1) > 0
+        tablas.append((
+            np.concatenate(([0.0], np.asarray(c.ingresos[:tipos], dtype=np.float64))),
+            np.where(activa, np.log1p(-min(restricciones.penalizacion * c.invasion, 1 - 1e-12)), 0.0),
+            activa * c.invasion,
+            activa * int(c.visible),
+        ))
+    return tablas
+
+
+class _Busqueda:
+    """Ramificación y poda del óptimo con invasividad total acotada."""
+
+    def __init__(self, tablas, max_visibles, max_nodos=MAX_NODOS):
+        # Primero las ubicaciones que más pueden aportar y, en cada una, las opciones de mayor ingreso:
+        # así se encuentran pronto configuraciones buenas que podan el resto
+        self.orden = sorted(range(len(tablas)), key=lambda j: -tablas[j][0].max())
+        self.opciones = [
+            sorted(zip(*(t.tolist() for t in tablas[j]), range(len(tablas[j][0]))), key=lambda o: -o[0])
+            for j in self.orden
+        ]
+        self.max_visibles = min(max_visibles, sum(int(tablas[j][3].max()) for j in self.orden))
+        self.nodos = 0
+        self.max_nodos = max_nodos
+        self.mejor = None
+        # cota[d][i][v]: mayor ingreso bruto que pueden sumar las ubicaciones desde la profundidad d
+        # con i niveles de invasión y v anuncios visibles libres (mochila de elección múltiple exacta)
+        invasion = int(sum(t[2].max() for t in tablas))
+        cota = np.zeros((invasion + 1, self.max_visibles + 1))
+        cotas = [cota]
+        for opciones in reversed(self.opciones):
+            siguiente = np.full_like(cota, -np.inf)
+            for ingreso, _, inv, vis, _ in opciones:
+                if vis <= self.max_visibles:
+                    np.maximum(siguiente[inv:, vis:], cota[:invasion + 1 - inv, :self.max_visibles + 1 - vis] + ingreso,
+                               out=siguiente[inv:, vis:])
+            cota = siguiente
+            cotas.append(cota)
+        self.cota = [c.tolist() for c in reversed(cotas)]
+
+    def resolver(self, presupuesto):
+        """Mejor ``(ingreso, retención, invasividad, visibles, elección)`` con invasividad ≤ ``presupuesto``.
+
+        La mejor configuración de la resolución anterior (cota menor) sigue siendo
+        factible y se conserva como punto de partida.
+        """
+        self._explorar(0, [], 0.0, 0.0, 0, 0, presupuesto)
+        return self.mejor
+
+    def _explorar(self, d, eleccion, bruto, log_retencion, invasividad, visibles, presupuesto):
+        self.nodos += 1
+        if self.nodos > self.max_nodos:
+            raise ValueError(f'optimizacion: la búsqueda superó {self.max_nodos:,} nodos con '
+                             f'{len(self.opciones)} ubicaciones; reduzca las candidatas o max_invasion')
+        retencion = math.exp(log_retencion)
+        if d == len(self.opciones):
+            ingreso = bruto * retencion
+            if self.mejor is None or ingreso > self.mejor[0]:
+                self.mejor = (ingreso, retencion, invasividad, visibles, tuple(eleccion))
+            return
+        # La retención solo puede bajar: ninguna configuración de esta rama supera esta cota
+        resto = self.cota[d][presupuesto - invasividad][self.max_visibles - visibles]
+        if self.mejor is not None and (bruto + resto) * retencion <= self.mejor[0]:
+            return
+        for ingreso, log_r, inv, vis, opcion in self.opciones[d]:
+            if invasividad + inv > presupuesto or visibles + vis > self.max_visibles:
+                continue
+            eleccion.append(opcion)
+            self._explorar(d + 1, eleccion, bruto + ingreso, log_retencion + log_r,
+                           invasividad + inv, visibles + vis, presupuesto)
+            eleccion.pop()
+
+
+def optimizar(candidatas, restricciones=Restricciones(), max_nodos=MAX_NODOS):
+    """Frontera ingreso–invasividad (y con ella el óptimo) de las configuraciones factibles."""
+    tablas = _contribuciones(candidatas, restricciones)
+    busqueda = _Busqueda(tablas, restricciones.max_visibles, max_nodos)
+    frontera = []
+    for presupuesto in range(len(busqueda.cota[0])):
+        ingreso, retencion, invasividad, visibles, eleccion = busqueda.resolver(presupuesto)
+        if not frontera or ingreso > frontera[-1][0] * (1 + TOLERANCIA):
+            frontera.append((ingreso, retencion, invasividad, visibles, eleccion))
+
+    # Elección en el orden de ``candidatas``: -1 desactivada, i para el tipo i
+    posiciones = np.argsort(busqueda.orden)
+    eleccion = np.array([f[4] for f in frontera], dtype=np.int64).reshape(len(frontera), -1)[:, posiciones] - 1
+    return Configuraciones(
+        eleccion=eleccion,
+        ingreso=np.array([f[0] for f in frontera]),
+        retencion=np.array([f[1] for f in frontera]),
+        invasividad=np.array([f[2] for f in frontera], dtype=np.int64),
+        visibles=np.array([f[3] for f in frontera], dtype=np.int64),
+        evaluadas=busqueda.nodos,
+        posibles=int(np.prod([len(t[0]) for t in tablas])),
+    )
+
+
+def describir(candidatas, eleccion):
+    """Ubicaciones activas de una configuración como ``[(ubicacion, tipo), ...]``."""
+    return [(c.ubicacion, c.tipos[e]) for c, e in zip(candidatas, eleccion) if e >= 0]
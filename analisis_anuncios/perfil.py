@@ -0,0 +1,53 @@
+"""Medición por fases de la generación: tiempo, memoria pico y tamaño de salida."""
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def rss_pico_mb(hijos=False):
+    """Memoria residente máxima del proceso (o de sus hijos) en MB; None si no se puede medir."""
+    if resource is None:
+        return None
+    uso = resource.getrusage(resource.RUSAGE_CHILDREN if hijos else resource.RUSAGE_SELF)
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return round(uso.ru_maxrss / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+class Perfil:
+    """Acumula por fase los segundos y la memoria pico.
+
+    ``rss_pico_mb`` es el máximo del proceso hasta el final de la fase (crece de
+    forma monótona); si ``tracemalloc`` está activo se añade además el pico de
+    memoria de Python dentro de la fase.
+    """
+
+    def __init__(self):
+        self.fases = {}
+
+    @contextmanager
+    def fase(self, nombre):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            registro = self.fases.setdefault(nombre, {'segundos': 0.0})
+            registro['segundos'] = round(registro['segundos'] + time.perf_counter() - inicio, 4)
+            registro['rss_pico_mb'] = rss_pico_mb()
+            if tracemalloc.is_tracing():
+                pico = tracemalloc.get_traced_memory()[1] / 2**20
+                registro['python_pico_mb'] = round(max(registro.get('python_pico_mb', 0), pico), 1)
+
+
+class SinPerfil:
+    """Misma interfaz que ``Perfil`` sin medir nada."""
+
+    def fase(self, nombre):
+        return nullcontext()
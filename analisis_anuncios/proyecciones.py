@@ -0,0 +1,71 @@
+"""Motor vectorizado de proyecciones de ingresos por anuncios."""
+from typing import NamedTuple
+
+import numpy as np
+
+DIAS_MES = 30
+
+# Los escenarios bajo/alto de la hoja son múltiplos fijos del ingreso mensual
+FACTOR_BAJO = 2 / 3
+FACTOR_ALTO = 2.0
+
+
+class Proyeccion(NamedTuple):
+    """Columnas de la hoja "Proyecciones de Ingresos", una fila por combinación."""
+    usuarios: np.ndarray
+    impresiones: np.ndarray
+    cpm: np.ndarray
+    ingresos_diarios: np.ndarray
+    ingresos_mensuales: np.ndarray
+    escenario_bajo: np.ndarray
+    escenario_alto: np.ndarray
+
+
+def proyectar_ingresos(usuarios, impresiones_por_usuario, cpm, fill_rate=1.0,
+                       dias_mes=DIAS_MES, factor_bajo=FACTOR_BAJO, factor_alto=FACTOR_ALTO):
+    """Calcula todas las columnas de la proyección con operaciones sobre arrays.
+
+    Los argumentos pueden ser escalares o vectores compatibles por broadcasting;
+    cada posición del resultado es una combinación independiente.
+    """
+    usuarios, impresiones_por_usuario, cpm, fill_rate = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (usuarios, impresiones_por_usuario, cpm, fill_rate))
+    )
+    impresiones = usuarios * impresiones_por_usuario * fill_rate
+    ingresos_diarios = impresiones * cpm / 1000
+    ingresos_mensuales = ingresos_diarios * dias_mes
+    return Proyeccion(
+        usuarios=usuarios,
+        impresiones=impresiones,
+        cpm=cpm,
+        ingresos_diarios=ingresos_diarios,
+        ingresos_mensuales=ingresos_mensuales,
+        escenario_bajo=ingresos_mensuales * factor_bajo,
+        escenario_alto=ingresos_mensuales * factor_alto,
+    )
+
+
+def rejilla_escenarios(usuarios, impresiones_por_usuario, cpm, fill_rate):
+    """Producto cartesiano de los vectores de entrada, aplanado a 1-D.
+
+    Devuelve cuatro arrays de igual longitud listos para ``proyectar_ingresos``;
+    por ejemplo 50 × 20 × 20 × 5 entradas producen 100.000 combinaciones.
+    """
+    ejes = [np.asarray(v, dtype=np.float64).ravel() for v in (usuarios, impresiones_por_usuario, cpm, fill_rate)]
+    return tuple(m.ravel() for m in np.meshgrid(*ejes, indexing='ij'))
+
+
+def proyectar_rejilla_por_bloques(usuarios, impresiones_por_usuario, cpm, fill_rate, tamano_bloque=65_536, **kwargs):
+    """Como ``proyectar_ingresos(*rejilla_escenarios(...))`` pero por bloques.
+
+    Genera tuplas ``(entradas, proyeccion)`` donde ``entradas`` son los cuatro
+    vectores de entrada del bloque. Nunca materializa la rejilla completa: cada bloque de índices planos se
+    desenrolla sobre los ejes, así que la memoria depende de ``tamano_bloque``.
+    """
+    ejes = [np.asarray(v, dtype=np.float64).ravel() for v in (usuarios, impresiones_por_usuario, cpm, fill_rate)]
+    forma = tuple(len(e) for e in ejes)
+    total = int(np.prod(forma))
+    for inicio in range(0, total, tamano_bloque):
+        indices = np.unravel_index(np.arange(inicio, min(inicio + tamano_bloque, total)), forma)
+        entradas = tuple(eje[i] for eje, i in zip(ejes, indices))
+        yield entradas, proyectar_ingresos(*entradas, **kwargs)
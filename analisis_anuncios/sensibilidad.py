@@ -0,0 +1,122 @@
+"""Análisis de sensibilidad de los ingresos proyectados a cada supuesto.
+
+El modelo es el de "Proyecciones de Ingresos" (``proyectar_ingresos``) con
+crecimiento mensual compuesto de los usuarios, sumado sobre ``meses``. Se
+perturban los parámetros de ``PARAMETROS`` de dos formas:
+
+- Uno a uno (tornado): cada parámetro en su mínimo y su máximo con los demás
+  en el valor base.
+- Global (Sobol): matrices de Saltelli ``A``, ``B`` y ``AB_i`` muestreadas
+  uniformemente en los rangos; índices de primer orden y totales con los
+  estimadores de Saltelli (2010) y Jansen.
+
+Todas las evaluaciones se apilan en una matriz y se reparten por bloques entre
+procesos. ``f(A)``, ``f(B)`` y el valor base se evalúan una sola vez y se
+reutilizan en los índices de todos los parámetros.
+"""
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.lote import mapear
+from analisis_anuncios.proyecciones import proyectar_ingresos
+
+PARAMETROS = ('cpm', 'fill_rate', 'impresiones_por_usuario', 'usuarios', 'crecimiento')
+MESES = 12
+MUESTRAS = 4096
+TAMANO_BLOQUE = 65_536
+
+
+class Parametro(NamedTuple):
+    nombre: str
+    minimo: float
+    base: float
+    maximo: float
+
+
+class Sensibilidad(NamedTuple):
+    parametros: tuple  # ``Parametro`` en el orden de ``PARAMETROS``
+    base: float  # ingreso con todos los parámetros en su valor base
+    bajo: np.ndarray  # ingreso con cada parámetro en su mínimo
+    alto: np.ndarray  # ingreso con cada parámetro en su máximo
+    primer_orden: np.ndarray  # índice de Sobol S1 de cada parámetro
+    total: np.ndarray  # índice de Sobol ST de cada parámetro
+    muestras: int
+
+    def orden(self):
+        """Índices de parámetros de mayor a menor oscilación uno a uno (orden del tornado)."""
+        return np.argsort(-np.abs(self.alto - self.bajo), kind='stable')
+
+
+def ingresos(matriz, meses=MESES):
+    """Ingresos acumulados en ``meses`` para cada fila (columnas en el orden de ``PARAMETROS``)."""
+    cpm, fill_rate, impresiones, usuarios, crecimiento = np.asarray(matriz, dtype=np.float64).T
+    mensual = proyectar_ingresos(usuarios, impresiones, cpm, fill_rate).ingresos_mensuales
+    # Serie geométrica Σ (1 + g)^m para m = 0 … meses − 1 (límite ``meses`` cuando g → 0)
+    sin_crecimiento = np.abs(crecimiento) < 1e-12
+    g = np.where(sin_crecimiento, 1.0, crecimiento)
+    acumulado = np.where(sin_crecimiento, meses, ((1 + g) ** meses - 1) / g)
+    return mensual * acumulado
+
+
+def _evaluar(tarea):
+    matriz, meses = tarea
+    return ingresos(matriz, meses)
+
+
+def evaluar(matriz, meses=MESES, procesos=None, tamano_bloque=TAMANO_BLOQUE):
+    """``ingresos`` por bloques de filas, en paralelo si hay más de un bloque.
+
+    Una matriz de hasta ``tamano_bloque`` filas se evalúa en línea: arrancar
+    procesos cuesta más que el cálculo. Si no, hay al menos un bloque por
+    proceso (y ninguno de más de ``tamano_bloque`` filas).
+    """
+    if len(matriz) <= tamano_bloque:
+        return ingresos(matriz, meses)
+    procesos = procesos or os.cpu_count() or 1
+    bloques = max(-(-len(matriz) // tamano_bloque), procesos)
+    tareas = [(parte, meses) for parte in np.array_split(matriz, bloques)]
+    return np.concatenate(mapear(_evaluar, tareas, procesos))
+
+
+def analizar(parametros, meses=MESES, muestras=MUESTRAS, semilla=None, procesos=None,
+             tamano_bloque=TAMANO_BLOQUE):
+    """Tornado uno a uno e índices de Sobol de ``parametros`` (orden de ``PARAMETROS``)."""
+    parametros = tuple(parametros)
+    k = len(parametros)
+    minimo = np.array([p.minimo for p in parametros])
+    maximo = np.array([p.maximo for p in parametros])
+    base = np.array([p.base for p in parametros])
+
+    # Uno a uno: fila 0 = base, luego mínimos y máximos
+    extremos = np.repeat(base[None, :], 2 * k + 1, axis=0)
+    extremos[1 + np.arange(k), np.arange(k)] = minimo
+    extremos[1 + k + np.arange(k), np.arange(k)] = maximo
+
+    # Saltelli: A, B y AB_i (A con la columna i de B)
+    rng = np.random.default_rng(semilla)
+    a = minimo + (maximo - minimo) * rng.random((muestras, k))
+    b = minimo + (maximo - minimo) * rng.random((muestras, k))
+    ab = np.repeat(a[None], k, axis=0)
+    ab[np.arange(k), :, np.arange(k)] = b[:, np.arange(k)].T
+
+    valores = evaluar(np.vstack([extremos, a, b, ab.reshape(-1, k)]), meses, procesos, tamano_bloque)
+    f_extremos, f_a, f_b, f_ab = np.split(valores, np.cumsum([2 * k + 1, muestras, muestras]))
+    f_ab = f_ab.reshape(k, muestras)
+
+    varianza = np.var(np.concatenate([f_a, f_b]))
+    if varianza > 0:
+        primer_orden = np.mean(f_b * (f_ab - f_a), axis=1) / varianza
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / varianza
+    else:
+        primer_orden = total = np.zeros(k)
+    return Sensibilidad(
+        parametros=parametros,
+        base=float(f_extremos[0]),
+        bajo=f_extremos[1:k + 1],
+        alto=f_extremos[k + 1:],
+        primer_orden=primer_orden,
+        total=total,
+        muestras=muestras,
+    )
@@ -0,0 +1,147 @@
+"""Servidor local que imita la API de informes (ver ``analisis_anuncios.informes``).
+
+Genera KPIs diarios deterministas por app y fecha, pagina las respuestas y
+puede simular fallos (503 aleatorios) y límites de ritmo (429 con
+``Retry-After``) para probar el cliente sin red:
+
+    python -m analisis_anuncios.servidor_informes --puerto 8765 --tasa-errores 0.1
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import deque
+from datetime import date, timedelta
+from urllib.parse import parse_qs, unquote, urlsplit
+
+POR_PAGINA = 7
+LANZAMIENTO = '2025-01-01'
+
+
+def kpis_dia(app, fecha, lanzamiento=LANZAMIENTO):
+    """Fila de KPIs sintética y determinista de ``app`` en ``fecha`` (ISO)."""
+    rng = random.Random(hashlib.sha256(f'{app}/{fecha}'.encode()).digest())
+    dias = max((date.fromisoformat(fecha) - date.fromisoformat(lanzamiento)).days, 0)
+    usuarios = int(100 * 1.01 ** dias * rng.uniform(0.9, 1.1))
+    solicitudes = int(usuarios * rng.uniform(3.0, 4.0))
+    impresiones = int(solicitudes * rng.uniform(0.78, 0.92))
+    nuevos = int(usuarios * rng.uniform(0.15, 0.25))
+    return {
+        'fecha': fecha,
+        'solicitudes': solicitudes,
+        'impresiones': impresiones,
+        'clics': int(impresiones * rng.uniform(0.015, 0.035)),
+        'ingresos': round(impresiones * rng.uniform(1.8, 3.2) / 1000, 4),
+        'usuarios_activos': usuarios,
+        'usuarios_nuevos': nuevos,
+        'retenidos_d1': int(nuevos * rng.uniform(0.5, 0.7)),
+        'segundos_en_app': int(usuarios * rng.uniform(180, 420)),
+    }
+
+
+class ServidorInformes:
+    """Estado del servidor: errores simulados, ritmo permitido y peticiones atendidas."""
+
+    def __init__(self, por_pagina=POR_PAGINA, tasa_errores=0.0, limite_por_segundo=None, token=None,
+                 lanzamiento=LANZAMIENTO, semilla=None):
+        self.por_pagina = por_pagina
+        self.tasa_errores = tasa_errores
+        self.limite_por_segundo = limite_por_segundo
+        self.token = token
+        self.lanzamiento = lanzamiento
+        self.atendidas = 0
+        self._rng = random.Random(semilla)
+        self._recientes = deque()
+
+    def responder(self, ruta, cabeceras):
+        """``(estado, cabeceras extra, cuerpo JSON)`` para una petición GET."""
+        self.atendidas += 1
+        ahora = asyncio.get_running_loop().time()
+        if self.limite_por_segundo:
+            while self._recientes and ahora - self._recientes[0] > 1:
+                self._recientes.popleft()
+            if len(self._recientes) >= self.limite_por_segundo:
+                return 429, {'Retry-After': '0.2'}, {'error': 'demasiadas peticiones'}
+            self._recientes.append(ahora)
+        if self.token and cabeceras.get('authorization') != f'Bearer {self.token}':
+            return 401, {}, {'error': 'token inválido'}
+        if self._rng.random() < self.tasa_errores:
+            return 503, {}, {'error': 'no disponible'}
+
+        partes = urlsplit(ruta)
+        segmentos = partes.path.strip('/').split('/')
+        if len(segmentos) != 4 or segmentos[:2] != ['v1', 'apps'] or segmentos[3] != 'kpis':
+            return 404, {}, {'error': f'ruta desconocida {partes.path}'}
+        consulta = {k: v[0] for k, v in parse_qs(partes.query).items()}
+        try:
+            desde, hasta = date.fromisoformat(consulta['desde']), date.fromisoformat(consulta['hasta'])
+            inicio = int(consulta.get('pagina', 0))
+        except (KeyError, ValueError) as error:
+            return 400, {}, {'error': f'parámetros inválidos: {error}'}
+        total = (hasta - desde).days + 1
+        fin = min(inicio + self.por_pagina, total)
+        filas = [kpis_dia(unquote(segmentos[2]), (desde + timedelta(days=d)).isoformat(), self.lanzamiento)
+                 for d in range(inicio, fin)]
+        return 200, {}, {'filas': filas, 'siguiente': str(fin) if fin < total else None}
+
+    async def atender(self, lector, escritor):
+        # Conexión persistente: varias peticiones seguidas hasta que el cliente cierre
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                _, ruta, _ = linea.decode('latin-1').split(' ', 2)
+                cabeceras = {}
+                while True:
+                    cabecera = (await lector.readline()).decode('latin-1').strip()
+                    if not cabecera:
+                        break
+                    nombre, _, valor = cabecera.partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                estado, extra, datos = self.responder(ruta, cabeceras)
+                cuerpo = json.dumps(datos, ensure_ascii=False).encode()
+                respuesta = [f'HTTP/1.1 {estado} {"OK" if estado == 200 else "Error"}',
+                             'Content-Type: application/json', f'Content-Length: {len(cuerpo)}',
+                             *(f'{k}: {v}' for k, v in extra.items())]
+                escritor.write(('\r\n'.join(respuesta) + '\r\n\r\n').encode() + cuerpo)
+                await escritor.drain()
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            # Cliente desconectado o servidor cerrándose con la conexión en espera
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, host='127.0.0.1', puerto=0):
+        """Arranca el servidor; devuelve el ``asyncio.Server`` (puerto 0 = uno libre)."""
+        return await asyncio.start_server(self.atender, host, puerto)
+
+
+async def _servir(args):
+    servidor = ServidorInformes(por_pagina=args.por_pagina, tasa_errores=args.tasa_errores,
+                                limite_por_segundo=args.limite_por_segundo, token=args.token)
+    async with await servidor.iniciar(args.host, args.puerto) as server:
+        host, puerto = server.sockets[0].getsockname()[:2]
+        print(f'🛰️  API de informes simulada en http://{host}:{puerto} (Ctrl+C para salir)')
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor local que imita la API de informes de KPIs.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--por-pagina', type=int, default=POR_PAGINA)
+    parser.add_argument('--tasa-errores', type=float, default=0.0, help='fracción de respuestas 503')
+    parser.add_argument('--limite-por-segundo', type=int, help='responder 429 por encima de este ritmo')
+    parser.add_argument('--token', help='exigir este token Bearer')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    main()
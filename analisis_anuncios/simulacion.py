@@ -0,0 +1,103 @@
+"""Simulación Monte Carlo de ingresos con bandas de percentiles.
+
+Los ingresos mensuales son ``usuarios × impresiones × fill × CPM / 1000 × días``;
+como son lineales en usuarios e impresiones, basta con simular el factor
+aleatorio ``fill × CPM`` una vez y escalarlo para cada fila de la proyección.
+Los sorteos se acumulan en histogramas de bordes fijos, de modo que la memoria
+depende del tamaño de lote y no del número total de sorteos.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from analisis_anuncios.lote import repartir
+from analisis_anuncios.proyecciones import DIAS_MES
+
+PERCENTILES = (5, 50, 95)
+TAMANO_LOTE = 500_000
+NUM_BINS = 8192
+
+
+class Rango(NamedTuple):
+    """Estimación mínimo / valor típico / máximo de un parámetro."""
+    minimo: float
+    moda: float
+    maximo: float
+
+
+class Histograma(NamedTuple):
+    bordes: np.ndarray
+    conteos: np.ndarray
+
+    def percentiles(self, q):
+        """Percentiles interpolados linealmente dentro de cada bin."""
+        acumulado = np.concatenate(([0], np.cumsum(self.conteos)))
+        return np.interp(np.asarray(q, dtype=np.float64) / 100 * acumulado[-1], acumulado, self.bordes)
+
+
+class Distribucion(NamedTuple):
+    """Resultado de la simulación: ingreso por mil solicitudes y clics por solicitud."""
+    sorteos: int
+    ingreso_por_mil: Histograma
+    clics_por_solicitud: Histograma
+
+
+def _pert(rng, rango, n):
+    # Beta-PERT: concentra los sorteos alrededor del valor típico
+    ancho = rango.maximo - rango.minimo
+    if ancho <= 0:
+        return np.full(n, rango.moda)
+    alfa = 1 + 4 * (rango.moda - rango.minimo) / ancho
+    beta = 1 + 4 * (rango.maximo - rango.moda) / ancho
+    return rango.minimo + ancho * rng.beta(alfa, beta, n)
+
+
+def _contar(valores, bordes):
+    escala = (len(bordes) - 1) / (bordes[-1] - bordes[0])
+    indices = ((valores - bordes[0]) * escala).astype(np.intp)
+    np.clip(indices, 0, len(bordes) - 2, out=indices)
+    return np.bincount(indices, minlength=len(bordes) - 1)
+
+
+def _simular_lote(tarea):
+    semilla, n, cpm, fill_rate, ctr, bordes_ingreso, bordes_clics = tarea
+    rng = np.random.default_rng(semilla)
+    fill = _pert(rng, fill_rate, n)
+    ingreso = _pert(rng, cpm, n)
+    ingreso *= fill
+    clics = _pert(rng, ctr, n)
+    clics *= fill
+    return _contar(ingreso, bordes_ingreso), _contar(clics, bordes_clics)
+
+
+def simular(cpm, fill_rate, ctr, sorteos=2_000_000, semilla=None, tamano_lote=TAMANO_LOTE,
+            procesos=None, num_bins=NUM_BINS):
+    """Ejecuta ``sorteos`` sorteos en lotes vectorizados con ``lote.repartir``.
+
+    ``cpm``, ``fill_rate`` y ``ctr`` son ``Rango``.
+    """
+    bordes_ingreso = np.linspace(cpm.minimo * fill_rate.minimo, cpm.maximo * fill_rate.maximo, num_bins + 1)
+    bordes_clics = np.linspace(ctr.minimo * fill_rate.minimo, ctr.maximo * fill_rate.maximo, num_bins + 1)
+    resultados = repartir(_simular_lote, sorteos, tamano_lote, semilla, procesos,
+                          (cpm, fill_rate, ctr, bordes_ingreso, bordes_clics))
+
+    conteos_ingreso = np.sum([r[0] for r in resultados], axis=0)
+    conteos_clics = np.sum([r[1] for r in resultados], axis=0)
+    return Distribucion(
+        sorteos=sorteos,
+        ingreso_por_mil=Histograma(bordes_ingreso, conteos_ingreso),
+        clics_por_solicitud=Histograma(bordes_clics, conteos_clics),
+    )
+
+
+def bandas_ingresos(distribucion, usuarios, impresiones_por_usuario, percentiles=PERCENTILES, dias_mes=DIAS_MES):
+    """Ingresos mensuales por percentil: array de forma ``(len(percentiles), len(usuarios))``."""
+    solicitudes = np.asarray(usuarios, dtype=np.float64) * impresiones_por_usuario
+    factor = distribucion.ingreso_por_mil.percentiles(percentiles)
+    return np.outer(factor, solicitudes) * dias_mes / 1000
+
+
+def bandas_clics(distribucion, usuarios, impresiones_por_usuario, percentiles=PERCENTILES, dias_mes=DIAS_MES):
+    """Clics mensuales por percentil, con la misma forma que ``bandas_ingresos``."""
+    solicitudes = np.asarray(usuarios, dtype=np.float64) * impresiones_por_usuario
+    return np.outer(distribucion.clics_por_solicitud.percentiles(percentiles), solicitudes) * dias_mes
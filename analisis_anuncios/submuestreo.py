@@ -0,0 +1,84 @@
+"""Submuestreo de series largas antes de graficarlas.
+
+Un gráfico de Excel con decenas de miles de puntos tarda en abrirse y en
+redibujarse, y cada punto se repite en la caché del gráfico dentro del XML.
+Estas funciones eligen qué filas dibujar conservando la forma de la serie:
+
+- ``lttb``: Largest-Triangle-Three-Buckets (Steinarsson, 2013). Conserva el
+  primer y el último punto y, en cada cubo intermedio, el que forma el
+  triángulo de mayor área con el elegido en el cubo anterior y la media del
+  siguiente. Adecuado para líneas.
+- ``minmax``: el mínimo y el máximo de cada cubo, en su orden. Conserva los
+  picos y valles exactos (bandas, series con ruido).
+
+Ambas devuelven índices de fila crecientes, de modo que las categorías y los
+valores de varias series se toman de las mismas filas. Los NaN cuentan como 0
+al elegir los puntos.
+"""
+import numpy as np
+
+MAX_PUNTOS = 1_000
+
+
+def lttb(x, y, puntos):
+    """Índices de como mucho ``puntos`` filas de la serie ``(x, y)`` por LTTB."""
+    n = len(y)
+    if puntos >= n:
+        return np.arange(n)
+    if puntos < 3:
+        return np.array([0, n - 1])[:max(puntos, 1)]
+    x = np.nan_to_num(np.asarray(x, dtype=np.float64))
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    # ``puntos - 2`` cubos con las filas 1 … n − 2; el último punto hace de cubo siguiente del último
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+    largos = np.diff(bordes)
+    medias_x = np.append(np.add.reduceat(x[:n - 1], bordes[:-1]) / largos, x[-1])
+    medias_y = np.append(np.add.reduceat(y[:n - 1], bordes[:-1]) / largos, y[-1])
+
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        # Doble del área de cada triángulo (a, candidato, media del cubo siguiente)
+        area = np.abs((x[a] - medias_x[i + 1]) * (y[inicio:fin] - y[a])
+                      - (x[a] - x[inicio:fin]) * (medias_y[i + 1] - y[a]))
+        a = inicio + int(np.argmax(area))
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def minmax(y, puntos):
+    """Índices del primer y último punto y del mínimo y máximo de cada cubo (como mucho ``puntos``)."""
+    n = len(y)
+    if puntos >= n:
+        return np.arange(n)
+    if puntos < 4:
+        # Sin sitio para un cubo (su mínimo y su máximo) además de los extremos
+        return np.array([0, n - 1])[:max(puntos, 1)]
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    cubos = (puntos - 2) // 2
+    cubo = np.arange(n) * cubos // n
+    # Ordenadas por cubo y valor: la primera fila de cada cubo es su mínimo y la última su máximo
+    orden = np.lexsort((y, cubo))
+    primeras = np.flatnonzero(np.diff(cubo[orden], prepend=-1))
+    ultimas = np.append(primeras[1:] - 1, n - 1)
+    return np.unique(np.concatenate(([0, n - 1], orden[primeras], orden[ultimas])))
+
+
+METODOS = {
+    'lttb': lttb,
+    'minmax': lambda x, y, puntos: minmax(y, puntos),
+}
+
+
+def submuestrear(x, series, puntos=MAX_PUNTOS, metodo='lttb'):
+    """Como mucho ``puntos`` filas a dibujar para varias ``series`` con las mismas categorías ``x``.
+
+    Cada serie elige su parte de ``puntos`` y se unen los índices, de modo que
+    ninguna pierde sus puntos característicos y el total no pasa de ``puntos``
+    (con más series que puntos solo queda la primera fila).
+    """
+    elegir = METODOS[metodo]
+    por_serie = max(puntos // max(len(series), 1), 1)
+    return np.unique(np.concatenate([elegir(x, y, por_serie) for y in series]))
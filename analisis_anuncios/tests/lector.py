@@ -0,0 +1,54 @@
+"""Lector mínimo de libros .xlsx para las pruebas (sin dependencias extra).
+
+Devuelve por hoja las celdas (valor, fórmula y estilo), las celdas combinadas
+y los formatos condicionales tal como quedan en el XML.
+"""
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+
+NS = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+
+def _texto(elemento):
+    return ''.join(t.text or '' for t in elemento.iter(f'{{{NS["m"]}}}t'))
+
+
+def leer_libro(ruta):
+    """``{hoja: {'celdas': {ref: (valor, fórmula, estilo)}, 'fusiones': [...], 'condicionales': [...]}}``."""
+    with zipfile.ZipFile(ruta) as z:
+        libro = ElementTree.fromstring(z.read('xl/workbook.xml'))
+        relaciones = ElementTree.fromstring(z.read('xl/_rels/workbook.xml.rels'))
+        destinos = {r.get('Id'): r.get('Target') for r in relaciones}
+        compartidas = []
+        if 'xl/sharedStrings.xml' in z.namelist():
+            compartidas = [_texto(si) for si in ElementTree.fromstring(z.read('xl/sharedStrings.xml'))]
+        hojas = {}
+        for hoja in libro.find('m:sheets', NS):
+            xml = ElementTree.fromstring(z.read(posixpath.join('xl', destinos[hoja.get(REL)])))
+            celdas = {}
+            for c in xml.iterfind('m:sheetData/m:row/m:c', NS):
+                v, f, tipo = c.find('m:v', NS), c.find('m:f', NS), c.get('t')
+                if tipo == 's':
+                    valor = compartidas[int(v.text)]
+                elif tipo == 'inlineStr':
+                    valor = _texto(c.find('m:is', NS))
+                elif v is not None and tipo in ('str', 'e'):
+                    valor = v.text
+                elif v is not None:
+                    valor = float(v.text)
+                else:
+                    valor = None
+                celdas[c.get('r')] = (valor, f.text if f is not None else None, c.get('s'))
+            hojas[hoja.get('name')] = {
+                'celdas': celdas,
+                'fusiones': sorted(m.get('ref') for m in xml.iterfind('m:mergeCells/m:mergeCell', NS)),
+                'condicionales': [
+                    (cf.get('sqref'), [re.sub(r'\s+', ' ', ElementTree.tostring(r, encoding='unicode'))
+                                       for r in cf.iterfind('m:cfRule', NS)])
+                    for cf in xml.iterfind('m:conditionalFormatting', NS)
+                ],
+            }
+    return hojas
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from analisis_anuncios import actividad
+from analisis_anuncios.actividad import _desescapar
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    ('\\N', None),
+    ('sin escapes', 'sin escapes'),
+    ('a\\tb\\nc', 'a\tb\nc'),
+    ('barra \\\\ final', 'barra \\ final'),
+    ('\\x41\\101', 'AA'),
+    ('\\N ya no es nulo', 'N ya no es nulo'),
+])
+def test_desescapar(valor, esperado):
+    assert _desescapar(valor) == esperado
+
+
+VOLCADO = '''\
+--
+-- PostgreSQL database dump
+--
+COPY public.profiles (id, name) FROM stdin;
+u1\tTab\\tulado
+\\.
+
+COPY public.marketplace_cases (id, client_id, title, status, created_at, updated_at) FROM stdin;
+c1\tcli-1\tDivorcio\\tcon\\\\barras\topen\t2025-03-01 10:00:00+00\t2025-03-01 10:00:00+00
+c2\tcli-2\t\\N\texpired\t2025-03-01 11:00:00+00\t2025-03-03 00:00:00+00
+\\.
+
+COPY public.proposals (id, case_id, lawyer_id, client_id, status, created_at, updated_at) FROM stdin;
+p1\tc1\tabo-1\tcli-1\taccepted\t2025-03-01 12:00:00+00\t2025-03-02 08:00:00+00
+p2\tc2\tabo-2\tcli-2\twithdrawn\t2025-03-02 12:00:00+00\t2025-03-03 08:00:00+00
+p3\tc2\t\\N\tcli-2\tpending\t2025-03-02 13:00:00+00\t2025-03-02 13:00:00+00
+\\.
+'''
+
+
+def test_volcado_copy(tmp_path):
+    ruta = tmp_path / 'volcado.sql'
+    ruta.write_text(VOLCADO, encoding='utf-8')
+    resultado = actividad.leer_volcados([str(ruta)], tamano_bloque=1)
+    assert resultado.dias[0] == np.datetime64('2025-03-01', 'D').astype(np.int32)
+    assert resultado.filas == 5
+    assert resultado.casos.tolist() == [2, 0, 0]
+    assert resultado.propuestas.tolist() == [1, 2, 0]
+    assert resultado.expirados.tolist() == [0, 0, 1]
+    # Día 1: cli-1, cli-2 (casos) y abo-1; día 2: cli-1 (acepta) y abo-2; día 3: abo-2 (retira)
+    assert resultado.clientes.tolist() == [2, 1, 0]
+    assert resultado.abogados.tolist() == [1, 1, 1]
+    assert resultado.activos.tolist() == [3, 2, 1]
+
+
+def test_csv_equivale_a_copy(tmp_path):
+    volcado = tmp_path / 'volcado.sql'
+    volcado.write_text(VOLCADO, encoding='utf-8')
+    (tmp_path / 'casos.csv').write_text(
+        'id,client_id,title,status,created_at,updated_at\n'
+        'c1,cli-1,"Divorcio\tcon\\barras",open,2025-03-01 10:00:00+00,2025-03-01 10:00:00+00\n'
+        'c2,cli-2,,expired,2025-03-01 11:00:00+00,2025-03-03 00:00:00+00\n', encoding='utf-8')
+    (tmp_path / 'propuestas.csv').write_text(
+        'id,case_id,lawyer_id,client_id,status,created_at,updated_at\n'
+        'p1,c1,abo-1,cli-1,accepted,2025-03-01 12:00:00+00,2025-03-02 08:00:00+00\n'
+        'p2,c2,abo-2,cli-2,withdrawn,2025-03-02 12:00:00+00,2025-03-03 08:00:00+00\n'
+        'p3,c2,,cli-2,pending,2025-03-02 13:00:00+00,2025-03-02 13:00:00+00\n', encoding='utf-8')
+    copy = actividad.leer_volcados([str(volcado)])
+    csv = actividad.leer_volcados([str(tmp_path / 'casos.csv'), str(tmp_path / 'propuestas.csv')])
+    for campo in actividad.Actividad._fields:
+        assert np.array_equal(getattr(csv, campo), getattr(copy, campo)), campo
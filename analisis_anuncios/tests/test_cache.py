@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+
+from analisis_anuncios import cache as modulo_cache
+from analisis_anuncios.cache import CacheConstruccion, SinCache, huella, memo_sorteos
+from analisis_anuncios.escenarios import Escenario
+from analisis_anuncios.libro import build_workbook
+
+LLAMADAS = []
+
+
+def _costosa(n, semilla=None, procesos=None):
+    LLAMADAS.append(n)
+    return np.full(n, float(semilla or 0))
+
+
+@pytest.fixture(autouse=True)
+def _sin_llamadas():
+    LLAMADAS.clear()
+
+
+def test_huella_canonica():
+    assert huella({'a': 1, 'b': [1, 2]}) == huella({'b': [1, 2], 'a': 1})
+    assert len({huella(1), huella(1.0), huella(True), huella('1'), huella((1,)), huella([1])}) == 6
+    assert huella(np.zeros(3)) != huella(np.zeros(3, dtype=np.float32))
+    assert huella(np.zeros(3)) != huella(np.zeros((3, 1)))
+    assert huella(Escenario()) != huella(Escenario(multiplicador_cpm=1.1))
+    with pytest.raises(TypeError, match='generator'):
+        huella(x for x in range(3))
+
+
+def test_memo_reutiliza_y_distingue_argumentos(tmp_path):
+    cache = CacheConstruccion(str(tmp_path))
+    primero = cache.memo(_costosa, n=3, semilla=1)
+    np.testing.assert_array_equal(cache.memo(_costosa, n=3, semilla=1), primero)
+    cache.memo(_costosa, n=3, semilla=2)
+    assert LLAMADAS == [3, 3]
+    # ``procesos`` fuera de la clave con sin_clave; dentro, cuenta como otro argumento
+    cache.memo(_costosa, sin_clave=('procesos',), n=4, procesos=1)
+    cache.memo(_costosa, sin_clave=('procesos',), n=4, procesos=8)
+    cache.memo(_costosa, n=4, procesos=8)
+    assert LLAMADAS == [3, 3, 4, 4]
+
+
+def test_memo_se_invalida_con_el_codigo_y_los_archivos_danados(tmp_path, monkeypatch):
+    cache = CacheConstruccion(str(tmp_path))
+    cache.memo(_costosa, n=2)
+    for nombre in os.listdir(tmp_path / 'arrays'):
+        (tmp_path / 'arrays' / nombre).write_bytes(b'no es un pickle')
+    cache.memo(_costosa, n=2)
+    monkeypatch.setattr(modulo_cache, '_huella_paquete', lambda: 'código editado')
+    cache.memo(_costosa, n=2)
+    assert LLAMADAS == [2, 2, 2]
+    CacheConstruccion(str(tmp_path), forzar=True).memo(_costosa, n=2)
+    assert LLAMADAS == [2, 2, 2, 2]
+
+
+def test_desalojo_por_tamano(tmp_path):
+    cache = CacheConstruccion(str(tmp_path), max_bytes=3000)
+    for n in (100, 101, 102):
+        cache.memo(_costosa, n=n)
+    # Cada resultado ocupa algo más de 800 bytes: caben tres, no cuatro
+    assert len(os.listdir(tmp_path / 'arrays')) == 3
+    cache.memo(_costosa, n=2000)
+    assert len(os.listdir(tmp_path / 'arrays')) <= 1
+
+
+def test_memo_sorteos_sin_semilla_no_usa_la_cache(tmp_path):
+    cache = CacheConstruccion(str(tmp_path))
+    memo_sorteos(cache, _costosa, None, procesos=2, n=5)
+    memo_sorteos(cache, _costosa, None, procesos=2, n=5)
+    memo_sorteos(cache, _costosa, 7, procesos=1, n=5)
+    memo_sorteos(cache, _costosa, 7, procesos=4, n=5)
+    assert LLAMADAS == [5, 5, 5]
+    assert os.listdir(tmp_path / 'arrays') and memo_sorteos(SinCache(), _costosa, 7, n=1)[0] == 7
+
+
+def test_vigente_y_cambios_por_hoja(tmp_path):
+    cache = CacheConstruccion(str(tmp_path / 'cache'))
+    ruta = tmp_path / 'libro.xlsx'
+    ruta.write_bytes(b'v1')
+    assert not cache.vigente('base', 'clave', str(ruta))
+    assert cache.registrar('base', 'clave', str(ruta), {'A': 'h1', 'B': 'h2'}) == ['A', 'B']
+    assert cache.vigente('base', 'clave', str(ruta)) and cache.omitidos == {'base'}
+    assert not cache.vigente('base', 'otra clave', str(ruta))
+    assert not CacheConstruccion(str(tmp_path / 'cache'), forzar=True).vigente('base', 'clave', str(ruta))
+    assert cache.registrar('base', 'clave', str(ruta), {'A': 'h1', 'B': 'h3', 'C': 'h4'}) == ['B', 'C']
+    # Un libro tocado a mano (otro tamaño o fecha) deja de valer
+    ruta.write_bytes(b'editado')
+    assert not cache.vigente('base', 'clave', str(ruta))
+    os.remove(ruta)
+    assert not cache.vigente('base', 'clave', str(ruta))
+
+
+def test_build_workbook_omite_el_libro_sin_cambios(tmp_path):
+    cache = CacheConstruccion(str(tmp_path / 'cache'))
+    escenario = Escenario()
+    ruta = build_workbook(escenario, str(tmp_path), cache=cache)
+    fecha = os.stat(ruta).st_mtime_ns
+    assert build_workbook(escenario, str(tmp_path), cache=cache) == ruta
+    assert cache.omitidos == {escenario.nombre} and os.stat(ruta).st_mtime_ns == fecha
+    build_workbook(escenario, str(tmp_path), cache=cache, multiplicador_cpm=1.2)
+    assert cache.omitidos == set() and os.stat(ruta).st_mtime_ns != fecha
+    assert 'Proyecciones de Ingresos' in cache.cambios[escenario.nombre]
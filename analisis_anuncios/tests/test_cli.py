@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from analisis_anuncios.cli import main
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _lote(tmp_path, escenarios):
+    ruta = tmp_path / 'lote.json'
+    ruta.write_text(json.dumps(escenarios), encoding='utf-8')
+    return str(ruta)
+
+
+def test_dry_run_valida_sin_generar(tmp_path, capsys):
+    lote = _lote(tmp_path, [{'nombre': 'a'}, {'nombre': 'b', 'multiplicador_cpm': 1.5}])
+    salida = tmp_path / 'salida'
+    assert main(['--lote', lote, '--salida', str(salida), '--cache', str(tmp_path / 'cache'), '--dry-run']) == 0
+    assert '2 escenario(s) válido(s)' in capsys.readouterr().out
+    assert not salida.exists() and not (tmp_path / 'cache').exists()
+
+
+def test_dry_run_informa_todos_los_errores(tmp_path, capsys, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    lote = _lote(tmp_path, [{'nombre': 'a'}, {'nombre': 'a', 'multiplicador_cpm': -1}])
+    argumentos = ['--lote', lote, '--ingerir', str(tmp_path / 'falta.jsonl'), '--informes', 'https://ejemplo.invalid',
+                  '--lanzamiento', '2025-13-01', '--dry-run']
+    assert main(argumentos) == 1
+    errores = capsys.readouterr().err
+    assert "repetidos: ['a']" in errores
+    assert 'multiplicador_cpm' in errores
+    assert 'no existe el log' in errores
+    assert '--informes necesita --apps' in errores and "'2025-13-01' no es una fecha" in errores
+    # Nada se ingirió ni descargó
+    assert sorted(os.listdir(tmp_path)) == ['lote.json']
+
+
+@pytest.mark.parametrize('contenido, mensaje', [('[{"nombre": "a", "sobra": 1}]', 'Claves desconocidas'),
+                                                ('no es json', 'Expecting value')])
+def test_lote_ilegible(tmp_path, capsys, contenido, mensaje):
+    ruta = tmp_path / 'lote.json'
+    ruta.write_text(contenido, encoding='utf-8')
+    assert main(['--lote', str(ruta), '--dry-run']) == 1
+    assert mensaje in capsys.readouterr().err
+
+
+def test_dry_run_no_carga_numpy_ni_xlsxwriter():
+    codigo = ('import sys; from analisis_anuncios.cli import main; main(["--dry-run"]); '
+              'print(sorted({"numpy", "xlsxwriter"} & set(sys.modules)))')
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert resultado.stdout.splitlines()[-1] == '[]'
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from analisis_anuncios import libro
+from analisis_anuncios.cohortes import (
+    DIAS_RETENCION, ajustar_retencion, altas_diarias, curvas_retencion, dau_mensual, proyectar_dau,
+)
+from analisis_anuncios.escenarios import Escenario
+
+
+@pytest.mark.parametrize('n', [1, 2, 7, 64, 1095])
+def test_convolucion_fft_igual_a_np_convolve(n):
+    rng = np.random.default_rng(n)
+    altas = rng.uniform(0, 1000, n)
+    curvas = rng.uniform(0, 1, (3, n))
+    dau = proyectar_dau(altas, curvas)
+    assert dau.shape == (3, n)
+    for fila, curva in zip(dau, curvas):
+        np.testing.assert_allclose(fila, np.convolve(altas, curva)[:n], rtol=1e-9, atol=1e-6)
+
+
+def test_ajuste_recupera_una_ley_de_potencias():
+    a, b = ajustar_retencion([[0.4 * d ** -0.5 for d in DIAS_RETENCION]])
+    assert (a[0], b[0]) == pytest.approx((0.4, 0.5))
+
+
+def test_dau_del_libro_igual_a_la_suma_de_cohortes():
+    escenario = Escenario(cohortes={'altas_diarias': 500, 'crecimiento_mensual': 0.1, 'meses': 3})
+    dau = libro.dau_cohortes(escenario)
+    assert dau.shape == (4, 3)
+
+    filas = [libro.num_benchmarks.indice(f'Retención Día {dia}') for dia in DIAS_RETENCION]
+    retencion = libro.num_benchmarks.minimo[filas, 1:].T
+    dias = 3 * libro.DIAS_MES
+    for nivel, (a, b) in enumerate(zip(*ajustar_retencion(retencion))):
+        # Cada cohorte diaria aporta sus altas por la fracción retenida a su edad
+        activos = [0.0] * dias
+        for alta in range(dias):
+            llegan = 500 * 1.1 ** (alta / libro.DIAS_MES)
+            for dia in range(alta, dias):
+                edad = dia - alta
+                activos[dia] += llegan * (1.0 if edad == 0 else min(a * edad ** -b, 1.0))
+        cierres = [activos[libro.DIAS_MES * mes - 1] for mes in (1, 2, 3)]
+        np.testing.assert_allclose(dau[nivel], cierres, rtol=1e-9)
+
+
+def test_curvas_y_cierres_de_mes():
+    curvas = curvas_retencion([0.5, 2.0], [0.3, 0.1], 10)
+    assert np.all(curvas[:, 0] == 1) and np.all(curvas <= 1)
+    np.testing.assert_allclose(altas_diarias(100, 0.2, 31)[[0, 30]], [100, 120])
+    np.testing.assert_array_equal(dau_mensual(np.arange(65), dias_mes=30), [29, 59])
@@ -0,0 +1,56 @@
+import pytest
+
+from analisis_anuncios.escenarios import Escenario
+from analisis_anuncios.escritura import EscritorSecuencial, crear_libro
+from analisis_anuncios.hojas import HOJA_GRAFICOS
+from analisis_anuncios.libro import build_workbook
+from analisis_anuncios.tests.lector import leer_libro
+
+ESCENARIOS = [
+    # Proyección larga: el gráfico se submuestrea en la hoja oculta
+    Escenario(nombre='largo', usuarios_diarios=tuple(range(100, 30_100, 10))),
+    Escenario(nombre='nativo', excel_nativo=True, simulacion=True, sorteos=50_000, procesos=1,
+              rejilla={'usuarios': [100, 1000], 'impresiones_por_usuario': [2, 3], 'cpm': [1.5, 2.5],
+                       'fill_rate': [0.8, 0.9]}),
+]
+
+
+@pytest.mark.parametrize('escenario', ESCENARIOS, ids=lambda e: e.nombre)
+def test_streaming_escribe_lo_mismo_que_el_modo_normal(tmp_path, escenario):
+    normal = leer_libro(build_workbook(escenario, str(tmp_path)))
+    streaming = leer_libro(build_workbook(escenario, str(tmp_path), nombre='streaming', streaming=True))
+    assert list(streaming) == list(normal)
+    for hoja in normal:
+        assert streaming[hoja]['celdas'] == normal[hoja]['celdas'], hoja
+        assert streaming[hoja]['fusiones'] == normal[hoja]['fusiones'], hoja
+        assert streaming[hoja]['condicionales'] == normal[hoja]['condicionales'], hoja
+    assert any(hoja['condicionales'] for hoja in normal.values()) == escenario.excel_nativo
+    assert (HOJA_GRAFICOS in normal) == (len(escenario.usuarios_diarios) > 1_000)
+
+
+def test_escribir_una_fila_anterior_falla(tmp_path):
+    workbook = crear_libro(str(tmp_path / 'orden.xlsx'), streaming=True)
+    escritor = EscritorSecuencial(workbook.add_worksheet('Hoja'))
+    escritor.escribir_filas([[1, 2], [3, 4]])
+    escritor.fila = 1
+    with pytest.raises(ValueError, match='no se puede volver a la fila 2'):
+        escritor.escribir_fila([5, 6])
+    with pytest.raises(ValueError, match='no se puede volver'):
+        escritor.fusionar(0, 1, 'título')
+    escritor.fila = 2
+    escritor.escribir_fila([5, 6])
+    workbook.close()
+    assert leer_libro(tmp_path / 'orden.xlsx')['Hoja']['celdas']['A3'][0] == 5
+
+
+def test_formulas_con_y_sin_funciones(tmp_path):
+    workbook = crear_libro(str(tmp_path / 'formulas.xlsx'))
+    workbook.use_future_functions = True
+    escritor = EscritorSecuencial(workbook.add_worksheet('Hoja'))
+    escritor.escribir_filas([[2, 3, 6], [4, 5, 20]], formulas={2: '=A{fila}*B{fila}'})
+    escritor.escribir_fila([0, 0], formulas={0: '=SUM(C1:C2)', 1: '=COT(1)'})
+    workbook.close()
+    celdas = leer_libro(tmp_path / 'formulas.xlsx')['Hoja']['celdas']
+    assert [celdas[ref][:2] for ref in ('C1', 'C2', 'A3')] == [(6, 'A1*B1'), (20, 'A2*B2'), (0, 'SUM(C1:C2)')]
+    # Las fórmulas con funciones siguen pasando por xlsxwriter, que añade el prefijo _xlfn.
+    assert celdas['B3'][1] == '_xlfn.COT(1)'
@@ -0,0 +1,160 @@
+import csv
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from analisis_anuncios import eventos
+
+REGISTROS = [
+    {'fecha': '2025-03-01T10:00:00Z', 'ubicacion': 'Inicio', 'tipo_anuncio': 'banner', 'evento': 'solicitud',
+     'ingreso': 0},
+    {'fecha': '2025-03-01T10:00:01Z', 'ubicacion': 'Inicio', 'tipo_anuncio': 'banner', 'evento': 'impresion',
+     'ingreso': 0.002},
+    {'fecha': '2025-03-01T10:00:05Z', 'ubicacion': 'Inicio', 'tipo_anuncio': 'banner', 'evento': 'clic'},
+    {'fecha': '2025-03-02T09:00:00Z', 'ubicacion': 'Inicio', 'tipo_anuncio': 'banner', 'evento': 'solicitud'},
+    {'fecha': '2025-03-02T09:00:00Z', 'ubicacion': 'Perfil', 'tipo_anuncio': 'nativo', 'evento': 'request'},
+    {'fecha': '2025-03-02T09:00:01Z', 'ubicacion': 'Perfil', 'tipo_anuncio': 'nativo', 'evento': 'impression',
+     'ingreso': 0.004},
+    {'fecha': '2025-03-02T09:00:02Z', 'ubicacion': 'Perfil', 'tipo_anuncio': 'nativo', 'evento': 'desconocido'},
+]
+
+
+def escribir_jsonl(ruta, registros):
+    with (gzip.open if ruta.endswith('.gz') else open)(ruta, 'wt', encoding='utf-8') as f:
+        f.writelines(json.dumps(r) + '\n' for r in registros)
+    return ruta
+
+
+def escribir_csv(ruta, registros):
+    with open(ruta, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=['fecha', 'ubicacion', 'tipo_anuncio', 'evento', 'ingreso'])
+        escritor.writeheader()
+        escritor.writerows(registros)
+    return ruta
+
+
+def grupos(agregados):
+    return {(int(d), agregados.ubicaciones[u], agregados.tipos[t]): (int(s), int(i), int(c), round(float(g), 6))
+            for d, u, t, s, i, c, g in zip(*(getattr(agregados, c) for c in eventos.COLUMNAS))}
+
+
+@pytest.mark.parametrize('escribir, nombre', [(escribir_jsonl, 'eventos.jsonl'),
+                                              (escribir_jsonl, 'eventos.jsonl.gz'),
+                                              (escribir_csv, 'eventos.csv')])
+def test_ingesta_ida_y_vuelta(tmp_path, escribir, nombre):
+    ruta = escribir(str(tmp_path / nombre), REGISTROS)
+    agregados = eventos.ingerir([ruta], str(tmp_path / 'agregados'), tamano_bloque=2)
+    dia = int(np.datetime64('2025-03-01', 'D').astype(np.int32))
+    assert grupos(agregados) == {
+        (dia, 'Inicio', 'banner'): (1, 1, 1, 0.002),
+        (dia + 1, 'Inicio', 'banner'): (1, 0, 0, 0.0),
+        (dia + 1, 'Perfil', 'nativo'): (1, 1, 0, 0.004),
+    }
+    assert grupos(eventos.cargar(str(tmp_path / 'agregados'))) == grupos(agregados)
+    with open(tmp_path / 'agregados' / eventos.ESQUEMA, encoding='utf-8') as f:
+        esquema = json.load(f)
+    assert (esquema['filas_leidas'], esquema['filas_descartadas']) == (7, 1)
+
+
+def test_reutiliza_la_ingesta_si_los_logs_no_cambian(tmp_path, monkeypatch):
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), REGISTROS)
+    directorio = str(tmp_path / 'agregados')
+    primera = grupos(eventos.ingerir([ruta], directorio))
+    monkeypatch.setattr(eventos, '_registros', lambda ruta: pytest.fail('se releyeron los logs'))
+    assert grupos(eventos.ingerir([ruta], directorio)) == primera
+
+
+
+def test_reingesta_interrumpida_no_deja_una_cache_valida(tmp_path, monkeypatch):
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), REGISTROS)
+    directorio = str(tmp_path / 'agregados')
+    primera = grupos(eventos.ingerir([ruta], directorio))
+    escribir_jsonl(ruta, REGISTROS[:3])
+    guardar = np.save
+
+    def disco_lleno(*args):
+        raise OSError('disco lleno')
+
+    def falla_tras_la_primera(f, valores):
+        guardar(f, valores)
+        monkeypatch.setattr(np, 'save', disco_lleno)
+
+    monkeypatch.setattr(np, 'save', falla_tras_la_primera)
+    with pytest.raises(OSError, match='disco lleno'):
+        eventos.ingerir([ruta], directorio)
+    monkeypatch.undo()
+    # Columnas a medio escribir: sin esquema no se cargan ni se reutilizan
+    with pytest.raises(FileNotFoundError):
+        eventos.cargar(directorio)
+    escribir_jsonl(ruta, REGISTROS)
+    assert grupos(eventos.ingerir([ruta], directorio)) == primera
+
+
+def test_reingesta_no_altera_los_agregados_ya_cargados(tmp_path):
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), REGISTROS)
+    directorio = str(tmp_path / 'agregados')
+    cargados = eventos.ingerir([ruta], directorio)
+    antes = grupos(cargados)
+    escribir_jsonl(ruta, REGISTROS[:3])
+    assert grupos(eventos.ingerir([ruta], directorio, forzar=True)) != antes
+    assert grupos(cargados) == antes
+
+
+def test_epoch_en_segundos_y_milisegundos(tmp_path):
+    segundos = 1740823200  # 2025-03-01T10:00:00Z
+    registros = [{**REGISTROS[0], 'fecha': segundos}, {**REGISTROS[0], 'fecha': segundos * 1000}]
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), registros)
+    agregados = eventos.ingerir([ruta], str(tmp_path / 'agregados'))
+    assert agregados.dia.tolist() == [np.datetime64('2025-03-01', 'D').astype(np.int32)]
+    assert agregados.solicitudes.tolist() == [2]
+
+
+def test_falta_un_campo(tmp_path):
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), [{'fecha': '2025-03-01', 'evento': 'clic'}])
+    with pytest.raises(ValueError, match="'ubicacion'"):
+        eventos.ingerir([ruta], str(tmp_path / 'agregados'))
+
+
+def test_fechas_iso_y_epoch_mezcladas(tmp_path):
+    registros = [{**REGISTROS[0], 'fecha': f} for f in ('2025-03-01T23:59:59Z', 1740823200, '1740823200000')]
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), registros)
+    agregados = eventos.ingerir([ruta], str(tmp_path / 'agregados'))
+    assert agregados.dia.tolist() == [np.datetime64('2025-03-01', 'D').astype(np.int32)]
+    assert agregados.solicitudes.tolist() == [3]
+
+
+def test_ingreso_ausente_en_el_primer_registro(tmp_path):
+    registros = [{k: v for k, v in r.items() if k != 'ingreso'} for r in REGISTROS[:1]] + REGISTROS[1:]
+    ruta = escribir_jsonl(str(tmp_path / 'eventos.jsonl'), registros)
+    agregados = eventos.ingerir([ruta], str(tmp_path / 'agregados'), tamano_bloque=1)
+    assert round(float(agregados.ingresos.sum()), 6) == 0.006
+
+
+@pytest.mark.parametrize('registro, mensaje', [
+    ({'fecha': '2025-03-01', 'tipo_anuncio': 'banner', 'evento': 'clic'}, "eventos.jsonl:3: falta el campo 'ubicacion'"),
+    ({**REGISTROS[0], 'ubicacion': None}, "eventos.jsonl:3: falta el campo 'ubicacion'"),
+    ({**REGISTROS[0], 'fecha': 'ayer'}, "eventos.jsonl:3: valor no válido en 'fecha': 'ayer'"),
+    ({**REGISTROS[1], 'ingreso': 'mucho'}, "eventos.jsonl:3: valor no válido en 'ingreso': 'mucho'"),
+])
+def test_registro_invalido_indica_la_linea(tmp_path, registro, mensaje):
+    ruta = str(tmp_path / 'eventos.jsonl')
+    escribir_jsonl(ruta, REGISTROS[:1])
+    with open(ruta, 'a', encoding='utf-8') as f:
+        f.write('\n' + json.dumps(registro) + '\n')
+    with pytest.raises(ValueError, match=mensaje):
+        eventos.ingerir([ruta], str(tmp_path / 'agregados'))
+
+
+def test_json_invalido_indica_la_linea(tmp_path):
+    ruta = tmp_path / 'eventos.jsonl'
+    ruta.write_text(json.dumps(REGISTROS[0]) + '\n{"fecha": \n', encoding='utf-8')
+    with pytest.raises(ValueError, match='eventos.jsonl:2: JSON inválido'):
+        eventos.ingerir([str(ruta)], str(tmp_path / 'agregados'))
+
+
+def test_csv_con_campo_vacio_indica_la_linea(tmp_path):
+    ruta = escribir_csv(str(tmp_path / 'eventos.csv'), [REGISTROS[0], {**REGISTROS[3], 'tipo_anuncio': ''}])
+    with pytest.raises(ValueError, match="eventos.csv:3: falta el campo 'tipo'"):
+        eventos.ingerir([ruta], str(tmp_path / 'agregados'))
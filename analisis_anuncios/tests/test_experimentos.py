@@ -0,0 +1,53 @@
+import csv
+
+import numpy as np
+import pytest
+
+from analisis_anuncios.experimentos import MAX_TRAMOS, _Acumulador, analizar_experimento
+
+
+def filas(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    variantes = rng.choice(['Control', 'A', 'B'], n)
+    ingresos = rng.exponential(np.where(variantes == 'A', 0.012, 0.010)) * (rng.random(n) < 0.3)
+    return [(f'u{i}', v, float(g)) for i, (v, g) in enumerate(zip(variantes.tolist(), ingresos.tolist()))]
+
+
+def welch(filas, hasta, variante):
+    """z de Welch de ``variante`` frente a 'Control' con las ``hasta`` primeras filas."""
+    grupos = {}
+    for _, v, g in filas[:hasta]:
+        grupos.setdefault(v, []).append(g)
+    x, c = np.array(grupos[variante]), np.array(grupos['Control'])
+    return (x.mean() - c.mean()) / np.sqrt(x.var(ddof=1) / len(x) + c.var(ddof=1) / len(c))
+
+
+def test_tramos_de_tamano_fijo():
+    acumulador = _Acumulador(cubos=10)
+    datos = filas(50_000)
+    for inicio in range(0, len(datos), 7_000):
+        acumulador.agregar(datos[inicio:inicio + 7_000])
+    assert acumulador.tramos.shape == (3, 3, MAX_TRAMOS)
+    assert acumulador.ancho_tramo == 64  # 50.000 filas en tramos de 64: 782 tramos en uso
+    usuarios = acumulador.tramos[0].sum(axis=0)
+    assert usuarios[:781].tolist() == [64] * 781
+    assert usuarios[781] == 50_000 - 781 * 64 and not usuarios[782:].any()
+    ingresos = np.array([g for _, _, g in datos])
+    np.testing.assert_allclose(acumulador.tramos[1].sum(axis=0)[:782],
+                               np.add.reduceat(ingresos, np.arange(0, 50_000, 64)))
+
+
+def test_miradas_exactas(tmp_path):
+    datos = filas(30_000, semilla=1)
+    ruta = tmp_path / 'experimento.csv'
+    with open(ruta, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['usuario', 'variante', 'ingreso'])
+        escritor.writerows(datos)
+    resultado = analizar_experimento([str(ruta)], 'Control', remuestreos=200, miradas=4, semilla=0,
+                                     tamano_bloque=4_096)
+    assert resultado.variantes[0] == 'Control'
+    assert resultado.miradas[-1] == 30_000
+    for i, variante in enumerate(resultado.variantes[1:], start=1):
+        for k, usuarios in enumerate(resultado.miradas):
+            assert resultado.z[i, k] == pytest.approx(welch(datos, usuarios, variante), rel=1e-9)
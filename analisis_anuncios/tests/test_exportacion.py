@@ -0,0 +1,73 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from analisis_anuncios.exportacion import ESQUEMA, INDICE, exportar
+from analisis_anuncios.hojas import Columnas, Hoja, Tabla, Titulo
+
+
+def hojas():
+    def bloques():
+        yield [np.array([1, 2]), np.array([0.5, np.nan]), np.array(['a', 'b'], dtype=object)]
+        yield [np.array([3]), np.array([2.25]), np.array(['c,"d"'], dtype=object)]
+
+    return [
+        Hoja('Datos', 3, {}, [
+            Titulo('Ignorado'),
+            Tabla(Columnas(bloques), encabezados=['mes', 'valor', 'nota'], nombre='serie'),
+            Tabla([['x', 1, None], ['y', 2, 3.5]], encabezados=['nombre', 'entero', 'real'], nombre='referencia'),
+            Tabla([['sin nombre']], encabezados=['no se exporta']),
+        ]),
+    ]
+
+
+def test_indice(tmp_path):
+    ruta = exportar(hojas(), str(tmp_path), ['csv', 'jsonl', 'columnar'])
+    assert ruta == str(tmp_path / INDICE)
+    with open(ruta, encoding='utf-8') as f:
+        indice = json.load(f)['tablas']
+    assert sorted(indice) == ['referencia', 'serie']
+    assert indice['serie'] == {
+        'hoja': 'Datos',
+        'columnas': ['mes', 'valor', 'nota'],
+        'filas': 3,
+        'archivos': {'csv': 'serie.csv', 'jsonl': 'serie.jsonl', 'columnar': 'serie'},
+    }
+
+
+def test_csv(tmp_path):
+    exportar(hojas(), str(tmp_path), ['csv'])
+    with open(tmp_path / 'serie.csv', encoding='utf-8', newline='') as f:
+        assert list(csv.reader(f)) == [['mes', 'valor', 'nota'], ['1', '0.5', 'a'], ['2', '', 'b'],
+                                       ['3', '2.25', 'c,"d"']]
+    with open(tmp_path / 'referencia.csv', encoding='utf-8', newline='') as f:
+        assert list(csv.reader(f)) == [['nombre', 'entero', 'real'], ['x', '1', ''], ['y', '2', '3.5']]
+
+
+def test_jsonl(tmp_path):
+    exportar(hojas(), str(tmp_path), ['jsonl'])
+    with open(tmp_path / 'serie.jsonl', encoding='utf-8') as f:
+        assert [json.loads(linea) for linea in f] == [
+            {'mes': 1, 'valor': 0.5, 'nota': 'a'},
+            {'mes': 2, 'valor': None, 'nota': 'b'},
+            {'mes': 3, 'valor': 2.25, 'nota': 'c,"d"'},
+        ]
+
+
+def test_columnar(tmp_path):
+    exportar(hojas(), str(tmp_path), ['columnar'])
+    with open(tmp_path / 'serie' / ESQUEMA, encoding='utf-8') as f:
+        esquema = json.load(f)
+    assert esquema['filas'] == 3
+    columnas = [np.load(tmp_path / 'serie' / c['archivo'], mmap_mode='r') for c in esquema['columnas']]
+    assert columnas[0].dtype == np.int64 and columnas[0].tolist() == [1, 2, 3]
+    np.testing.assert_array_equal(columnas[1], [0.5, np.nan, 2.25])
+    assert columnas[2].tolist() == ['a', 'b', 'c,"d"']
+    assert not list((tmp_path / 'serie').glob('*.tmp'))
+
+
+def test_formato_desconocido(tmp_path):
+    with pytest.raises(ValueError, match='parquet'):
+        exportar(hojas(), str(tmp_path), ['parquet'])
@@ -0,0 +1,70 @@
+import pytest
+
+from analisis_anuncios.escritura import crear_libro
+from analisis_anuncios.formatos import Clasificador, RegistroFormatos
+
+
+class LibroFalso:
+    def __init__(self):
+        self.creados = []
+
+    def add_format(self, propiedades):
+        self.creados.append(propiedades)
+        return object()
+
+
+def test_propiedades_equivalentes_comparten_formato():
+    libro = LibroFalso()
+    registro = RegistroFormatos(libro)
+    a = registro.formato({'bold': True, 'bg_color': '#FFEB3B', 'italic': False})
+    b = registro.formato({'bg_color': '#ffeb3b', 'bold': 1, 'border': None})
+    c = registro.formato({'bold': True})
+    assert a is b and a is not c
+    assert libro.creados == [{'bg_color': '#ffeb3b', 'bold': 1}, {'bold': 1}]
+    assert registro.creados == 2
+
+
+def test_nombres_se_crean_al_usarse():
+    libro = LibroFalso()
+    registro = RegistroFormatos(libro, {'data': {'border': 1}, 'currency': {'border': 1, 'num_format': '$#,##0.00'}})
+    registro.definir('borde', {'border': True})
+    assert (len(registro), 'borde' in registro, 'otro' in registro) == (3, True, False)
+    assert libro.creados == []
+    # Dos nombres con las mismas propiedades son el mismo formato
+    assert registro['data'] is registro['borde'] is registro['data']
+    assert registro.creados == 1
+    # Una definición puede cambiarse mientras no se haya usado
+    registro.definir('currency', {'num_format': '0.00'})
+    registro['currency']
+    assert libro.creados[-1] == {'num_format': '0.00'}
+    with pytest.raises(ValueError, match="'data' ya se usó"):
+        registro.definir('data', {'border': 2})
+    with pytest.raises(KeyError):
+        registro['otro']
+
+
+def test_libro_real_anade_un_formato_por_estilo_distinto(tmp_path):
+    workbook = crear_libro(str(tmp_path / 'f.xlsx'))
+    registro = RegistroFormatos(workbook, {'a': {'bold': True}, 'b': {'bold': 1}})
+    antes = len(workbook.formats)
+    hoja = workbook.add_worksheet()
+    for fila in range(100):
+        hoja.write(fila, 0, fila, registro['a'])
+        hoja.write(fila, 1, fila, registro['b'])
+    assert len(workbook.formats) == antes + 1
+    workbook.close()
+
+
+def test_clasificador_y_formatos_condicionales():
+    nivel = Clasificador(((frozenset({'Alta'}), 'high'), (frozenset({'Media', 'Baja "x"'}), 'medium')), defecto='low')
+    assert [nivel('Alta'), nivel('Media'), nivel('Otra')] == ['high', 'medium', 'low']
+    assert nivel.condicionales() == [
+        {'type': 'cell', 'criteria': '==', 'value': '"Alta"', 'format': 'high'},
+        {'type': 'cell', 'criteria': '==', 'value': '"Baja ""x"""', 'format': 'medium'},
+        {'type': 'cell', 'criteria': '==', 'value': '"Media"', 'format': 'medium'},
+        {'type': 'no_blanks', 'format': 'low'},
+    ]
+    umbral = Clasificador(((lambda v: v > 3, 'high'),))
+    assert (umbral(5), umbral(1)) == ('high', 'data')
+    with pytest.raises(ValueError, match='predicado'):
+        umbral.condicionales()
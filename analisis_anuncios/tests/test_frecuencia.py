@@ -0,0 +1,39 @@
+import numpy as np
+
+from analisis_anuncios.frecuencia import (
+    BANNER, INTERSTICIAL, LIMITES_MEDIDOS, NATIVO, TIPOS, DistribucionFrecuencia, Limites, Sesiones,
+    simular_frecuencia,
+)
+
+
+def test_quitar_un_limite_nunca_reduce_impresiones():
+    medias = simular_frecuencia(usuarios=20_000, semilla=5, procesos=1).medias()
+    assert medias.shape == (len(LIMITES_MEDIDOS) + 1, len(TIPOS) + 1)
+    assert np.all(medias[1:] >= medias[0])
+    # Cada límite medido recorta algo con los valores por defecto
+    assert np.all(medias[1:, -1] > medias[0, -1])
+
+
+def test_intersticiales_dia_acota_el_histograma():
+    # Sesiones largas: sin tope habría muchos más de 2 intersticiales por usuario
+    sesiones = Sesiones(sesiones_dia=6, navegaciones_sesion=12)
+    distribucion = simular_frecuencia(sesiones, Limites(intersticiales_dia=2), usuarios=5_000, semilla=1, procesos=1)
+    variante_sin_tope = 1 + LIMITES_MEDIDOS.index('intersticiales_dia')
+    assert distribucion.conteos[0, INTERSTICIAL, 3:].sum() == 0
+    assert distribucion.conteos[variante_sin_tope, INTERSTICIAL, 3:].sum() > 0
+    assert distribucion.percentiles([100])[0, INTERSTICIAL] == 2
+
+
+def test_percentiles_e_ingresos_de_una_muestra_a_mano():
+    # 4 usuarios: banners 0, 2, 2 y 4; nativos 1, 1, 1 y 1
+    conteos = np.zeros((1, len(TIPOS) + 1, 8), dtype=np.int64)
+    conteos[0, BANNER, [0, 2, 4]] = [1, 2, 1]
+    conteos[0, NATIVO, 1] = 4
+    conteos[0, -1, [1, 3, 5]] = [1, 2, 1]
+    distribucion = DistribucionFrecuencia(usuarios=4, conteos=conteos)
+    np.testing.assert_allclose(distribucion.medias()[0, [BANNER, NATIVO, -1]], [2, 1, 3])
+    np.testing.assert_array_equal(distribucion.percentiles([25, 50, 100])[:, BANNER], [0, 2, 4])
+    cpm = np.zeros(len(TIPOS))
+    cpm[BANNER], cpm[NATIVO] = 2.0, 4.0
+    # 2 banners a $2 y 1 nativo a $4 por mil impresiones
+    np.testing.assert_allclose(distribucion.ingresos_por_usuario(cpm), [(2 * 2.0 + 4.0) / 1000])
@@ -0,0 +1,114 @@
+import re
+import zipfile
+
+import numpy as np
+import pytest
+
+from analisis_anuncios.escritura import crear_libro
+from analisis_anuncios.hojas import (
+    HOJA_GRAFICOS, Columnas, Espacio, Grafico, Hoja, Seccion, Serie, Tabla, Titulo, renderizar,
+)
+from analisis_anuncios.tests.lector import leer_libro
+
+FILAS = 2_000
+
+
+def _formatos(workbook):
+    return {nombre: workbook.add_format() for nombre in ('title', 'header', 'data')}
+
+
+def _renderizar(ruta, bloques, streaming=False):
+    workbook = crear_libro(str(ruta), streaming)
+    posiciones = renderizar(workbook, [Hoja('Datos', 3, {}, bloques)], _formatos(workbook))
+    workbook.close()
+    return posiciones, leer_libro(ruta)
+
+
+def _columnas():
+    x = np.arange(FILAS, dtype=np.float64)
+    return [x, np.sin(x / 40) * 100, np.cos(x / 90) * 50]
+
+
+def _grafico(max_puntos=60):
+    return Grafico('line', [Serie('seno', 'larga', 1), Serie('coseno', 'larga', 2)], max_puntos=max_puntos)
+
+
+@pytest.mark.parametrize('origen', ['arrays', 'bloques', 'filas', 'generador'])
+def test_grafico_largo_se_submuestrea_en_la_hoja_oculta(tmp_path, origen):
+    columnas = _columnas()
+    filas = {
+        'arrays': Columnas(columnas),
+        'bloques': Columnas(lambda: ([c[i:i + 700] for c in columnas] for i in range(0, FILAS, 700))),
+        'filas': [list(fila) for fila in zip(*(c.tolist() for c in columnas))],
+        'generador': lambda: (list(fila) for fila in zip(*(c.tolist() for c in columnas))),
+    }[origen]
+    posiciones, libro = _renderizar(tmp_path / 'g.xlsx', [Tabla(filas, encabezados=['x', 'a', 'b'], nombre='larga'),
+                                                          _grafico()])
+    primera = posiciones['larga'][1]
+    celdas = libro[HOJA_GRAFICOS]['celdas']
+    assert [celdas[f'{c}1'][0] for c in 'ABC'] == ['x', 'a', 'b']
+    elegidas = [int(valor) for ref, (valor, _, _) in celdas.items() if ref[0] == 'A' and ref != 'A1']
+    assert 2 <= len(elegidas) <= 60
+    assert elegidas[0] == 0 and elegidas[-1] == FILAS - 1 and elegidas == sorted(elegidas)
+    for n, fila in enumerate(elegidas, start=2):
+        for col, letra in enumerate('ABC'):
+            valor, formula, _ = celdas[f'{letra}{n}']
+            assert formula == f"Datos!${letra}${primera + fila + 1}"
+            assert valor == pytest.approx(columnas[col][fila])
+
+
+def test_grafico_corto_usa_la_tabla(tmp_path):
+    columnas = [c[:50] for c in _columnas()]
+    _, libro = _renderizar(tmp_path / 'c.xlsx', [Tabla(Columnas(columnas), nombre='larga'), _grafico()])
+    assert HOJA_GRAFICOS not in libro
+
+
+def test_bloques_de_arriba_abajo_con_formatos_por_nombre(tmp_path):
+    ruta = tmp_path / 'bloques.xlsx'
+    workbook = crear_libro(str(ruta))
+    formatos = {nombre: workbook.add_format({'num_format': i + 1})
+                for i, nombre in enumerate(('title', 'header', 'data', 'high', 'high:porcentaje', 'low'))}
+    hojas = [
+        Hoja('Resumen', 4, {'A:A': 30}, [
+            Titulo('TÍTULO'),
+            Espacio(2),
+            Seccion('SECCIÓN'),
+            Tabla([['a', 0.5, 10], ['b', 0.1, 20]], encabezados=['Nombre', 'Tasa', 'Total'],
+                  formatos=['data', lambda v: 'high' if v > 0.3 else 'low', 'data'],
+                  tipos=[[None, 'porcentaje', None], [None, 'porcentaje', None]], nombre='tasas'),
+            Tabla([['nota', 'texto largo']], fusionar_ultima=True),
+        ]),
+        Hoja('Gráficos', 2, {}, [
+            Grafico('column', [Serie('Total', 'tasas', 2)]),
+            Tabla([[1, 2]], nombre='otra'),
+        ]),
+    ]
+    posiciones = renderizar(workbook, hojas, formatos)
+    workbook.close()
+
+    assert posiciones == {'tasas': ('Resumen', 5, 6), 'otra': ('Gráficos', 0, 0)}
+    libro = leer_libro(ruta)
+    resumen = libro['Resumen']
+    estilo = {nombre: str(f.xf_index) for nombre, f in formatos.items()}
+    assert resumen['fusiones'] == ['A1:D1', 'A4:D4', 'B8:D8']
+    assert resumen['celdas']['A1'] == ('TÍTULO', None, estilo['title'])
+    assert 'A2' not in resumen['celdas'] and 'A3' not in resumen['celdas']
+    assert resumen['celdas']['A4'] == ('SECCIÓN', None, estilo['header'])
+    assert [resumen['celdas'][f'{c}5'] for c in 'ABC'] == [
+        (texto, None, estilo['header']) for texto in ('Nombre', 'Tasa', 'Total')]
+    # Regla por valor y variante por tipo numérico: 'high' + 'porcentaje'; 'low' no tiene variante
+    assert resumen['celdas']['B6'] == (0.5, None, estilo['high:porcentaje'])
+    assert resumen['celdas']['B7'] == (0.1, None, estilo['low'])
+    assert resumen['celdas']['C7'] == (20, None, estilo['data'])
+    assert resumen['celdas']['B8'][0] == 'texto largo'
+    # El gráfico de la otra hoja referencia el rango de la tabla con nombre
+    with zipfile.ZipFile(ruta) as z:
+        grafico = z.read('xl/charts/chart1.xml').decode()
+    assert re.findall(r'<c:f>(.*?)</c:f>', grafico) == ['Resumen!$A$6:$A$7', 'Resumen!$C$6:$C$7']
+
+
+def test_bloque_desconocido(tmp_path):
+    workbook = crear_libro(str(tmp_path / 'x.xlsx'))
+    with pytest.raises(TypeError, match="Bloque desconocido en la hoja 'Datos'"):
+        renderizar(workbook, [Hoja('Datos', 1, {}, ['texto suelto'])], _formatos(workbook))
+    workbook.close()
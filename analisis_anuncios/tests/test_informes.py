@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from analisis_anuncios import informes
+from analisis_anuncios.informes import ClienteInformes, ErrorInformes, _segundos_reintento
+from analisis_anuncios.servidor_informes import ServidorInformes, kpis_dia
+
+
+@pytest.fixture(autouse=True)
+def espera_corta(monkeypatch):
+    monkeypatch.setattr(informes, 'ESPERA_BASE', 0.001)
+
+
+def pedir(servidor, consultas, veces=1, **opciones):
+    """Filas de ``consultas`` pedidas a ``servidor`` y el cliente usado (el último de ``veces``)."""
+    async def ejecutar():
+        async with await servidor.iniciar() as server:
+            puerto = server.sockets[0].getsockname()[1]
+            for _ in range(veces):
+                async with ClienteInformes(f'http://127.0.0.1:{puerto}', **opciones) as cliente:
+                    filas = await cliente.kpis_varios(consultas)
+            return filas, cliente
+
+    return asyncio.run(ejecutar())
+
+
+def esperadas(app, desde, dias):
+    inicio = datetime.fromisoformat(desde).date()
+    return [{**kpis_dia(app, (inicio + timedelta(days=d)).isoformat()), 'app': app} for d in range(dias)]
+
+
+def test_pagina_hasta_el_final():
+    servidor = ServidorInformes(por_pagina=3)
+    filas, cliente = pedir(servidor, [('app', '2025-01-01', '2025-01-10')])
+    assert filas == esperadas('app', '2025-01-01', 10)
+    assert cliente.peticiones == servidor.atendidas == 4
+
+
+def test_codifica_el_nombre_de_la_app():
+    filas, _ = pedir(ServidorInformes(), [('mi app/ñ', '2025-01-01', '2025-01-03')])
+    assert filas == esperadas('mi app/ñ', '2025-01-01', 3)
+
+
+def test_reintenta_los_503():
+    servidor = ServidorInformes(por_pagina=5, tasa_errores=0.4, semilla=1)
+    filas, cliente = pedir(servidor, [('a', '2025-01-01', '2025-01-20'), ('b', '2025-01-01', '2025-01-20')],
+                           reintentos=20)
+    assert filas == esperadas('a', '2025-01-01', 20) + esperadas('b', '2025-01-01', 20)
+    assert cliente.peticiones > 8
+
+
+def test_respeta_los_429():
+    servidor = ServidorInformes(por_pagina=2, limite_por_segundo=5)
+    filas, cliente = pedir(servidor, [('a', '2025-01-01', '2025-01-16')], por_segundo=1000, reintentos=20)
+    assert filas == esperadas('a', '2025-01-01', 16)
+    assert cliente.peticiones > 8
+
+
+def test_agota_los_reintentos():
+    with pytest.raises(ErrorInformes, match='3 intentos'):
+        pedir(ServidorInformes(tasa_errores=1.0), [('a', '2025-01-01', '2025-01-02')], reintentos=2)
+
+
+def test_no_reintenta_errores_del_cliente():
+    servidor = ServidorInformes(token='secreto')
+    with pytest.raises(ErrorInformes, match='HTTP 401'):
+        pedir(servidor, [('a', '2025-01-01', '2025-01-02')], token='otro')
+    assert servidor.atendidas == 1
+
+
+def test_pagina_sin_filas():
+    class SinFilas(ServidorInformes):
+        def responder(self, ruta, cabeceras):
+            self.atendidas += 1
+            return 200, {}, {'datos': []}
+
+    with pytest.raises(ErrorInformes, match='filas'):
+        pedir(SinFilas(), [('a', '2025-01-01', '2025-01-02')])
+
+
+def test_cache_de_rangos_cerrados(tmp_path):
+    servidor = ServidorInformes(por_pagina=4)
+    filas, cliente = pedir(servidor, [('a', '2025-01-01', '2025-01-10')], veces=2, cache=str(tmp_path))
+    assert filas == esperadas('a', '2025-01-01', 10)
+    assert servidor.atendidas == 3
+    assert (cliente.peticiones, cliente.desde_cache) == (0, 3)
+
+
+def test_rango_abierto_no_se_cachea(tmp_path):
+    hoy = datetime.now().date().isoformat()
+    servidor = ServidorInformes()
+    pedir(servidor, [('a', hoy, hoy)], veces=2, cache=str(tmp_path))
+    assert servidor.atendidas == 2
+
+
+def test_retry_after():
+    assert _segundos_reintento('1.5') == 1.5
+    assert _segundos_reintento(None) is None
+    assert _segundos_reintento('pronto') is None
+    futuro = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < _segundos_reintento(futuro) <= 30
+    pasado = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert _segundos_reintento(pasado) == 0
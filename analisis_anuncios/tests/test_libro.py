@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from analisis_anuncios import libro
+from analisis_anuncios.escenarios import Escenario
+from analisis_anuncios.hojas import Tabla
+from analisis_anuncios.tests.lector import leer_libro
+
+
+def _tabla(escenario, nombre):
+    hoja = libro.hoja_proyecciones(escenario)
+    tabla = next(b for b in hoja.bloques if isinstance(b, Tabla) and b.nombre == nombre)
+    return dict(zip(tabla.encabezados, tabla.filas.columnas))
+
+
+def test_proyeccion_sin_simulacion_no_aplica_fill():
+    columnas = _tabla(Escenario(), 'proyecciones')
+    # Filas del libro publicado: 100 usuarios × 3 impresiones a $2.50 de CPM
+    assert columnas['Impresiones/Día'][0] == 300
+    assert columnas['Ingresos Mensuales'][0] == pytest.approx(22.5)
+
+
+def test_proyeccion_simulada_aplica_el_fill_tipico():
+    escenario = Escenario(simulacion=True, sorteos=200_000, procesos=1)
+    columnas = _tabla(escenario, 'proyecciones')
+    fill = libro.tablas_referencia.metricas.valor('Fill Rate Esperado', 1)
+    usuarios = np.asarray(escenario.usuarios_diarios, dtype=np.float64)
+    np.testing.assert_allclose(columnas['Impresiones/Día'], usuarios * escenario.impresiones_por_usuario * fill)
+    np.testing.assert_allclose(columnas['Ingresos Mensuales'],
+                               columnas['Impresiones/Día'] * columnas['CPM Promedio'] / 1000 * libro.DIAS_MES)
+    assert np.all(columnas['P5 Mensual'] < columnas['Ingresos Mensuales'])
+    assert np.all(columnas['Ingresos Mensuales'] < columnas['P95 Mensual'])
+
+
+def test_bandas_de_clics():
+    columnas = _tabla(Escenario(simulacion=True, sorteos=200_000, procesos=1), 'clics')
+    assert np.all(columnas['Clics P5 Mensual'] <= columnas['Clics P50 Mensual'])
+    assert np.all(columnas['Clics P50 Mensual'] <= columnas['Clics P95 Mensual'])
+    # 100 usuarios × 3 impresiones × 30 días con CTR × fill entre 1.5% × 75% y 4% × 95%
+    assert 9000 * 0.015 * 0.75 <= columnas['Clics P5 Mensual'][0]
+    assert columnas['Clics P95 Mensual'][0] <= 9000 * 0.04 * 0.95
+
+
+def test_rangos_de_la_mezcla_salen_de_tipos_y_benchmarks():
+    escenario = Escenario(mezcla_anuncios={'Banner Standard': 3, 'Rewarded Video': 1})
+    cpm, fill, ctr = libro.rangos_simulacion(escenario)
+    assert (cpm.minimo, cpm.maximo) == pytest.approx((0.75 * 0.50 + 0.25 * 10.0, 0.75 * 3.0 + 0.25 * 20.0))
+    assert cpm.moda == pytest.approx(libro.cpm_escenario(escenario))
+    # Banner: benchmark 0.5%–4.0%; Rewarded Video sin benchmark: su CTR de 8% en ambos extremos
+    assert (ctr.minimo, ctr.moda, ctr.maximo) == pytest.approx(
+        (0.75 * 0.005 + 0.25 * 0.08, 0.75 * 0.015 + 0.25 * 0.08, 0.75 * 0.04 + 0.25 * 0.08))
+    assert (fill.minimo, fill.moda, fill.maximo) == pytest.approx((0.75, 0.85, 0.95))
+
+
+def test_modo_nativo_escribe_formulas_y_formatos_condicionales(tmp_path):
+    escenario = Escenario(excel_nativo=True)
+    hojas = leer_libro(libro.build_workbook(escenario, str(tmp_path)))
+    celdas = hojas['Proyecciones de Ingresos']['celdas']
+    for n, usuarios in enumerate(escenario.usuarios_diarios, start=4):
+        impresiones, cpm = celdas[f'B{n}'][0], celdas[f'C{n}'][0]
+        assert celdas[f'B{n}'][1] is None and impresiones == usuarios * escenario.impresiones_por_usuario
+        # Cada fórmula lleva el resultado en caché para los lectores que no recalculan
+        diario = impresiones * cpm / 1000
+        assert celdas[f'D{n}'][:2] == (pytest.approx(diario), f'B{n}*C{n}/1000')
+        assert celdas[f'E{n}'][:2] == (pytest.approx(diario * libro.DIAS_MES), f'D{n}*{libro.DIAS_MES}')
+        assert celdas[f'F{n}'][:2] == (pytest.approx(diario * libro.DIAS_MES * libro.FACTOR_BAJO), f'E{n}*2/3')
+        assert celdas[f'G{n}'][:2] == (pytest.approx(diario * libro.DIAS_MES * libro.FACTOR_ALTO), f'E{n}*2')
+    rango, reglas = hojas['Ubicaciones de Anuncios']['condicionales'][0]
+    assert rango == f'E4:E{3 + len(libro.tablas_referencia.ubicaciones.celdas())}'
+    assert ['"Baja"' in reglas[0], '"Muy Baja"' in reglas[1], '"Media"' in reglas[2]] == [True] * 3
+    assert 'notContainsBlanks' in reglas[3]
+
+    normal = leer_libro(libro.build_workbook(Escenario(), str(tmp_path), nombre='normal'))
+    assert not any(f for hoja in normal.values() for _, f, _ in hoja['celdas'].values())
+    assert not any(hoja['condicionales'] for hoja in normal.values())
@@ -0,0 +1,61 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from analisis_anuncios import lote
+from analisis_anuncios.escenarios import Escenario
+
+
+def _sortear(tarea):
+    semilla, n, escala = tarea
+    return n, np.random.default_rng(semilla).random(n) * escala
+
+
+def test_repartir_cubre_n_en_lotes_y_no_depende_de_procesos():
+    uno = lote.repartir(_sortear, 25, 10, semilla=3, procesos=1, argumentos=(2.0,))
+    varios = lote.repartir(_sortear, 25, 10, semilla=3, procesos=3, argumentos=(2.0,))
+    assert [n for n, _ in uno] == [10, 10, 5]
+    for (_, a), (_, b) in zip(uno, varios):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_mapear_sin_tareas():
+    assert lote.mapear(_sortear, [], procesos=4) == []
+
+
+def _generar(escenario, directorio):
+    # Libro de prueba: un archivo con los procesos que recibió; no reescribe los que ya existen
+    if escenario.nombre == 'roto':
+        raise RuntimeError('sin datos')
+    ruta = os.path.join(directorio, escenario.archivo)
+    if not os.path.exists(ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(str(escenario.procesos))
+    return ruta
+
+
+def test_generar_lote_escribe_el_manifiesto(tmp_path):
+    escenarios = [Escenario(nombre=n, procesos=4) for n in ('b', 'roto', 'a')]
+    mensajes = []
+    manifiesto = lote.generar_lote(_generar, escenarios, str(tmp_path), procesos=2, informar=mensajes.append)
+    with open(tmp_path / lote.MANIFIESTO, encoding='utf-8') as f:
+        assert json.load(f) == json.loads(json.dumps(manifiesto, default=list))
+    assert [e['escenario']['nombre'] for e in manifiesto['libros']] == ['a', 'b', 'roto']
+    assert manifiesto['errores'] == 1
+    a, b, roto = manifiesto['libros']
+    assert roto['error'] == 'RuntimeError: sin datos'
+    assert (a['archivo'], a['bytes'], a['reutilizado']) == ('a.xlsx', 1, False)
+    # Cada escenario corre con un solo proceso para no anidar pools
+    assert a['escenario']['procesos'] == 1 and (tmp_path / 'b.xlsx').read_text() == '1'
+    assert len(mensajes) == 3 and sum('❌ roto' in m for m in mensajes) == 1
+
+    repetido = lote.generar_lote(_generar, escenarios[:1], str(tmp_path), procesos=1, informar=mensajes.append)
+    assert repetido['libros'][0]['reutilizado'] and repetido['errores'] == 0
+
+
+def test_generar_lote_rechaza_nombres_repetidos(tmp_path):
+    with pytest.raises(ValueError, match=r"repetidos: \['a'\]"):
+        lote.generar_lote(_generar, [Escenario(nombre='a'), Escenario(nombre='a')], str(tmp_path))
+    assert not os.path.exists(tmp_path / lote.MANIFIESTO)
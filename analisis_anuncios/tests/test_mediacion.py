@@ -0,0 +1,92 @@
+import re
+
+import numpy as np
+import pytest
+
+from analisis_anuncios.escenarios import CAMPOS_RED, REDES_CASCADA, REDES_MEDIACION, Escenario
+from analisis_anuncios.mediacion import CASCADA, MODOS, REDES, Red, _cascada, _subasta, simular_mediacion
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_mediacion_no_depende_de_procesos(modo):
+    argumentos = dict(solicitudes=30_001, semilla=11, tamano_lote=5_000)
+    uno, varios = simular_mediacion(modo, procesos=1, **argumentos), simular_mediacion(modo, procesos=3, **argumentos)
+    assert (uno.solicitudes, uno.servidas) == (varios.solicitudes, varios.servidas)
+    assert uno.ingresos == pytest.approx(varios.ingresos, rel=1e-12)
+    np.testing.assert_array_equal(uno.ganadas, varios.ganadas)
+    np.testing.assert_array_equal(uno.latencias, varios.latencias)
+
+
+def test_cascada_gana_el_primer_nivel_que_acepta():
+    # Tres solicitudes × dos niveles con mínimos 5 y 0
+    tiene = np.array([[True, True], [False, True], [True, False]])
+    pujas = np.array([[6.0, 9.0], [7.0, 2.0], [4.0, 1.0]])
+    latencia = np.array([[10.0, 20.0], [30.0, 40.0], [50.0, 60.0]])
+    servida, nivel, precio, total = _cascada(tiene, pujas, latencia, np.array([5.0, 0.0]))
+    np.testing.assert_array_equal(servida, [True, True, False])
+    np.testing.assert_array_equal(nivel[:2], [0, 1])
+    # Se cobra la puja, no el mínimo; la latencia suma los niveles consultados
+    np.testing.assert_array_equal(precio, [6.0, 2.0, 0.0])
+    np.testing.assert_array_equal(total, [10.0, 70.0, 110.0])
+
+
+def test_subasta_gana_la_puja_mas_alta_a_tiempo():
+    tiene = np.array([[True, True, True], [True, False, False]])
+    pujas = np.array([[3.0, 8.0, 5.0], [1.0, 9.0, 9.0]])
+    latencia = np.array([[100.0, 2_000.0, 300.0], [50.0, 10.0, 10.0]])
+    servida, red, precio, total = _subasta(tiene, pujas, latencia, minimo=2.0, tiempo_limite=1_000)
+    # Fila 0: la puja de 8 llega tarde y gana la de 5; fila 1: la única puja no llega al mínimo
+    np.testing.assert_array_equal(servida, [True, False])
+    assert red[0] == 2
+    np.testing.assert_array_equal(precio, [5.0, 0.0])
+    np.testing.assert_array_equal(total, [1_000, 50.0])
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_red_unica_siempre_disponible(modo):
+    red = Red('Única', ecpm=2.0, fill=1.0, latencia_ms=5.0)
+    resultado = simular_mediacion(modo, redes=(red,), cascada=(('Única', 0.0),), solicitudes=200_000,
+                                  semilla=4, procesos=1)
+    assert resultado.fill_rate == 1
+    assert resultado.ganadas.tolist() == [200_000]
+    # Se cobra la puja log-normal, cuya media es el eCPM de la red
+    assert resultado.ecpm == pytest.approx(2.0, rel=0.01)
+    assert resultado.latencia_media_ms == pytest.approx(5.0, abs=0.6)
+
+
+def test_red_sin_anuncios_no_sirve():
+    resultado = simular_mediacion('subasta', redes=(Red('Vacía', 2.0, 0.0, 5.0),), solicitudes=1_000,
+                                  semilla=1, procesos=1)
+    assert (resultado.servidas, resultado.ingresos, resultado.ecpm) == (0, 0.0, 0.0)
+
+
+def test_constantes_de_validacion_coinciden_con_mediacion():
+    assert REDES_MEDIACION == tuple(r.nombre for r in REDES)
+    assert set(REDES_CASCADA) == {nombre for nombre, _ in CASCADA}
+    assert CAMPOS_RED == Red._fields
+
+
+@pytest.mark.parametrize('mediacion, error', [
+    ({'cascada': [['AdMob', 3.0], ['AdMop', 0.0]]}, "redes desconocidas ['AdMop']"),
+    ({'cascada': [['AdMob', -1]]}, 'cascada debe ser una lista'),
+    ({'cascada': []}, 'cascada debe ser una lista'),
+    ({'redes': [{'nombre': 'X', 'ecpm': 2.0, 'fill': 0.5, 'latencia_ms': 100}]}, "redes desconocidas"),
+    ({'redes': [{'nombre': 'X', 'ecpm': 2.0, 'fill': 1.5, 'latencia_ms': 100}], 'cascada': [['X', 0]]},
+     "la red 'X' necesita"),
+    ({'redes': [['X', 2.0]], 'cascada': [['X', 0]]}, 'cada red necesita'),
+    ({'redes': []}, 'al menos una red'),
+    ({'precio_minimo': -0.5}, 'precio_minimo'),
+    ({'precio_minimo': '1'}, 'precio_minimo'),
+    ({'tiempo_limite_ms': 0}, 'tiempo_limite_ms'),
+    ({'tiempo_limite_ms': True}, 'tiempo_limite_ms'),
+])
+def test_validar_mediacion(mediacion, error):
+    with pytest.raises(ValueError, match=re.escape(error)):
+        Escenario(nombre='m', mediacion=mediacion).validar()
+
+
+def test_validar_mediacion_valida():
+    Escenario(nombre='m', mediacion={
+        'modo': 'cascada', 'redes': [{'nombre': 'X', 'ecpm': 2.0, 'fill': 0.5, 'latencia_ms': 100}, ['Y', 1, 1, 50, 0.3]],
+        'cascada': [['X', 2.5], ['Y', 0]], 'precio_minimo': 0.5, 'tiempo_limite_ms': 800,
+    }).validar()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from analisis_anuncios import datos
+from analisis_anuncios.normalizacion import (
+    CONTEO, MONEDA, PORCENTAJE, TEXTO, formatear, normalizar, parsear,
+)
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    ('$2.50', (MONEDA, 2.5, 2.5)),
+    ('$1,234.5', (MONEDA, 1234.5, 1234.5)),
+    ('2.5%', (PORCENTAJE, 0.025, 0.025)),
+    ('.5%', (PORCENTAJE, 0.005, 0.005)),
+    ('1,500', (CONTEO, 1500, 1500)),
+    (' 7 ', (CONTEO, 7, 7)),
+    ('$0.50 - $10.00', (MONEDA, 0.5, 10.0)),
+    ('1% - 3%', (PORCENTAJE, 0.01, 0.03)),
+    (3, (CONTEO, 3, 3)),
+    (2.5, (CONTEO, 2.5, 2.5)),
+])
+def test_valores_numericos(valor, esperado):
+    tipo, minimo, maximo = parsear(valor)
+    assert (tipo, minimo, maximo) == (esperado[0], pytest.approx(esperado[1]), pytest.approx(esperado[2]))
+
+
+@pytest.mark.parametrize('valor', [
+    '', 'Alta', '$', '%', '$5%', '2.5.1', '-3', '1e3', '$1 - 2%', '1 - 2 - 3', '1-2', '5 min',
+    True, False, None, [1],
+])
+def test_valores_no_numericos(valor):
+    assert parsear(valor) is None
+
+
+@pytest.mark.parametrize('texto', ['$2.50', '2.5%', '1,500', '$0.50 - $10.00', '1.0% - 3.0%'])
+def test_formatear_es_el_inverso(texto):
+    assert formatear(*parsear(texto)) == texto
+
+
+def test_normalizar_tabla_irregular():
+    tabla = normalizar([['CPM', '$0.50 - $3.00', '$1.20'], ['Fill', '85%']])
+    np.testing.assert_array_equal(tabla.tipo, [[TEXTO, MONEDA, MONEDA], [TEXTO, PORCENTAJE, TEXTO]])
+    assert np.isnan(tabla.minimo[1, 2]) and np.isnan(tabla.minimo[0, 0])
+    assert tabla.rango('CPM', 1) == (0.5, 3.0)
+    assert tabla.celdas() == [['CPM', '$0.50 - $3.00', 1.2], ['Fill', 0.85]]
+    assert tabla.tipos_celdas() == [[None, None, 'moneda'], [None, 'porcentaje', None]]
+    with pytest.raises(KeyError):
+        tabla.indice('CTR')
+
+
+def test_con_valor_no_modifica_el_original():
+    tabla = normalizar([['CPM', '$1.20']])
+    nueva = tabla.con_valor('CPM', 1, MONEDA, 0.8, 1.6)
+    assert nueva.textos[0][1] == '$0.80 - $1.60' and nueva.rango('CPM', 1) == (0.8, 1.6)
+    assert tabla.textos[0][1] == '$1.20' and tabla.valor('CPM', 1) == 1.2
+
+
+def test_tablas_de_datos_sin_numeros_perdidos():
+    # Toda celda con cifras de las tablas de origen debe parsearse o ser texto descriptivo conocido
+    for filas in (datos.metricas, datos.tipos_anuncios, datos.benchmarks):
+        tabla = normalizar(filas)
+        for i, fila in enumerate(filas):
+            for j, valor in enumerate(fila):
+                if tabla.tipo[i, j] == TEXTO and isinstance(valor, str) and valor[:1].isdigit():
+                    pytest.fail(f'{valor!r} empieza con cifra y no se parseó')
@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from analisis_anuncios import libro
+from analisis_anuncios.escenarios import Escenario
+from analisis_anuncios.optimizacion import Candidata, Restricciones, optimizar
+
+
+def exhaustiva(candidatas, restricciones):
+    """``(eleccion, ingreso, invasividad)`` de todas las configuraciones factibles."""
+    opciones = [range(-1, len(c.tipos) if c.invasion <= restricciones.max_invasion else 0) for c in candidatas]
+    for eleccion in itertools.product(*opciones):
+        activas = [(c, e) for c, e in zip(candidatas, eleccion) if e >= 0]
+        if sum(c.visible for c, _ in activas) > restricciones.max_visibles:
+            continue
+        retencion = np.prod([1 - restricciones.penalizacion * c.invasion for c, _ in activas])
+        yield eleccion, sum(c.ingresos[e] for c, e in activas) * retencion, sum(c.invasion for c, _ in activas)
+
+
+def frontera(configuraciones):
+    """Mejor ingreso de cada invasividad que mejora a todas las menos invasivas."""
+    puntos, mejor = [], -np.inf
+    for invasividad, ingreso in sorted(configuraciones, key=lambda p: (p[0], -p[1])):
+        if ingreso > mejor * (1 + 1e-9):
+            puntos.append((invasividad, ingreso))
+            mejor = ingreso
+    return puntos
+
+
+def aleatorias(rng, n):
+    return [Candidata(f'u{i}', int(rng.integers(0, 5)), bool(rng.random() < 0.5), ('a', 'b', 'c')[:m],
+                      tuple(rng.random(m).tolist()))
+            for i, m in enumerate(rng.integers(1, 4, size=n))]
+
+
+@pytest.mark.parametrize('semilla', range(6))
+def test_coincide_con_la_enumeracion(semilla):
+    rng = np.random.default_rng(semilla)
+    candidatas = aleatorias(rng, 7)
+    restricciones = Restricciones(max_invasion=int(rng.integers(1, 5)), max_visibles=int(rng.integers(0, 4)),
+                                  penalizacion=0.05)
+    resultado = optimizar(candidatas, restricciones)
+    todas = list(exhaustiva(candidatas, restricciones))
+    esperada = frontera([(inv, ingreso) for _, ingreso, inv in todas])
+    assert [(int(i), pytest.approx(g)) for i, g in zip(resultado.invasividad, resultado.ingreso)] == esperada
+    optima = resultado.optima()
+    assert resultado.ingreso[optima] == pytest.approx(max(ingreso for _, ingreso, _ in todas))
+
+
+def test_poda_las_ubicaciones_del_libro():
+    candidatas = libro.candidatas_mezcla(Escenario(nombre='x'), libro.tablas_referencia)
+    resultado = optimizar(candidatas, Restricciones(max_invasion=4))
+    assert resultado.posibles == 256
+    todas = list(exhaustiva(candidatas, Restricciones(max_invasion=4)))
+    eleccion, ingreso, _ = max(todas, key=lambda t: (t[1], -t[2]))
+    assert resultado.ingreso[resultado.optima()] == pytest.approx(ingreso)
+    assert tuple(resultado.eleccion[resultado.optima()]) == eleccion
+
+
+def test_limite_de_nodos():
+    candidatas = aleatorias(np.random.default_rng(0), 20)
+    with pytest.raises(ValueError, match='1,000 nodos con 20 ubicaciones'):
+        optimizar(candidatas, Restricciones(max_invasion=4, max_visibles=4), max_nodos=1_000)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from analisis_anuncios.proyecciones import (
+    proyectar_ingresos, proyectar_rejilla_por_bloques, rejilla_escenarios,
+)
+
+# Tabla literal de la hoja antes del motor vectorizado (redondeada a centavos)
+FILAS_PUBLICADAS = [
+    [100, 300, 2.50, 0.75, 22.50, 15.00, 45.00],
+    [250, 750, 2.50, 1.88, 56.25, 37.50, 112.50],
+    [500, 1500, 2.50, 3.75, 112.50, 75.00, 225.00],
+    [1000, 3000, 2.50, 7.50, 225.00, 150.00, 450.00],
+    [2500, 7500, 2.50, 18.75, 562.50, 375.00, 1125.00],
+    [5000, 15000, 2.50, 37.50, 1125.00, 750.00, 2250.00],
+    [10000, 30000, 2.50, 75.00, 2250.00, 1500.00, 4500.00],
+]
+
+
+def test_reproduce_la_tabla_publicada():
+    usuarios = [fila[0] for fila in FILAS_PUBLICADAS]
+    proyeccion = proyectar_ingresos(usuarios, 3, 2.50)
+    np.testing.assert_allclose(np.column_stack(proyeccion), FILAS_PUBLICADAS, atol=0.005)
+
+
+def test_fill_rate_y_broadcasting():
+    proyeccion = proyectar_ingresos([[1000], [2000]], [2, 4], 5.0, fill_rate=0.5)
+    assert proyeccion.impresiones.shape == (2, 2)
+    np.testing.assert_allclose(proyeccion.impresiones, [[1000, 2000], [2000, 4000]])
+    np.testing.assert_allclose(proyeccion.ingresos_mensuales, proyeccion.impresiones * 5 / 1000 * 30)
+
+
+def test_rejilla_por_bloques_igual_a_la_rejilla_completa():
+    ejes = ([100, 1000, 5000], [2, 3], [1.5, 2.5, 4.0], [0.8, 0.9])
+    completa = proyectar_ingresos(*rejilla_escenarios(*ejes))
+    assert len(completa.usuarios) == 3 * 2 * 3 * 2
+    bloques = list(proyectar_rejilla_por_bloques(*ejes, tamano_bloque=5))
+    assert len(bloques) == 8
+    for columna, original in zip(zip(*(p for _, p in bloques)), completa):
+        np.testing.assert_array_equal(np.concatenate(columna), original)
+
+
+def test_factores_del_escenario():
+    proyeccion = proyectar_ingresos(100, 3, 2.5, factor_bajo=0.5, factor_alto=3, dias_mes=31)
+    assert float(proyeccion.ingresos_mensuales) == pytest.approx(0.75 * 31)
+    assert (float(proyeccion.escenario_bajo), float(proyeccion.escenario_alto)) == pytest.approx((0.75 * 15.5, 0.75 * 93))
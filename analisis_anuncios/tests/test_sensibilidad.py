@@ -0,0 +1,67 @@
+import numpy as np
+
+from analisis_anuncios import libro, lote, sensibilidad
+from analisis_anuncios.escenarios import Escenario
+
+
+class _PoolEnSerie:
+    """Sustituto de ``ProcessPoolExecutor`` que anota el tamaño de cada tarea."""
+    tareas = []
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        pass
+
+    def map(self, funcion, tareas):
+        tareas = list(tareas)
+        _PoolEnSerie.tareas = [len(matriz) for matriz, _ in tareas]
+        return map(funcion, tareas)
+
+
+def test_evaluar_da_un_bloque_a_cada_proceso(monkeypatch):
+    monkeypatch.setattr(lote, 'ProcessPoolExecutor', _PoolEnSerie)
+    matriz = np.random.default_rng(0).random((1_000, len(sensibilidad.PARAMETROS)))
+    sensibilidad.evaluar(matriz, procesos=4, tamano_bloque=600)
+    assert _PoolEnSerie.tareas == [250] * 4
+    sensibilidad.evaluar(matriz, procesos=2, tamano_bloque=300)
+    assert _PoolEnSerie.tareas == [250] * 4
+
+
+def test_evaluar_matriz_pequena_en_linea(monkeypatch):
+    _PoolEnSerie.tareas = []
+    monkeypatch.setattr(lote, 'ProcessPoolExecutor', _PoolEnSerie)
+    matriz = np.random.default_rng(0).random((1_000, len(sensibilidad.PARAMETROS)))
+    np.testing.assert_array_equal(sensibilidad.evaluar(matriz, procesos=8, tamano_bloque=1_000),
+                                  sensibilidad.ingresos(matriz, sensibilidad.MESES))
+    assert _PoolEnSerie.tareas == []
+
+
+def test_evaluar_no_depende_de_procesos():
+    matriz = np.random.default_rng(1).random((999, len(sensibilidad.PARAMETROS)))
+    np.testing.assert_array_equal(sensibilidad.evaluar(matriz, procesos=1, tamano_bloque=100),
+                                  sensibilidad.evaluar(matriz, procesos=4, tamano_bloque=100))
+
+
+def test_usuarios_base_de_la_proyeccion():
+    escenario = Escenario(nombre='cohortes', cohortes={'altas_diarias': 500}, sensibilidad={})
+    usuarios = {p.nombre: p for p in libro.parametros_sensibilidad(escenario, libro.tablas_referencia)}['usuarios']
+    assert usuarios.base == libro.usuarios_escenario(escenario)[0] != escenario.usuarios_diarios[0]
+    assert usuarios.minimo < usuarios.base < usuarios.maximo
+
+
+def test_fill_rate_base_dentro_del_rango():
+    escenario = Escenario(nombre='mediacion', mediacion={'modo': 'subasta'}, sensibilidad={})
+    tablas = libro.tablas_escenario(escenario, {'cascada': _Fill(0.8), 'subasta': _Fill(0.95)})
+    fill = {p.nombre: p for p in libro.parametros_sensibilidad(escenario, tablas)}['fill_rate']
+    assert fill.base == 0.95
+    assert fill.minimo < fill.base < fill.maximo <= 1
+
+
+class _Fill:
+    def __init__(self, fill_rate):
+        self.fill_rate = fill_rate
@@ -0,0 +1,20 @@
+import numpy as np
+
+from analisis_anuncios.simulacion import Rango, simular
+
+
+def test_simular_no_depende_de_procesos():
+    argumentos = dict(cpm=Rango(1.0, 2.5, 6.0), fill_rate=Rango(0.7, 0.85, 0.95), ctr=Rango(0.01, 0.02, 0.04),
+                      sorteos=50_001, semilla=7, tamano_lote=10_000)
+    uno, varios = simular(procesos=1, **argumentos), simular(procesos=3, **argumentos)
+    for histograma in ('ingreso_por_mil', 'clics_por_solicitud'):
+        np.testing.assert_array_equal(getattr(uno, histograma).bordes, getattr(varios, histograma).bordes)
+        np.testing.assert_array_equal(getattr(uno, histograma).conteos, getattr(varios, histograma).conteos)
+    assert uno.ingreso_por_mil.conteos.sum() == 50_001
+
+
+def test_simular_cambia_con_la_semilla():
+    argumentos = dict(cpm=Rango(1.0, 2.5, 6.0), fill_rate=Rango(0.7, 0.85, 0.95), ctr=Rango(0.01, 0.02, 0.04),
+                      sorteos=20_000, procesos=1)
+    assert not np.array_equal(simular(semilla=1, **argumentos).ingreso_por_mil.conteos,
+                              simular(semilla=2, **argumentos).ingreso_por_mil.conteos)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from analisis_anuncios.submuestreo import lttb, minmax, submuestrear
+
+N = 10_007
+
+
+def _serie():
+    x = np.arange(N, dtype=np.float64)
+    return x, np.sin(x / 50) + np.random.default_rng(0).normal(0, 0.1, N)
+
+
+@pytest.mark.parametrize('puntos', [1, 2, 3, 4, 5, 10, 999, 1_000])
+def test_lttb(puntos):
+    x, y = _serie()
+    indices = lttb(x, y, puntos)
+    assert len(indices) == puntos
+    assert indices[0] == 0
+    if puntos > 1:
+        assert indices[-1] == N - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize('puntos', [1, 2, 3, 4, 5, 10, 999, 1_000])
+def test_minmax(puntos):
+    _, y = _serie()
+    indices = minmax(y, puntos)
+    assert 1 <= len(indices) <= puntos
+    assert indices[0] == 0
+    if puntos > 1:
+        assert indices[-1] == N - 1
+    assert np.all(np.diff(indices) > 0)
+    if puntos >= 4:
+        # El mínimo y el máximo globales son los de algún cubo
+        assert {int(np.argmin(y)), int(np.argmax(y))} <= set(indices.tolist())
+
+
+def test_serie_corta_sin_submuestreo():
+    y = np.arange(10.0)
+    np.testing.assert_array_equal(lttb(y, y, 10), np.arange(10))
+    np.testing.assert_array_equal(minmax(y, 50), np.arange(10))
+
+
+@pytest.mark.parametrize('metodo', ['lttb', 'minmax'])
+@pytest.mark.parametrize('series, puntos', [(1, 1_000), (3, 1_000), (7, 20), (400, 1_000), (12, 5)])
+def test_submuestrear_no_pasa_de_puntos(metodo, series, puntos):
+    x, y = _serie()
+    indices = submuestrear(x, [y * (k + 1) + k for k in range(series)], puntos, metodo)
+    assert 1 <= len(indices) <= puntos
+    assert indices[0] == 0
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_submuestrear_conserva_los_extremos():
+    x, y = _serie()
+    indices = submuestrear(x, [y, -y], 100, 'lttb')
+    assert indices[-1] == N - 1
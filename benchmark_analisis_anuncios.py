@@ -0,0 +1,166 @@
+"""Benchmark de la generación del análisis de anuncios.
+
+Ejecuta el generador con entradas sintéticas (proyecciones de 10 a 1M filas y
+lotes de 1 a 500 escenarios) y registra por fase el tiempo, la memoria pico y
+el tamaño del libro. Cada caso corre en un proceso nuevo para que la memoria
+pico de uno no contamine a los demás. El resultado es JSON; con ``--comparar``
+se contrasta con una ejecución anterior y se sale con código 1 si algún caso
+es más lento que la tolerancia.
+
+    python benchmark_analisis_anuncios.py --json resultados.json
+    python benchmark_analisis_anuncios.py --filas 10 1000 --escenarios 1 --comparar resultados.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+FILAS = (10, 1_000, 100_000, 1_000_000)
+ESCENARIOS = (1, 10, 100, 500)
+MODOS = ('normal', 'streaming', 'nativo')
+# Sin constant_memory xlsxwriter guarda todas las celdas en memoria: más allá de
+# este tamaño el modo normal se omite salvo que se pida explícitamente
+LIMITE_NORMAL = 200_000
+
+
+def _escenario(filas, modo, nombre='benchmark'):
+    from analisis_anuncios import Escenario
+
+    return Escenario(
+        nombre=nombre,
+        usuarios_diarios=tuple(range(100, 100 + 10 * filas, 10)),
+        streaming=modo == 'streaming',
+        excel_nativo=modo == 'nativo',
+    )
+
+
+def _caso_filas(filas, modo, directorio, memoria_python):
+    from analisis_anuncios.libro import build_workbook
+    from analisis_anuncios.perfil import Perfil, rss_pico_mb
+
+    if memoria_python:
+        tracemalloc.start()
+    perfil = Perfil()
+    inicio = time.perf_counter()
+    ruta = build_workbook(_escenario(filas, modo), directorio, perfil=perfil)
+    return {
+        'tipo': 'filas',
+        'filas': filas,
+        'modo': modo,
+        'segundos': round(time.perf_counter() - inicio, 4),
+        'rss_pico_mb': rss_pico_mb(),
+        'bytes': os.path.getsize(ruta),
+        'fases': perfil.fases,
+    }
+
+
+def _caso_escenarios(escenarios, modo, directorio, procesos):
+    from analisis_anuncios.libro import build_workbook
+    from analisis_anuncios.lote import generar_lote
+    from analisis_anuncios.perfil import rss_pico_mb
+
+    lote = [_escenario(7, modo, nombre=f'escenario_{i:03d}') for i in range(escenarios)]
+    inicio = time.perf_counter()
+    manifiesto = generar_lote(build_workbook, lote, directorio, procesos=procesos, informar=lambda _: None)
+    return {
+        'tipo': 'escenarios',
+        'escenarios': escenarios,
+        'modo': modo,
+        'segundos': round(time.perf_counter() - inicio, 4),
+        'rss_pico_mb': rss_pico_mb(hijos=True),
+        'bytes': sum(libro.get('bytes', 0) for libro in manifiesto['libros']),
+        'errores': manifiesto['errores'],
+    }
+
+
+def _aislado(funcion, *args):
+    # Un proceso nuevo por caso: ru_maxrss es el pico de toda la vida del proceso
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(funcion, *args).result()
+
+
+def _clave(caso):
+    return (caso['tipo'], caso.get('filas', caso.get('escenarios')), caso['modo'])
+
+
+def comparar(actual, anterior, tolerancia):
+    """Casos cuyo tiempo empeoró más de ``tolerancia`` (fracción) respecto a ``anterior``."""
+    previos = {_clave(caso): caso for caso in anterior['casos'] if 'segundos' in caso}
+    regresiones = []
+    for caso in actual['casos']:
+        previo = previos.get(_clave(caso))
+        if previo and 'segundos' in caso and caso['segundos'] > previo['segundos'] * (1 + tolerancia):
+            regresiones.append({
+                'caso': list(_clave(caso)),
+                'antes': previo['segundos'],
+                'ahora': caso['segundos'],
+            })
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de la generación del análisis de anuncios.')
+    parser.add_argument('--filas', type=int, nargs='*', default=list(FILAS),
+                        help='filas de la tabla de proyecciones por caso')
+    parser.add_argument('--escenarios', type=int, nargs='*', default=list(ESCENARIOS),
+                        help='tamaños de lote a medir')
+    parser.add_argument('--modos', nargs='+', choices=MODOS, default=list(MODOS))
+    parser.add_argument('--procesos', type=int, help='procesos de los lotes (por defecto todos los núcleos)')
+    parser.add_argument('--memoria-python', action='store_true',
+                        help='medir también el pico de memoria Python por fase (tracemalloc; más lento)')
+    parser.add_argument('--forzar-normal', action='store_true',
+                        help=f'medir el modo normal también por encima de {LIMITE_NORMAL:,} filas')
+    parser.add_argument('--json', help='archivo de resultados (por defecto la salida estándar)')
+    parser.add_argument('--comparar', metavar='ANTERIOR.json', help='resultados previos para detectar regresiones')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help='empeoramiento relativo permitido con --comparar (por defecto 0.2)')
+    args = parser.parse_args(argv)
+
+    from analisis_anuncios.cache import huella_fuentes
+    from analisis_anuncios.libro import FUENTES
+
+    casos = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for filas in args.filas:
+            for modo in args.modos:
+                if modo != 'streaming' and filas > LIMITE_NORMAL and not args.forzar_normal:
+                    casos.append({'tipo': 'filas', 'filas': filas, 'modo': modo, 'omitido': 'sin constant_memory'})
+                    continue
+                casos.append(_aislado(_caso_filas, filas, modo, directorio, args.memoria_python))
+                print(f'filas={filas:,} modo={modo}: {casos[-1]["segundos"]:.2f} s', file=sys.stderr)
+        for escenarios in args.escenarios:
+            casos.append(_aislado(_caso_escenarios, escenarios, 'normal', directorio, args.procesos))
+            print(f'escenarios={escenarios}: {casos[-1]["segundos"]:.2f} s', file=sys.stderr)
+
+    resultado = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'version': huella_fuentes(*FUENTES)[:12],
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'casos': casos,
+    }
+    codigo = 0
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            resultado['regresiones'] = comparar(resultado, json.load(f), args.tolerancia)
+        codigo = 1 if resultado['regresiones'] else 0
+
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())